@@ -2,7 +2,7 @@
 
 namespace App;
 
-use Illuminate\Support\Facades\DB;
+use App\Services\CodeSequenceService;
 
 trait AutoGenerateCode
 {
@@ -16,22 +16,30 @@ public static function bootAutoGenerateCode()
                 return; // Code already set, skip auto-generation
             }
 
-            $prefix = $model->codePrefix ?? 'XX';
-            
-            // Get the last code with this prefix
-            $lastCode = DB::table($model->getTable())
-                ->select($column)
-                ->where($column, 'like', $prefix . '%')
-                ->orderByDesc($column)
-                ->first();
-
-            $nextNumber = 1;
-            if ($lastCode) {
-                $currentNumber = intval(substr($lastCode->$column, strlen($prefix)));
-                $nextNumber = $currentNumber + 1;
-            }
-
-            $model->$column = $prefix . str_pad($nextNumber, 3, '0', STR_PAD_LEFT);
+            $model->$column = static::generateCodes(1)[0];
         });
     }
-}
\ No newline at end of file
+
+    /**
+     * Cấp trước $count mã liên tiếp từ bộ đếm code_sequences.
+     * Dùng cho insert hàng loạt (không qua event creating): một câu UPDATE cho cả khối mã.
+     */
+    public static function generateCodes(int $count): array
+    {
+        if ($count < 1) {
+            return [];
+        }
+
+        $model = new static;
+        $column = $model->codeColumn ?? 'code';
+        $prefix = $model->codePrefix ?? 'XX';
+
+        $sequence = app(CodeSequenceService::class);
+        $first = $sequence->allocate($model->getTable(), $column, $prefix, $count);
+
+        return array_map(
+            fn ($number) => $sequence->format($prefix, $number),
+            range($first, $first + $count - 1)
+        );
+    }
+}
@@ -8,12 +8,27 @@
 use App\Models\Teacher;
 use App\Models\AcademicYear;
 use App\Models\SalaryConfig;
+use App\Services\ClassroomSearchService;
+use App\Services\DashboardCacheService;
+use App\Services\ReferenceDataService;
 use Exception;
 use Illuminate\Http\Request;
+use Illuminate\Support\Facades\DB;
 use Inertia\Inertia;
 
 class ClassroomController extends Controller
 {
+    protected $dashboardCache;
+    protected $search;
+    protected $referenceData;
+
+    public function __construct(DashboardCacheService $dashboardCache, ClassroomSearchService $search, ReferenceDataService $referenceData)
+    {
+        $this->dashboardCache = $dashboardCache;
+        $this->search = $search;
+        $this->referenceData = $referenceData;
+    }
+
     /**
      * Display a listing of the classrooms.
      */
@@ -29,27 +44,15 @@ public function index(Request $request)
         if ($user->isAdmin()) {
             $query = Classroom::with(['course.department', 'semester.academicYear', 'teacher.department']);
             
-            // Get all data for admin
-            $courses = Course::with('department')->get();
-            $teachers = Teacher::with(['department', 'degree'])->get();
-            $academicYears = AcademicYear::with('semesters')->get();
-            $semesters = Semester::with('academicYear')->get();
+            // Admin thấy dữ liệu của mọi khoa
+            $departmentId = null;
             
         } elseif ($user->isDepartmentHead()) {
             $query = Classroom::with(['course.department', 'semester.academicYear', 'teacher.department'])
-                ->whereHas('course', function ($query) use ($user) {
-                    $query->where('department_id', $user->department_id);
-                });
+                ->whereIn('course_id', Course::select('id')->where('department_id', $user->department_id));
             
             // Filtered data for department head
-            $courses = Course::with('department')
-                ->where('department_id', $user->department_id)
-                ->get();
-            $teachers = Teacher::with(['department', 'degree'])
-                ->where('department_id', $user->department_id)
-                ->get();
-            $academicYears = AcademicYear::with('semesters')->get();
-            $semesters = Semester::with('academicYear')->get();
+            $departmentId = $user->department_id;
             
         } else {
             abort(403, 'Bạn không có quyền truy cập trang này.');
@@ -57,37 +60,48 @@ public function index(Request $request)
         
         // Apply filters
         if ($academicYearId) {
-            $query->whereHas('semester', function($q) use ($academicYearId) {
-                $q->where('academicYear_id', $academicYearId);
-            });
+            $query->whereIn('semester_id', Semester::select('id')->where('academicYear_id', $academicYearId));
         }
         
         if ($semesterId) {
             $query->where('semester_id', $semesterId);
         }
         
+        // Tìm trên bảng từ khoá (tên/mã lớp, tên/mã môn, tên giáo viên) thay cho LIKE '%...%' + whereHas
         if ($search) {
-            $query->where(function($q) use ($search) {
-                $q->where('name', 'like', "%{$search}%")
-                  ->orWhereHas('course', function($subQ) use ($search) {
-                      $subQ->where('name', 'like', "%{$search}%")
-                           ->orWhere('code', 'like', "%{$search}%");
-                  })
-                  ->orWhereHas('teacher', function($subQ) use ($search) {
-                      $subQ->where('fullName', 'like', "%{$search}%");
-                  });
-            });
+            $this->search->filter($query, $search);
         }
-        
-        $classrooms = $query->orderBy('created_at', 'desc')->paginate(10);
+
+        // Đếm tách khỏi danh sách: một query tổng hợp, tải sau khi trang đã hiển thị
+        $countQuery = $query->clone()->toBase();
+
+        // Dữ liệu dropdown: cache theo phiên bản, bỏ qua khi lọc/lật trang bằng partial reload
+        $scope = $departmentId ? "department:{$departmentId}" : 'all';
+        $referenceProps = $this->referenceData->props([
+            'courses' => [$scope, fn () => Course::with('department')
+                ->when($departmentId, fn ($q) => $q->where('department_id', $departmentId))
+                ->get()],
+            'teachers' => [$scope, fn () => Teacher::with(['department', 'degree'])
+                ->when($departmentId, fn ($q) => $q->where('department_id', $departmentId))
+                ->get()],
+            'academicYears' => ['all', fn () => AcademicYear::with('semesters')->get()],
+            'semesters' => ['all', fn () => Semester::with('academicYear')->get()],
+        ]);
         
         // FIX: ALWAYS pass filters object, even if empty
         return Inertia::render('Classrooms', [
-            'classrooms' => $classrooms,
-            'courses' => $courses,
-            'academicYears' => $academicYears,
-            'semesters' => $semesters,
-            'teachers' => $teachers,
+            ...$referenceProps,
+            // Phân trang keyset theo (created_at, id): trang sâu nhanh như trang đầu, không OFFSET
+            'classrooms' => fn () => $query->orderBy('created_at', 'desc')
+                ->orderBy('id', 'desc')
+                ->cursorPaginate(10)
+                ->withQueryString(),
+            'classroomCounts' => Inertia::defer(function () use ($countQuery) {
+                $counts = $countQuery->selectRaw('count(*) as total, count(teacher_id) as with_teacher')->first();
+
+                return ['total' => (int) $counts->total, 'with_teacher' => (int) $counts->with_teacher];
+            }),
+            'bulkMaxClasses' => $user->isAdmin() ? Classroom::BULK_MAX_CLASSES_ADMIN : Classroom::BULK_MAX_CLASSES,
             // FIX: Always provide filters object
             'filters' => [
                 'academic_year_id' => $academicYearId,
@@ -102,14 +116,7 @@ public function bulkStore(Request $request)
         try {
             $user = auth()->user();
             
-            $validated = $request->validate([
-                'course_id' => 'required|integer|exists:courses,id',
-                'semester_id' => 'required|integer|exists:semesters,id',
-                'teacher_id' => 'nullable|integer|exists:teachers,id',
-                'students_per_class' => 'required|integer|min:1|max:200',
-                'number_of_classes' => 'required|integer|min:1|max:20',
-                'class_name_prefix' => 'required|string|max:50',
-            ]);
+            $validated = $request->validate(Classroom::bulkRules($user->isAdmin()));
 
             $salaryConfig = SalaryConfig::where('semester_id', $validated['semester_id'])
                 ->whereIn('status', ['active', 'closed'])
@@ -141,37 +148,54 @@ public function bulkStore(Request $request)
             
             
             
-            $createdClasses = [];
             $semester = Semester::find($validated['semester_id']);
             $course = Course::find($validated['course_id']);
-            
-            // Tạo nhiều lớp học
+
+            $classNames = [];
             for ($i = 1; $i <= $validated['number_of_classes']; $i++) {
-                $className = $validated['class_name_prefix'] . ' ' . 'N' . str_pad($i, 2, '0', STR_PAD_LEFT);
-                
-                // Kiểm tra trùng tên lớp
-                $duplicateCheck = Classroom::where('name', $className)
-                    ->where('semester_id', $validated['semester_id'])
-                    ->where('course_id', $validated['course_id'])
-                    ->first();
-                    
-                if ($duplicateCheck) {
-                    return back()->withErrors(['class_name_prefix' => "Lớp học '{$className}' đã tồn tại trong học kỳ này"]);
-                }
-                
-                $classroom = Classroom::create([
+                $classNames[] = $validated['class_name_prefix'] . ' ' . 'N' . str_pad($i, 2, '0', STR_PAD_LEFT);
+            }
+
+            // Kiểm tra trùng tên cho cả lô bằng một query
+            $existingNames = Classroom::where('semester_id', $validated['semester_id'])
+                ->where('course_id', $validated['course_id'])
+                ->whereIn('name', $classNames)
+                ->pluck('name')
+                ->all();
+            $duplicateName = collect($classNames)->first(fn ($name) => in_array($name, $existingNames, true));
+
+            if ($duplicateName) {
+                return back()->withErrors(['class_name_prefix' => "Lớp học '{$duplicateName}' đã tồn tại trong học kỳ này"]);
+            }
+
+            // Cấp mã cho cả lô một lần rồi insert trong một transaction (không qua event creating)
+            $codes = Classroom::generateCodes(count($classNames));
+            $now = now();
+            $rows = [];
+            foreach ($classNames as $index => $className) {
+                $rows[] = [
                     'name' => $className,
+                    'code' => $codes[$index],
                     'semester_id' => $validated['semester_id'],
                     'course_id' => $validated['course_id'],
-                    'teacher_id' => $validated['teacher_id'],
+                    'teacher_id' => $validated['teacher_id'] ?? null,
                     'students' => $validated['students_per_class'],
-                ]);
-                
-                $createdClasses[] = $classroom;
+                    'created_at' => $now,
+                    'updated_at' => $now,
+                ];
             }
+
+            DB::transaction(function () use ($rows) {
+                foreach (array_chunk($rows, 500) as $chunk) {
+                    Classroom::insert($chunk);
+                }
+            });
+
+            $this->search->indexCodes($codes);
+            $this->dashboardCache->forget('classrooms');
             
             return redirect()->route('classrooms.index')
-                ->with('message', 'Đã tạo thành công ' . count($createdClasses) . ' lớp học cho môn ' . $course->name);
+                ->with('message', 'Đã tạo thành công ' . count($rows) . ' lớp học cho môn ' . $course->name);
                 
         } catch (\Illuminate\Validation\ValidationException $e) {
             return redirect()->back()->withErrors($e->errors())->withInput();
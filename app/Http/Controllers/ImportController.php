@@ -0,0 +1,37 @@
+<?php
+
+namespace App\Http\Controllers;
+
+use App\Services\CsvImportService;
+use Illuminate\Http\Request;
+
+class ImportController extends Controller
+{
+    protected $csvImport;
+
+    public function __construct(CsvImportService $csvImport)
+    {
+        $this->csvImport = $csvImport;
+    }
+
+    /**
+     * Nhập giáo viên / môn học / lớp học từ file CSV, trả về báo cáo JSON (số dòng đã nhập và các dòng lỗi)
+     */
+    public function store(Request $request, string $type)
+    {
+        $request->validate([
+            'file' => 'required|file|mimes:csv,txt',
+            'dry_run' => 'nullable|boolean',
+        ], [
+            'file.required' => 'Cần chọn file CSV',
+            'file.mimes' => 'File phải là CSV',
+        ]);
+
+        // File hàng nghìn dòng (kèm băm mật khẩu giáo viên) có thể vượt max_execution_time mặc định
+        set_time_limit(0);
+
+        $report = $this->csvImport->import($type, $request->file('file')->getRealPath(), $request->boolean('dry_run'));
+
+        return response()->json($report);
+    }
+}
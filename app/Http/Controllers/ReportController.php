@@ -7,14 +7,27 @@
 use App\Models\AcademicYear;
 use App\Models\TeacherSalary;
 use App\Models\SalaryConfig;
+use App\Services\DataExportService;
+use App\Services\PdfCacheService;
+use App\Services\ReportService;
 use Illuminate\Http\Request;
 use Inertia\Inertia;
-use Barryvdh\DomPDF\Facade\Pdf;
 use Illuminate\Support\Facades\DB;
 // use App\Http\Controllers\Str;
 
 class ReportController extends Controller
 {
+    protected $reportService;
+    protected $pdfCache;
+    protected $dataExport;
+
+    public function __construct(ReportService $reportService, PdfCacheService $pdfCache, DataExportService $dataExport)
+    {
+        $this->reportService = $reportService;
+        $this->pdfCache = $pdfCache;
+        $this->dataExport = $dataExport;
+    }
+
     /**
      * UC4 - Main reports index page
      */
@@ -40,60 +53,44 @@ public function index()
     }
 
     /**
-     * FIX: Helper method để lấy data báo cáo teacher yearly
+     * Kiểm tra quyền xem báo cáo (dùng chung cho trang báo cáo và xuất PDF)
      */
-private function getTeacherYearlyData($teacherId, $academicYearId)
-{
-    $user = auth()->user();
+    private function authorizeTeacherReport($teacherId)
+    {
+        $user = auth()->user();
 
-    // Check permission
-    if ($user->isDepartmentHead()) {
-        $teacher = Teacher::find($teacherId);
-        if ($teacher->department_id !== $user->department_id) {
-            abort(403, 'Bạn chỉ có thể xem báo cáo giáo viên trong khoa của mình');
+        if ($user->isDepartmentHead()) {
+            $teacher = Teacher::find($teacherId);
+            if ($teacher->department_id !== $user->department_id) {
+                abort(403, 'Bạn chỉ có thể xem báo cáo giáo viên trong khoa của mình');
+            }
         }
     }
 
-    $teacher = Teacher::with(['department', 'degree'])->find($teacherId);
-    $academicYear = AcademicYear::with('semesters')->find($academicYearId);
-
-    // FIX: Query với relationship đúng tên cột
-    $salaryData = TeacherSalary::with([
-        'salaryConfig.semester',
-        'classroom.course'
-    ])
-    ->where('teacher_id', $teacherId)
-    ->whereHas('salaryConfig.semester', function($q) use ($academicYearId) {
-        // FIX: Sử dụng tên cột đúng trong database
-        $q->where('academicYear_id', $academicYearId); // Thay vì 'academicYear_id'
-    })
-    ->get()
-    ->groupBy('salaryConfig.semester.name');
-
-    // Calculate totals
-    $totalSalary = 0;
-    $totalClasses = 0;
-    $totalLessons = 0;
-    
-    foreach ($salaryData as $semesterSalaries) {
-        foreach ($semesterSalaries as $salary) {
-            $totalSalary += (float) ($salary->total_salary ?? 0);
-            $totalClasses += 1;
-            $totalLessons += (float) ($salary->converted_lessons ?? 0);
+    private function authorizeDepartmentReport($departmentId)
+    {
+        $user = auth()->user();
+
+        if ($user->isDepartmentHead() && $departmentId != $user->department_id) {
+            abort(403, 'Bạn chỉ có thể xem báo cáo khoa của mình');
         }
     }
 
-    return [
-        'teacher' => $teacher,
-        'academicYear' => $academicYear,
-        'salaryData' => $salaryData,
-        'summary' => [
-            'totalSalary' => $totalSalary,
-            'totalClasses' => $totalClasses,
-            'totalLessons' => $totalLessons,
-            'averageSalaryPerClass' => $totalClasses > 0 ? $totalSalary / $totalClasses : 0
-        ]
-    ];
+    private function authorizeSchoolReport()
+    {
+        if (!auth()->user()->isAdmin()) {
+            abort(403, 'Chỉ Admin mới có quyền xem báo cáo toàn trường');
+        }
+    }
+
+    /**
+     * FIX: Helper method để lấy data báo cáo teacher yearly
+     */
+private function getTeacherYearlyData($teacherId, $academicYearId)
+{
+    $this->authorizeTeacherReport($teacherId);
+
+    return $this->reportService->teacherYearlyReport((int) $teacherId, (int) $academicYearId);
 }
 
     /**
@@ -101,69 +98,19 @@ private function getTeacherYearlyData($teacherId, $academicYearId)
      */
     private function getDepartmentReportData($departmentId, $academicYearId)
     {
-        $user = auth()->user();
-        
-        if ($user->isDepartmentHead() && $departmentId != $user->department_id) {
-            abort(403, 'Bạn chỉ có thể xem báo cáo khoa của mình');
-        }
+        $this->authorizeDepartmentReport($departmentId);
 
         $department = Department::find($departmentId);
         $academicYear = AcademicYear::find($academicYearId);
 
-        // Get all teachers in department with their salary data
-        $teachersData = Teacher::with(['degree'])
-            ->where('department_id', $departmentId)
-            ->get()
-            ->map(function ($teacher) use ($academicYearId) {
-                $salaryData = TeacherSalary::with([
-                    'salaryConfig.semester',
-                    'classroom.course'
-                ])
-                ->where('teacher_id', $teacher->id)
-                ->whereHas('salaryConfig.semester', function($q) use ($academicYearId) {
-                    $q->where('academicYear_id', $academicYearId);
-                })
-                ->get();
-
-                $totalSalary = $salaryData->sum('total_salary');
-                $totalClasses = $salaryData->count();
-                $totalLessons = $salaryData->sum('converted_lessons');
-
-                return [
-                    'teacher' => $teacher,
-                    'totalSalary' => (float) $totalSalary,
-                    'totalClasses' => $totalClasses,
-                    'totalLessons' => (float) $totalLessons,
-                    'salaryBySemester' => $salaryData->groupBy('salaryConfig.semester.name')
-                        ->map(function ($semesterSalaries) {
-                            return [
-                                'totalSalary' => (float) $semesterSalaries->sum('total_salary'),
-                                'totalClasses' => $semesterSalaries->count(),
-                                'totalLessons' => (float) $semesterSalaries->sum('converted_lessons')
-                            ];
-                        })
-                ];
-            })
-            ->filter(function ($teacherData) {
-                return $teacherData['totalSalary'] > 0;
-            })
-            ->sortByDesc('totalSalary');
-
-        // Calculate department totals
-        $departmentTotals = [
-            'totalTeachers' => $teachersData->count(),
-            'totalSalary' => $teachersData->sum('totalSalary'),
-            'totalClasses' => $teachersData->sum('totalClasses'),
-            'totalLessons' => $teachersData->sum('totalLessons'),
-            'averageSalaryPerTeacher' => $teachersData->count() > 0 ? 
-                $teachersData->sum('totalSalary') / $teachersData->count() : 0
-        ];
+        // Tổng theo giáo viên/học kỳ tính bằng vài query GROUP BY thay vì một query cho mỗi giáo viên
+        $reportData = $this->reportService->departmentReport((int) $departmentId, (int) $academicYearId);
 
         return [
             'department' => $department,
             'academicYear' => $academicYear,
-            'teachersData' => $teachersData->values(),
-            'departmentTotals' => $departmentTotals
+            'teachersData' => $reportData['teachersData'],
+            'departmentTotals' => $reportData['departmentTotals']
         ];
     }
 
@@ -172,68 +119,17 @@ private function getDepartmentReportData($departmentId, $academicYearId)
      */
     private function getSchoolReportData($academicYearId)
     {
-        $user = auth()->user();
-        
-        if (!$user->isAdmin()) {
-            abort(403, 'Chỉ Admin mới có quyền xem báo cáo toàn trường');
-        }
+        $this->authorizeSchoolReport();
 
         $academicYear = AcademicYear::find($academicYearId);
 
-        // Get data by departments
-        $departmentsData = Department::get()
-            ->map(function ($department) use ($academicYearId) {
-                $teachersData = Teacher::where('department_id', $department->id)
-                    ->get()
-                    ->map(function ($teacher) use ($academicYearId) {
-                        $salaryData = TeacherSalary::where('teacher_id', $teacher->id)
-                            ->whereHas('salaryConfig.semester', function($q) use ($academicYearId) {
-                                $q->where('academicYear_id', $academicYearId);
-                            })
-                            ->get();
-
-                        return [
-                            'teacher' => $teacher,
-                            'totalSalary' => (float) $salaryData->sum('total_salary'),
-                            'totalClasses' => $salaryData->count(),
-                            'totalLessons' => (float) $salaryData->sum('converted_lessons')
-                        ];
-                    })
-                    ->filter(function ($teacherData) {
-                        return $teacherData['totalSalary'] > 0;
-                    });
-
-                return [
-                    'department' => $department,
-                    'teachersCount' => $teachersData->count(),
-                    'totalSalary' => $teachersData->sum('totalSalary'),
-                    'totalClasses' => $teachersData->sum('totalClasses'),
-                    'totalLessons' => $teachersData->sum('totalLessons'),
-                    'teachers' => $teachersData->sortByDesc('totalSalary')->take(5)->values()
-                ];
-            })
-            ->filter(function ($departmentData) {
-                return $departmentData['teachersCount'] > 0;
-            })
-            ->sortByDesc('totalSalary');
-
-        // Calculate school totals
-        $schoolTotals = [
-            'totalDepartments' => $departmentsData->count(),
-            'totalTeachers' => $departmentsData->sum('teachersCount'),
-            'totalSalary' => $departmentsData->sum('totalSalary'),
-            'totalClasses' => $departmentsData->sum('totalClasses'),
-            'totalLessons' => $departmentsData->sum('totalLessons'),
-            'averageSalaryPerTeacher' => $departmentsData->sum('teachersCount') > 0 ? 
-                $departmentsData->sum('totalSalary') / $departmentsData->sum('teachersCount') : 0,
-            'averageSalaryPerDepartment' => $departmentsData->count() > 0 ? 
-                $departmentsData->sum('totalSalary') / $departmentsData->count() : 0
-        ];
+        // Tổng theo khoa và top giáo viên mỗi khoa tính bằng query GROUP BY trên toàn năm học
+        $reportData = $this->reportService->schoolReport((int) $academicYearId);
 
         return [
             'academicYear' => $academicYear,
-            'departmentsData' => $departmentsData->values(),
-            'schoolTotals' => $schoolTotals
+            'departmentsData' => $reportData['departmentsData'],
+            'schoolTotals' => $reportData['schoolTotals']
         ];
     }
 
@@ -313,54 +209,68 @@ public function exportPdf(Request $request)
     }
 
     /**
-     * FIX: Export PDF methods sử dụng helper
+     * Xuất báo cáo năm (toàn trường hoặc một khoa) ra CSV/XLSX, mỗi dòng là một giáo viên trong một học kỳ
      */
-private function exportTeacherYearlyPdf(Request $request)
-{
-    $validated = $request->validate([
-        'teacher_id' => 'required|exists:teachers,id',
-        'academic_year_id' => 'required|exists:academic_years,id'
-    ]);
-
-    // FIX: Get data và convert properly
-    $reportData = $this->getTeacherYearlyData($validated['teacher_id'], $validated['academic_year_id']);
-    
-    // FIX: Convert arrays to objects để PDF template có thể dùng arrow notation
-    $pdfData = [
-        'teacher' => (object) $reportData['teacher']->toArray(),
-        'academicYear' => (object) $reportData['academicYear']->toArray(),
-        'salaryData' => $reportData['salaryData']->map(function ($semesterSalaries) {
-            return collect($semesterSalaries)->map(function ($salary) {
-                // FIX: Ensure classroom and course are objects
-                $salaryArray = $salary->toArray();
-                $salaryArray['classroom'] = (object) $salary->classroom->toArray();
-                $salaryArray['classroom']->course = (object) $salary->classroom->course->toArray();
-                return (object) $salaryArray;
-            });
-        })->toArray(),
-        'summary' => $reportData['summary']
-    ];
-
-    // FIX: Add department and degree as objects
-    if (isset($reportData['teacher']->department)) {
-        $pdfData['teacher']->department = (object) $reportData['teacher']->department->toArray();
-    }
-    
-    if (isset($reportData['teacher']->degree)) {
-        $pdfData['teacher']->degree = (object) $reportData['teacher']->degree->toArray();
+    public function exportData(Request $request)
+    {
+        $validated = $request->validate([
+            'type' => 'required|in:school,department',
+            'format' => 'nullable|in:csv,xlsx',
+            'academic_year_id' => 'required|exists:academic_years,id',
+            'department_id' => 'required_if:type,department|nullable|exists:departments,id'
+        ]);
+
+        $academicYear = AcademicYear::find($validated['academic_year_id']);
+
+        if ($validated['type'] === 'school') {
+            $this->authorizeSchoolReport();
+            $departmentId = null;
+            $filename = 'bao-cao-toan-truong-' . \Illuminate\Support\Str::slug($academicYear->name);
+        } else {
+            $this->authorizeDepartmentReport($validated['department_id']);
+            $departmentId = (int) $validated['department_id'];
+            $filename = sprintf(
+                'bao-cao-khoa-%s-%s',
+                \Illuminate\Support\Str::slug(Department::find($departmentId)->name),
+                \Illuminate\Support\Str::slug($academicYear->name)
+            );
+        }
+
+        return $this->dataExport->download(
+            $validated['format'] ?? 'csv',
+            $filename,
+            DataExportService::YEARLY_COLUMNS,
+            $this->dataExport->yearlyRows($academicYear->id, $departmentId)
+        );
     }
 
-    $pdf = Pdf::loadView('reports.teacher-yearly-pdf', $pdfData);
-    $pdf->setPaper('A4', 'portrait');
-    
-    $filename = sprintf(
-        'bao-cao-gv-%s-%s.pdf',
-        \Illuminate\Support\Str::slug($reportData['teacher']->fullName),
-        $reportData['academicYear']->name
-    );
-    
-    return $pdf->download($filename);
-}
+    /**
+     * FIX: Export PDF methods sử dụng helper
+     * PDF lấy từ cache trên disk (PdfCacheService), chỉ render bằng DomPDF khi chưa có
+     */
+    private function exportTeacherYearlyPdf(Request $request)
+    {
+        $validated = $request->validate([
+            'teacher_id' => 'required|exists:teachers,id',
+            'academic_year_id' => 'required|exists:academic_years,id'
+        ]);
+
+        $this->authorizeTeacherReport($validated['teacher_id']);
+
+        $teacher = Teacher::find($validated['teacher_id']);
+        $academicYear = AcademicYear::find($validated['academic_year_id']);
+
+        $filename = sprintf(
+            'bao-cao-gv-%s-%s.pdf',
+            \Illuminate\Support\Str::slug($teacher->fullName),
+            $academicYear->name
+        );
+
+        return $this->pdfCache->respond($request, 'teacher', [
+            'teacher_id' => (int) $validated['teacher_id'],
+            'academic_year_id' => (int) $validated['academic_year_id']
+        ], $filename);
+    }
 
     private function exportDepartmentPdf(Request $request)
     {
@@ -369,33 +279,21 @@ private function exportDepartmentPdf(Request $request)
             'academic_year_id' => 'required|exists:academic_years,id'
         ]);
 
-        $reportData = $this->getDepartmentReportData($validated['department_id'], $validated['academic_year_id']);
-        
-        // FIX: Convert to array for PDF template
-        $pdfData = [
-            'department' => $reportData['department']->toArray(),
-            'academicYear' => $reportData['academicYear']->toArray(),
-            'teachersData' => $reportData['teachersData']->map(function($item) {
-                return [
-                    'teacher' => $item['teacher']->toArray(),
-                    'totalSalary' => $item['totalSalary'],
-                    'totalClasses' => $item['totalClasses'],
-                    'totalLessons' => $item['totalLessons']
-                ];
-            })->toArray(),
-            'departmentTotals' => $reportData['departmentTotals']
-        ];
-        
-        $pdf = Pdf::loadView('reports.department-pdf', $pdfData);
-        $pdf->setPaper('A4', 'landscape');
-        
+        $this->authorizeDepartmentReport($validated['department_id']);
+
+        $department = Department::find($validated['department_id']);
+        $academicYear = AcademicYear::find($validated['academic_year_id']);
+
         $filename = sprintf(
             'bao-cao-khoa-%s-%s.pdf',
-            \Illuminate\Support\Str::slug($reportData['department']->name),
-            $reportData['academicYear']->name
+            \Illuminate\Support\Str::slug($department->name),
+            $academicYear->name
         );
-        
-        return $pdf->download($filename);
+
+        return $this->pdfCache->respond($request, 'department', [
+            'department_id' => (int) $validated['department_id'],
+            'academic_year_id' => (int) $validated['academic_year_id']
+        ], $filename);
     }
 
     private function exportSchoolPdf(Request $request)
@@ -404,40 +302,18 @@ private function exportSchoolPdf(Request $request)
             'academic_year_id' => 'required|exists:academic_years,id'
         ]);
 
-        $reportData = $this->getSchoolReportData($validated['academic_year_id']);
-        
-        // FIX: Convert to array for PDF template
-        $pdfData = [
-            'academicYear' => $reportData['academicYear']->toArray(),
-            'departmentsData' => $reportData['departmentsData']->map(function($item) {
-                return [
-                    'department' => $item['department']->toArray(),
-                    'teachersCount' => $item['teachersCount'],
-                    'totalSalary' => $item['totalSalary'],
-                    'totalClasses' => $item['totalClasses'],
-                    'totalLessons' => $item['totalLessons'],
-                    'teachers' => collect($item['teachers'])->map(function($teacher) {
-                        return [
-                            'teacher' => $teacher['teacher']->toArray(),
-                            'totalSalary' => $teacher['totalSalary'],
-                            'totalClasses' => $teacher['totalClasses'],
-                            'totalLessons' => $teacher['totalLessons']
-                        ];
-                    })->toArray()
-                ];
-            })->toArray(),
-            'schoolTotals' => $reportData['schoolTotals']
-        ];
-        
-        $pdf = Pdf::loadView('reports.school-pdf', $pdfData);
-        $pdf->setPaper('A4', 'landscape');
-        
+        $this->authorizeSchoolReport();
+
+        $academicYear = AcademicYear::find($validated['academic_year_id']);
+
         $filename = sprintf(
             'bao-cao-toan-truong-%s.pdf',
-            $reportData['academicYear']->name
+            $academicYear->name
         );
-        
-        return $pdf->download($filename);
+
+        return $this->pdfCache->respond($request, 'school', [
+            'academic_year_id' => (int) $validated['academic_year_id']
+        ], $filename);
     }
     /**
      * FIX: Teacher reports index - Trang chọn năm học cho giáo viên
@@ -495,7 +371,7 @@ public function teacherYearly(Request $request, AcademicYear $academicYear)
     /**
      * Export PDF báo cáo hàng năm của giáo viên
      */
-    public function exportTeacherYearlyPdfForTeacher(AcademicYear $academicYear)
+    public function exportTeacherYearlyPdfForTeacher(Request $request, AcademicYear $academicYear)
     {
         $user = auth()->user();
         
@@ -511,15 +387,14 @@ public function exportTeacherYearlyPdfForTeacher(AcademicYear $academicYear)
             abort(404, 'Không tìm thấy thông tin giảng viên');
         }
         
-        $reportData = $this->getTeacherReportData($teacher->id, $academicYear->id);
-        
-        $pdf = Pdf::loadView('reports.teacher-yearly-pdf', $reportData);
-        $pdf->setPaper('A4', 'portrait');
-        
         $fileName = "bao-cao-luong-{$teacher->fullName}-{$academicYear->name}.pdf";
         $fileName = \Illuminate\Support\Str::slug($fileName) . '.pdf';
-        
-        return $pdf->download($fileName);
+
+        // Cùng file cache với báo cáo năm của giáo viên mà admin/trưởng khoa xuất
+        return $this->pdfCache->respond($request, 'teacher', [
+            'teacher_id' => (int) $teacher->id,
+            'academic_year_id' => (int) $academicYear->id
+        ], $fileName);
     }
 
     /**
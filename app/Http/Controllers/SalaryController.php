@@ -2,24 +2,37 @@
 
 namespace App\Http\Controllers;
 
+use App\Jobs\CalculateSemesterSalaries;
 use App\Models\SalaryConfig;
 use App\Models\TeacherSalary;
 use App\Models\Semester;
 use App\Models\Teacher;
 use App\Models\AcademicYear;
+use App\Services\DataExportService;
+use App\Services\PdfCacheService;
+use App\Services\SalaryAggregateService;
 use App\Services\SalaryCalculatorService;
 use Illuminate\Http\Request;
 use Inertia\Inertia;
-use Barryvdh\DomPDF\Facade\Pdf;
 use Illuminate\Support\Str;
 
 class SalaryController extends Controller
 {
     protected $salaryCalculator;
-
-    public function __construct(SalaryCalculatorService $salaryCalculator)
-    {
+    protected $salaryAggregates;
+    protected $pdfCache;
+    protected $dataExport;
+
+    public function __construct(
+        SalaryCalculatorService $salaryCalculator,
+        SalaryAggregateService $salaryAggregates,
+        PdfCacheService $pdfCache,
+        DataExportService $dataExport
+    ) {
         $this->salaryCalculator = $salaryCalculator;
+        $this->salaryAggregates = $salaryAggregates;
+        $this->pdfCache = $pdfCache;
+        $this->dataExport = $dataExport;
     }
 
     /**
@@ -64,9 +77,19 @@ public function index()
             // DEBUG: Log để kiểm tra
             // \Log::info('Semesters data:', $semesters->toArray());
             
+            // Lần tính còn trong hàng đợi: mở lại trang vẫn thấy tiến độ và nút tính vẫn bị khoá
+            $calculations = [];
+            foreach ($salaryConfigs->items() as $salaryConfig) {
+                $progress = CalculateSemesterSalaries::progress($salaryConfig->id);
+                if (in_array($progress['status'] ?? null, ['queued', 'running'], true)) {
+                    $calculations[$salaryConfig->id] = $progress;
+                }
+            }
+
             return Inertia::render('Salary/Index', [
                 'salaryConfigs' => $salaryConfigs,
-                'semesters' => $semesters->toArray()
+                'semesters' => $semesters->toArray(),
+                'calculations' => (object) $calculations,
             ]);
         }
 
@@ -111,25 +134,46 @@ public function calculate(Request $request, SalaryConfig $salaryConfig)
             return back()->withErrors(['status' => 'Không thể tính lại lương đã đóng']);
         }
 
-        try {
-            $result = $this->salaryCalculator->calculateSalariesForSemester($salaryConfig);
-            
-            // Cập nhật status
-            $salaryConfig->update(['status' => 'active']);
+        // Mỗi bảng lương chỉ một lần tính tại một thời điểm; job nhả khoá khi xong
+        $lock = CalculateSemesterSalaries::store()->lock(CalculateSemesterSalaries::lockName($salaryConfig->id), CalculateSemesterSalaries::LOCK_SECONDS);
 
-            $message = "Tính lương thành công! ";
-            $message .= "Đã tính: {$result['total_calculated']} lớp học. ";
-            
-            if ($result['total_errors'] > 0) {
-                $message .= "Lỗi: {$result['total_errors']} lớp học.";
-            }
+        if (!$lock->get()) {
+            return back()->withErrors(['calculation' => 'Bảng lương học kỳ này đang được tính, vui lòng chờ hoàn tất']);
+        }
 
-            return redirect()->route('salary.report', $salaryConfig)
-                ->with('message', $message);
-                
-        } catch (\Exception $e) {
-            return back()->withErrors(['calculation' => 'Lỗi tính lương: ' . $e->getMessage()]);
+        CalculateSemesterSalaries::reportProgress($salaryConfig->id, [
+            'status' => 'queued',
+            'processed' => 0,
+            'total' => null,
+            'message' => null,
+            'result' => null,
+            'errors' => [],
+            'queued_at' => now()->toIso8601String(),
+            'started_at' => null,
+            'finished_at' => null,
+        ]);
+
+        CalculateSemesterSalaries::dispatch($salaryConfig->id, $request->boolean('full'), $lock->owner());
+
+        return back()->with('message', 'Đã đưa việc tính lương học kỳ ' . $salaryConfig->semester->name . ' vào hàng đợi');
+    }
+
+    /**
+     * Tiến độ tính lương (trang danh sách poll định kỳ)
+     */
+    public function calculationStatus(SalaryConfig $salaryConfig)
+    {
+        $user = auth()->user();
+        
+        if (!$user->isAdmin()) {
+            abort(403, 'Chỉ Admin mới có quyền tính lương');
         }
+
+        return response()->json(array_merge(
+            ['status' => 'idle', 'processed' => 0, 'total' => null],
+            CalculateSemesterSalaries::progress($salaryConfig->id) ?? [],
+            ['salary_config_status' => $salaryConfig->status]
+        ));
     }
 
     /**
@@ -168,7 +212,15 @@ public function close(SalaryConfig $salaryConfig)
             abort(403, 'Chỉ Admin mới có quyền đóng bảng lương');
         }
 
+        if (CalculateSemesterSalaries::isRunning($salaryConfig->id)) {
+            return back()->withErrors(['status' => 'Bảng lương đang được tính, không thể đóng lúc này']);
+        }
+
         $salaryConfig->update(['status' => 'closed']);
+
+        // Chốt số liệu tổng hợp của học kỳ, các lần xem báo cáo sau không tính lại
+        $this->salaryAggregates->refresh($salaryConfig);
+        $this->pdfCache->refresh($salaryConfig);
         
         return back()->with('message', 'Đã đóng bảng lương học kỳ ' . $salaryConfig->semester->name);
     }
@@ -176,7 +228,7 @@ public function close(SalaryConfig $salaryConfig)
     /**
      * Xuất báo cáo PDF
      */
-    public function exportPdf(SalaryConfig $salaryConfig)
+    public function exportPdf(Request $request, SalaryConfig $salaryConfig)
     {
         $user = auth()->user();
         
@@ -185,53 +237,6 @@ public function exportPdf(SalaryConfig $salaryConfig)
             abort(403, 'Bạn không có quyền xuất báo cáo lương');
         }
 
-        // Lấy dữ liệu báo cáo
-        if ($user->isAdmin()) {
-            $salaryReport = $this->salaryCalculator->getSalaryReport($salaryConfig);
-        } elseif ($user->isDepartmentHead()) {
-            $salaryReport = $this->salaryCalculator->getSalaryReport($salaryConfig)
-                ->filter(function ($item) use ($user) {
-                    return $item['teacher']->department_id === $user->department_id;
-                });
-        }
-
-        // Tính toán thống kê tổng
-        $totalStats = $salaryReport->reduce(function ($carry, $teacherData) {
-            return [
-                'totalTeachers' => ($carry['totalTeachers'] ?? 0) + 1,
-                'totalClasses' => ($carry['totalClasses'] ?? 0) + $teacherData['total_classes'],
-                'totalLessons' => ($carry['totalLessons'] ?? 0) + $teacherData['total_lessons'],
-                'totalSalary' => ($carry['totalSalary'] ?? 0) + $teacherData['total_salary']
-            ];
-        }, ['totalTeachers' => 0, 'totalClasses' => 0, 'totalLessons' => 0, 'totalSalary' => 0]);
-
-        // Labels cho trạng thái
-        $statusLabels = [
-            'draft' => 'Bản nháp',
-            'active' => 'Đã tính',
-            'closed' => 'Đã đóng'
-        ];
-
-        // Load relationships
-        $salaryConfig->load(['semester.academicYear']);
-
-        // Tạo PDF
-        $pdf = Pdf::loadView('salary.report-pdf', [
-            'salaryConfig' => $salaryConfig,
-            'salaryReport' => $salaryReport,
-            'totalStats' => $totalStats,
-            'statusLabels' => $statusLabels
-        ]);
-
-        // Cấu hình PDF
-        $pdf->setPaper('A4', 'portrait');
-        $pdf->setOptions([
-            'dpi' => 150,
-            'defaultFont' => 'DejaVu Sans',
-            'isRemoteEnabled' => true,
-            'isHtml5ParserEnabled' => true,
-        ]);
-
         // Tên file PDF
        $filename = sprintf(
             'bao-cao-luong-%s-%s.pdf',
@@ -239,14 +244,14 @@ public function exportPdf(SalaryConfig $salaryConfig)
             now()->format('Y-m-d')
         );
 
-        // Trả về PDF download
-        return $pdf->download($filename);
+        // PDF lấy từ cache trên disk, chỉ render bằng DomPDF khi chưa có
+        return $this->pdfCache->respond($request, 'salary', $this->salaryPdfParams($salaryConfig), $filename);
     }
 
     /**
      * Xem trước PDF (stream)
      */
-    public function previewPdf(SalaryConfig $salaryConfig)
+    public function previewPdf(Request $request, SalaryConfig $salaryConfig)
     {
         $user = auth()->user();
         
@@ -254,48 +259,48 @@ public function previewPdf(SalaryConfig $salaryConfig)
             abort(403, 'Bạn không có quyền xem báo cáo lương');
         }
 
-        // Same logic as exportPdf but stream instead of download
-        if ($user->isAdmin()) {
-            $salaryReport = $this->salaryCalculator->getSalaryReport($salaryConfig);
-        } elseif ($user->isDepartmentHead()) {
-            $salaryReport = $this->salaryCalculator->getSalaryReport($salaryConfig)
-                ->filter(function ($item) use ($user) {
-                    return $item['teacher']->department_id === $user->department_id;
-                });
-        }
+        // Cùng file cache với exportPdf nhưng hiển thị inline
+        return $this->pdfCache->respond($request, 'salary', $this->salaryPdfParams($salaryConfig),
+            'bao-cao-luong-preview.pdf', 'inline');
+    }
 
-        $totalStats = $salaryReport->reduce(function ($carry, $teacherData) {
-            return [
-                'totalTeachers' => ($carry['totalTeachers'] ?? 0) + 1,
-                'totalClasses' => ($carry['totalClasses'] ?? 0) + $teacherData['total_classes'],
-                'totalLessons' => ($carry['totalLessons'] ?? 0) + $teacherData['total_lessons'],
-                'totalSalary' => ($carry['totalSalary'] ?? 0) + $teacherData['total_salary']
-            ];
-        }, ['totalTeachers' => 0, 'totalClasses' => 0, 'totalLessons' => 0, 'totalSalary' => 0]);
-
-        $statusLabels = [
-            'draft' => 'Bản nháp',
-            'active' => 'Đã tính',
-            'closed' => 'Đã đóng'
-        ];
+    /**
+     * Xuất dữ liệu lương theo lớp của học kỳ ra CSV/XLSX (stream, không dựng toàn bộ trong bộ nhớ)
+     */
+    public function exportData(Request $request, SalaryConfig $salaryConfig)
+    {
+        $user = auth()->user();
 
-        $salaryConfig->load(['semester.academicYear']);
+        if (!$user->isAdmin() && !$user->isDepartmentHead()) {
+            abort(403, 'Bạn không có quyền xuất báo cáo lương');
+        }
 
-        $pdf = Pdf::loadView('salary.report-pdf', [
-            'salaryConfig' => $salaryConfig,
-            'salaryReport' => $salaryReport,
-            'totalStats' => $totalStats,
-            'statusLabels' => $statusLabels
+        $validated = $request->validate([
+            'format' => 'nullable|in:csv,xlsx'
         ]);
 
-        $pdf->setPaper('A4', 'portrait');
-        $pdf->setOptions([
-            'dpi' => 150,
-            'defaultFont' => 'DejaVu Sans',
-        ]);
+        $departmentId = $user->isAdmin() ? null : (int) $user->department_id;
+        $filename = sprintf('luong-%s-%s', Str::slug($salaryConfig->semester->name), now()->format('Y-m-d'));
 
-        // Stream PDF để xem trước
-        return $pdf->stream('bao-cao-luong-preview.pdf');
+        return $this->dataExport->download(
+            $validated['format'] ?? 'csv',
+            $filename,
+            DataExportService::SALARY_COLUMNS,
+            $this->dataExport->salaryRows($salaryConfig, $departmentId)
+        );
+    }
+
+    /**
+     * Tham số báo cáo PDF: trưởng khoa chỉ thấy giáo viên trong khoa
+     */
+    private function salaryPdfParams(SalaryConfig $salaryConfig): array
+    {
+        $user = auth()->user();
+
+        return [
+            'salary_config_id' => $salaryConfig->id,
+            'department_id' => $user->isAdmin() ? null : (int) $user->department_id,
+        ];
     }
 
     /**
@@ -7,6 +7,7 @@
 use App\Models\Degree;
 use App\Models\Department;
 use App\Models\User;
+use App\Services\ReferenceDataService;
 use Inertia\Inertia;
 use Illuminate\Validation\Rule;
 use Illuminate\Support\Facades\DB;
@@ -14,28 +15,31 @@
 
 class TeacherController extends Controller
 {
+    protected $referenceData;
+
+    public function __construct(ReferenceDataService $referenceData)
+    {
+        $this->referenceData = $referenceData;
+    }
+
     public function index(){
         $user = auth()->user();
-        if($user->isAdmin()){
-            $teachers = Teacher::with(['degree', 'department'])->paginate(10);
-        }
-        else{
-            $teachers = Teacher::with(['degree', 'department'])
-                ->where('department_id', $user->department_id)
-                ->paginate(10);
-        }
-        if($user->isAdmin()){
-            $degrees = Degree::all();
-            $departments = Department::all();
-        }
-        else{
-            $departments = Department::where('id', $user->department_id)->get();
-            $degrees = Degree::all(); 
-        }
+        $departmentId = $user->isAdmin() ? null : $user->department_id;
+
+        // Lật trang dùng partial reload nên chỉ query danh sách giáo viên
+        $teachers = fn () => Teacher::with(['degree', 'department'])
+            ->when($departmentId, fn ($q) => $q->where('department_id', $departmentId))
+            ->paginate(10);
+
         return Inertia::render('Teachers/Index', [
+            ...$this->referenceData->props([
+                'degrees' => ['all', fn () => Degree::all()],
+                'departments' => [
+                    $departmentId ? "department:{$departmentId}" : 'all',
+                    fn () => Department::when($departmentId, fn ($q) => $q->where('id', $departmentId))->get(),
+                ],
+            ]),
             'teachers' => $teachers,
-            'degrees' => $degrees,
-            'departments' => $departments
         ]);
     }
 
@@ -0,0 +1,53 @@
+<?php
+
+namespace App\Http\Middleware;
+
+use App\Services\QueryStatsService;
+use Closure;
+use Illuminate\Http\Request;
+use Symfony\Component\HttpFoundation\Response;
+
+class AddQueryStatsHeaders
+{
+    /**
+     * Số mẫu N+1 tối đa đưa vào header (header quá dài bị proxy cắt)
+     */
+    private const MAX_REPEATED = 5;
+
+    protected $stats;
+
+    public function __construct(QueryStatsService $stats)
+    {
+        $this->stats = $stats;
+    }
+
+    /**
+     * Gắn số liệu query của request vào response (chỉ khi QUERY_STATS bật, mặc định chỉ môi trường testing).
+     * Đứng ngoài cùng để đếm cả query đọc/ghi session.
+     *
+     * @param  \Closure(\Illuminate\Http\Request): (\Symfony\Component\HttpFoundation\Response)  $next
+     */
+    public function handle(Request $request, Closure $next): Response
+    {
+        if (!$this->stats->enabled()) {
+            return $next($request);
+        }
+
+        $this->stats->reset();
+        $response = $next($request);
+        $summary = $this->stats->summary();
+
+        $repeated = array_map(fn ($pattern) => [
+            'sql' => mb_strimwidth(preg_replace('/\s+/', ' ', $pattern['sql']), 0, 200, '...'),
+            'count' => $pattern['count'],
+        ], array_slice($summary['repeated'], 0, self::MAX_REPEATED));
+
+        $response->headers->set('X-Query-Count', (string) $summary['count']);
+        $response->headers->set('X-Query-Infra-Count', (string) $summary['infra_count']);
+        $response->headers->set('X-Query-Time-Ms', (string) $summary['time_ms']);
+        $response->headers->set('X-Query-Duplicates', (string) $summary['duplicates']);
+        $response->headers->set('X-Query-Repeated', json_encode($repeated));
+
+        return $response;
+    }
+}
@@ -0,0 +1,37 @@
+<?php
+
+namespace App\Http\Middleware;
+
+use App\Services\ServerTimingService;
+use Closure;
+use Illuminate\Http\Request;
+use Symfony\Component\HttpFoundation\Response;
+
+class AddServerTiming
+{
+    protected $timing;
+
+    public function __construct(ServerTimingService $timing)
+    {
+        $this->timing = $timing;
+    }
+
+    /**
+     * Gắn header Server-Timing (bootstrap, session, app, db, inertia, view, total) vào mọi response.
+     * Đứng ngoài cùng; các mốc giữa request do MarkServerTimingApp và listener trong AppServiceProvider đặt.
+     *
+     * @param  \Closure(\Illuminate\Http\Request): (\Symfony\Component\HttpFoundation\Response)  $next
+     */
+    public function handle(Request $request, Closure $next): Response
+    {
+        if (!$this->timing->enabled()) {
+            return $next($request);
+        }
+
+        $this->timing->begin();
+        $response = $next($request);
+        $response->headers->set('Server-Timing', $this->timing->finish());
+
+        return $response;
+    }
+}
@@ -0,0 +1,33 @@
+<?php
+
+namespace App\Http\Middleware;
+
+use App\Services\ServerTimingService;
+use Closure;
+use Illuminate\Http\Request;
+use Symfony\Component\HttpFoundation\Response;
+
+class MarkServerTimingApp
+{
+    protected $timing;
+
+    public function __construct(ServerTimingService $timing)
+    {
+        $this->timing = $timing;
+    }
+
+    /**
+     * Mốc hết pha auth/session: xếp sau middleware xác thực trong priority list nên
+     * từ đây trở đi là thời gian của controller
+     *
+     * @param  \Closure(\Illuminate\Http\Request): (\Symfony\Component\HttpFoundation\Response)  $next
+     */
+    public function handle(Request $request, Closure $next): Response
+    {
+        if ($this->timing->phase() === 'session') {
+            $this->timing->enter('app');
+        }
+
+        return $next($request);
+    }
+}
@@ -0,0 +1,163 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\SalaryConfig;
+use App\Services\PdfCacheService;
+use App\Services\SalaryAggregateService;
+use App\Services\SalaryCalculatorService;
+use Illuminate\Cache\Repository;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Log;
+use Throwable;
+
+class CalculateSemesterSalaries implements ShouldQueue
+{
+    use Queueable;
+
+    /**
+     * Thời gian tối đa của một lần tính (giây); khoá giữ lâu hơn một chút
+     */
+    public const TIMEOUT = 3600;
+    public const LOCK_SECONDS = self::TIMEOUT + 60;
+
+    /**
+     * Số query của lần tính đang chạy (null khi không có job nào đang đếm). Listener đăng ký một lần
+     * trong AppServiceProvider, không đăng ký trong handle() để worker chạy lâu không tích listener cũ.
+     */
+    public static ?int $queryCount = null;
+
+    public $timeout = self::TIMEOUT;
+    public $tries = 1;
+
+    public function __construct(
+        public int $salaryConfigId,
+        public bool $full,
+        public string $lockOwner
+    ) {
+    }
+
+    /**
+     * Khoá và tiến độ được web và worker cùng đọc ghi, nên nằm ở store chung (cache.shared_store)
+     */
+    public static function store(): Repository
+    {
+        return Cache::store(config('cache.shared_store'));
+    }
+
+    public static function lockName(int $salaryConfigId): string
+    {
+        return "salary_calculation:{$salaryConfigId}:lock";
+    }
+
+    /**
+     * Tiến độ lần tính gần nhất: status (queued|running|completed|failed), processed, total, message, result
+     */
+    public static function progress(int $salaryConfigId): ?array
+    {
+        return self::store()->get("salary_calculation:{$salaryConfigId}");
+    }
+
+    public static function isRunning(int $salaryConfigId): bool
+    {
+        return in_array(self::progress($salaryConfigId)['status'] ?? null, ['queued', 'running'], true);
+    }
+
+    public static function reportProgress(int $salaryConfigId, array $values): void
+    {
+        $progress = array_merge(self::progress($salaryConfigId) ?? [], $values, [
+            'updated_at' => now()->toIso8601String(),
+        ]);
+
+        self::store()->put("salary_calculation:{$salaryConfigId}", $progress, now()->addDay());
+    }
+
+    public function handle(
+        SalaryCalculatorService $salaryCalculator,
+        SalaryAggregateService $salaryAggregates,
+        PdfCacheService $pdfCache
+    ): void
+    {
+        try {
+            $salaryConfig = SalaryConfig::findOrFail($this->salaryConfigId);
+
+            if ($salaryConfig->status === 'closed') {
+                throw new \Exception('Không thể tính lại lương đã đóng');
+            }
+
+            self::reportProgress($salaryConfig->id, ['status' => 'running', 'started_at' => now()->toIso8601String()]);
+
+            // Đo thời gian, số query và bộ nhớ đỉnh của lần tính (salaryBenchmark.py đọc từ log)
+            self::$queryCount = 0;
+            memory_reset_peak_usage();
+            $startedAt = microtime(true);
+
+            $onProgress = function (int $processed, int $total) use ($salaryConfig) {
+                self::reportProgress($salaryConfig->id, ['processed' => $processed, 'total' => $total]);
+            };
+
+            // Đã tính rồi thì chỉ tính lại các lớp thay đổi, trừ khi yêu cầu tính lại toàn bộ (full=1)
+            $result = $salaryConfig->status === 'active' && !$this->full
+                ? $salaryCalculator->recalculateChangedSalaries($salaryConfig, $onProgress)
+                : $salaryCalculator->calculateSalariesForSemester($salaryConfig, $onProgress);
+
+            // Cập nhật status
+            $salaryConfig->update(['status' => 'active']);
+
+            // Cập nhật bảng tổng hợp cho báo cáo và dashboard
+            $salaryAggregates->refresh($salaryConfig);
+            $pdfCache->refresh($salaryConfig);
+
+            $metrics = [
+                'salary_config_id' => $salaryConfig->id,
+                'mode' => $result['mode'],
+                'total_calculated' => $result['total_calculated'],
+                'total_removed' => $result['total_removed'],
+                'total_errors' => $result['total_errors'],
+                'duration_ms' => round((microtime(true) - $startedAt) * 1000, 1),
+                'query_count' => self::$queryCount,
+                'peak_memory_mb' => round(memory_get_peak_usage(true) / 1048576, 1),
+            ];
+            Log::info('Salary calculation finished', $metrics);
+
+            $message = "Tính lương thành công! ";
+            $message .= $result['mode'] === 'incremental'
+                ? "Đã tính lại: {$result['total_calculated']} lớp học thay đổi. "
+                : "Đã tính: {$result['total_calculated']} lớp học. ";
+
+            if ($result['total_errors'] > 0) {
+                $message .= "Lỗi: {$result['total_errors']} lớp học.";
+            }
+
+            self::reportProgress($salaryConfig->id, [
+                'status' => 'completed',
+                'message' => trim($message),
+                'result' => $metrics,
+                'errors' => array_slice($result['errors'], 0, 20),
+                'finished_at' => now()->toIso8601String(),
+            ]);
+        } finally {
+            self::$queryCount = null;
+            $this->releaseLock();
+        }
+    }
+
+    public function failed(?Throwable $exception): void
+    {
+        self::reportProgress($this->salaryConfigId, [
+            'status' => 'failed',
+            'message' => 'Lỗi tính lương: ' . ($exception?->getMessage() ?? 'không rõ nguyên nhân'),
+            'finished_at' => now()->toIso8601String(),
+        ]);
+
+        // Job bị kill do timeout thì handle() không kịp chạy finally
+        $this->releaseLock();
+    }
+
+    private function releaseLock(): void
+    {
+        self::store()->restoreLock(self::lockName($this->salaryConfigId), $this->lockOwner)->release();
+    }
+}
@@ -0,0 +1,43 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Services\PdfCacheService;
+use Illuminate\Contracts\Cache\Repository;
+use Illuminate\Contracts\Queue\ShouldBeUnique;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Queue\Queueable;
+use Illuminate\Support\Facades\Cache;
+
+class RenderPdfReport implements ShouldQueue, ShouldBeUnique
+{
+    use Queueable;
+
+    public $timeout = 600;
+    public $tries = 1;
+    public $uniqueFor = 600;
+
+    public function __construct(
+        public string $type,
+        public array $params
+    ) {
+    }
+
+    /**
+     * Client poll liên tục khi PDF chưa có: mỗi file chỉ một job trong hàng đợi
+     */
+    public function uniqueId(): string
+    {
+        return app(PdfCacheService::class)->path($this->type, $this->params);
+    }
+
+    public function uniqueVia(): Repository
+    {
+        return Cache::store(config('cache.shared_store'));
+    }
+
+    public function handle(PdfCacheService $pdfCache): void
+    {
+        $pdfCache->render($this->type, $this->params);
+    }
+}
@@ -14,6 +14,10 @@ class Classroom extends Model
 
     protected $codePrefix = 'LH';
     protected $codeColumn = 'code';
+
+    // Số lớp tối đa mỗi lần tạo hàng loạt (admin được tạo nhiều hơn khi nhập dữ liệu đầu kỳ)
+    public const BULK_MAX_CLASSES = 20;
+    public const BULK_MAX_CLASSES_ADMIN = 500;
     
     protected $fillable = [
         'name',
@@ -36,13 +40,15 @@ public static function rules($id = null){
     }
 
     // Validation rules cho bulk creation
-    public static function bulkRules(){
+    public static function bulkRules($isAdmin = false){
+        $maxClasses = $isAdmin ? self::BULK_MAX_CLASSES_ADMIN : self::BULK_MAX_CLASSES;
+
         return [
             'course_id' => 'required|integer|exists:courses,id',
             'semester_id' => 'required|integer|exists:semesters,id',
             'teacher_id' => 'nullable|integer|exists:teachers,id',
             'students_per_class' => 'required|integer|min:1|max:200',
-            'number_of_classes' => 'required|integer|min:1|max:20',
+            'number_of_classes' => 'required|integer|min:1|max:' . $maxClasses,
             'class_name_prefix' => 'required|string|max:50',
         ];
     }
@@ -72,4 +78,8 @@ public function teacher(){
     public function semester(){
         return $this->belongsTo(Semester::class);
     }
+
+    public function teacherSalaries(){
+        return $this->hasMany(TeacherSalary::class);
+    }
 }
@@ -0,0 +1,49 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+use Illuminate\Database\Eloquent\Relations\BelongsTo;
+
+class SalaryAggregate extends Model
+{
+    // Các mức tổng hợp
+    public const LEVEL_TEACHER = 'teacher';
+    public const LEVEL_SEMESTER_DEPARTMENT = 'semester_department';
+    public const LEVEL_YEAR_DEPARTMENT = 'year_department';
+
+    protected $fillable = [
+        'level',
+        'salary_config_id',
+        'semester_id',
+        'academic_year_id',
+        'department_id',
+        'teacher_id',
+        'teachers_count',
+        'total_classes',
+        'total_lessons',
+        'total_salary',
+        'is_frozen'
+    ];
+
+    protected $casts = [
+        'total_lessons' => 'decimal:2',
+        'total_salary' => 'decimal:2',
+        'is_frozen' => 'boolean'
+    ];
+
+    public function salaryConfig(): BelongsTo
+    {
+        return $this->belongsTo(SalaryConfig::class);
+    }
+
+    public function teacher(): BelongsTo
+    {
+        return $this->belongsTo(Teacher::class);
+    }
+
+    public function department(): BelongsTo
+    {
+        return $this->belongsTo(Department::class);
+    }
+}
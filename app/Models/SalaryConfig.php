@@ -16,6 +16,7 @@ class SalaryConfig extends Model
 
     protected $casts = [
         'base_salary_per_lesson' => 'decimal:2',
+        'calculated_at' => 'datetime',
     ];
 
     public function semester(): BelongsTo
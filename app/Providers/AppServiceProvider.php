@@ -2,8 +2,24 @@
 
 namespace App\Providers;
 
+use App\Jobs\CalculateSemesterSalaries;
+use App\Models\Classroom;
+use App\Models\Course;
+use App\Models\Teacher;
+use App\Services\ClassroomSearchService;
+use App\Services\DashboardCacheService;
+use App\Services\QueryStatsService;
+use App\Services\ReferenceDataService;
+use App\Services\ServerTimingService;
+use Illuminate\Database\Events\QueryExecuted;
+use Illuminate\Routing\Events\PreparingResponse;
+use Illuminate\Routing\Events\ResponsePrepared;
 use Illuminate\Support\ServiceProvider;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Event;
+use Illuminate\Support\Facades\Log;
 use Illuminate\Support\Facades\URL;
+use Illuminate\Support\Facades\View;
 use Illuminate\Http\Request;
 
 class AppServiceProvider extends ServiceProvider
@@ -13,7 +29,10 @@ class AppServiceProvider extends ServiceProvider
      */
     public function register(): void
     {
-        //
+        // Một bộ đếm cho cả request: middleware AddQueryStatsHeaders reset và đọc
+        $this->app->singleton(QueryStatsService::class);
+        // Các pha Server-Timing của request hiện tại, middleware AddServerTiming mở và đóng
+        $this->app->singleton(ServerTimingService::class);
     }
 
     /**
@@ -34,5 +53,88 @@ public function boot(): void
             Request::HEADER_X_FORWARDED_PROTO |
             Request::HEADER_X_FORWARDED_AWS_ELB
         );
+
+        if (app(QueryStatsService::class)->enabled()) {
+            app(QueryStatsService::class)->listen();
+        }
+
+        // Đếm query cho job tính lương: một listener cho cả tiến trình worker, job bật/tắt bộ đếm
+        DB::listen(function () {
+            if (CalculateSemesterSalaries::$queryCount !== null) {
+                CalculateSemesterSalaries::$queryCount++;
+            }
+        });
+
+        // Server-Timing: controller trả về → Inertia resolve props và encode JSON → render view gốc
+        // (chỉ lần tải trang đầy đủ) → phần còn lại tính vào middleware (lưu session, cookie)
+        $timing = app(ServerTimingService::class);
+        if ($timing->enabled()) {
+            $timing->listen();
+            Event::listen(PreparingResponse::class, function () use ($timing) {
+                if ($timing->phase() === 'app') {
+                    $timing->enter('inertia');
+                }
+            });
+            View::composer('app', function () use ($timing) {
+                if ($timing->phase() === 'inertia') {
+                    $timing->enter('view');
+                }
+            });
+            Event::listen(ResponsePrepared::class, function () use ($timing) {
+                if (in_array($timing->phase(), ['inertia', 'view'], true)) {
+                    $timing->enter('session');
+                }
+            });
+        }
+
+        // DB_LOG_QUERIES=true: ghi từng query ra log để queryPlanCheck.py chạy EXPLAIN
+        if (config('database.log_queries')) {
+            DB::listen(function (QueryExecuted $query) {
+                Log::debug('Query executed ' . json_encode([
+                    'path' => app()->runningInConsole() ? null : request()->path(),
+                    'connection' => $query->connectionName,
+                    'sql' => $query->sql,
+                    'bindings' => $query->connection->prepareBindings($query->bindings),
+                    'time_ms' => $query->time,
+                ], JSON_UNESCAPED_UNICODE | JSON_INVALID_UTF8_SUBSTITUTE));
+            });
+        }
+
+        // Ghi giáo viên, lớp học, lương... thì xoá cache các widget dashboard liên quan
+        // và đổi phiên bản dữ liệu dropdown đọc từ nguồn đó
+        foreach (DashboardCacheService::MODEL_SOURCES as $model => $source) {
+            $forget = function () use ($source) {
+                app(DashboardCacheService::class)->forget($source);
+                app(ReferenceDataService::class)->bump($source);
+            };
+            $model::saved($forget);
+            $model::deleted($forget);
+        }
+
+        // Giữ bảng từ khoá tìm kiếm lớp học khớp với tên/mã lớp, môn học và tên giáo viên
+        Classroom::saved(function (Classroom $classroom) {
+            if ($classroom->wasRecentlyCreated || $classroom->wasChanged(['name', 'code', 'course_id', 'teacher_id'])) {
+                app(ClassroomSearchService::class)->index([$classroom->id]);
+            }
+        });
+        Course::updated(function (Course $course) {
+            if ($course->wasChanged(['name', 'code'])) {
+                app(ClassroomSearchService::class)->reindexWhere('course_id', $course->id);
+            }
+        });
+        Teacher::updated(function (Teacher $teacher) {
+            if ($teacher->wasChanged('fullName')) {
+                app(ClassroomSearchService::class)->reindexWhere('teacher_id', $teacher->id);
+            }
+        });
+        // Xoá giáo viên thì DB đặt teacher_id = null, nên phải lấy danh sách lớp trước khi xoá
+        $teacherClassrooms = [];
+        Teacher::deleting(function (Teacher $teacher) use (&$teacherClassrooms) {
+            $teacherClassrooms[$teacher->id] = Classroom::where('teacher_id', $teacher->id)->pluck('id')->all();
+        });
+        Teacher::deleted(function (Teacher $teacher) use (&$teacherClassrooms) {
+            app(ClassroomSearchService::class)->index($teacherClassrooms[$teacher->id] ?? []);
+            unset($teacherClassrooms[$teacher->id]);
+        });
     }
 }
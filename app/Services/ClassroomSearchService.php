@@ -0,0 +1,134 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Database\Eloquent\Builder;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Str;
+
+class ClassroomSearchService
+{
+    /**
+     * Số từ khoá tối đa lấy từ ô tìm kiếm (mỗi từ là một điều kiện AND)
+     */
+    private const MAX_TERMS = 5;
+    private const TOKEN_LENGTH = 64;
+    private const CHUNK_SIZE = 1000;
+
+    /**
+     * Lọc lớp học chứa mọi từ trong $search (so khớp tiền tố của từ khoá, không phân biệt hoa thường và dấu).
+     * Mỗi từ là một subquery trên khoá chính (token, classroom_id) thay cho LIKE '%...%' quét cả bảng.
+     */
+    public function filter(Builder $query, string $search): Builder
+    {
+        foreach (array_slice($this->words($search), 0, self::MAX_TERMS) as $term) {
+            $query->whereIn('classrooms.id', function ($sub) use ($term) {
+                $sub->select('classroom_id')
+                    ->from('classroom_search_tokens')
+                    ->where('token', 'like', $term . '%');
+            });
+        }
+
+        return $query;
+    }
+
+    /**
+     * Tính lại từ khoá cho các lớp học
+     */
+    public function index(array $classroomIds): void
+    {
+        foreach (array_chunk(array_values(array_unique($classroomIds)), self::CHUNK_SIZE) as $ids) {
+            $rows = DB::table('classrooms')
+                ->leftJoin('courses', 'courses.id', '=', 'classrooms.course_id')
+                ->leftJoin('teachers', 'teachers.id', '=', 'classrooms.teacher_id')
+                ->whereIn('classrooms.id', $ids)
+                ->select('classrooms.id', 'classrooms.name', 'classrooms.code',
+                    'courses.name as course_name', 'courses.code as course_code', 'teachers.fullName as teacher_name')
+                ->get();
+
+            $tokens = [];
+            foreach ($rows as $row) {
+                $text = implode(' ', [$row->name, $row->code, $row->course_name, $row->course_code, $row->teacher_name]);
+                foreach ($this->tokenize($text) as $token) {
+                    $tokens[] = ['token' => $token, 'classroom_id' => $row->id];
+                }
+            }
+
+            DB::transaction(function () use ($ids, $tokens) {
+                DB::table('classroom_search_tokens')->whereIn('classroom_id', $ids)->delete();
+                foreach (array_chunk($tokens, self::CHUNK_SIZE) as $chunk) {
+                    DB::table('classroom_search_tokens')->insertOrIgnore($chunk);
+                }
+            });
+        }
+    }
+
+    /**
+     * Lớp vừa insert hàng loạt (không qua event của model) được tìm lại theo mã
+     */
+    public function indexCodes(array $codes): void
+    {
+        foreach (array_chunk($codes, self::CHUNK_SIZE) as $chunk) {
+            $this->index(DB::table('classrooms')->whereIn('code', $chunk)->pluck('id')->all());
+        }
+    }
+
+    /**
+     * Đổi tên/mã môn học hoặc tên giáo viên thì tính lại các lớp liên quan
+     */
+    public function reindexWhere(string $column, int $id): int
+    {
+        $count = 0;
+        DB::table('classrooms')->where($column, $id)->select('id')
+            ->chunkById(self::CHUNK_SIZE, function ($rows) use (&$count) {
+                $this->index($rows->pluck('id')->all());
+                $count += $rows->count();
+            });
+
+        return $count;
+    }
+
+    /**
+     * Dựng lại toàn bộ bảng từ khoá (sau migrate hoặc khi nghi ngờ lệch dữ liệu)
+     */
+    public function reindexAll(): int
+    {
+        $count = 0;
+        DB::table('classrooms')->select('id')
+            ->chunkById(self::CHUNK_SIZE, function ($rows) use (&$count) {
+                $this->index($rows->pluck('id')->all());
+                $count += $rows->count();
+            });
+
+        return $count;
+    }
+
+    /**
+     * Từ khoá của một đoạn văn bản. Từ ghép chữ + số còn được tách thêm
+     * để "LH001" tìm được bằng "LH001", "LH" hoặc "001".
+     */
+    public function tokenize(?string $text): array
+    {
+        $tokens = [];
+        foreach ($this->words((string) $text) as $word) {
+            $tokens[$word] = true;
+            if (preg_match_all('/[a-z]+|[0-9]+/', $word, $parts) && count($parts[0]) > 1) {
+                foreach ($parts[0] as $part) {
+                    $tokens[$part] = true;
+                }
+            }
+        }
+
+        return array_keys($tokens);
+    }
+
+    /**
+     * Bỏ dấu, chữ thường, tách theo ký tự không phải chữ/số ("Nguyễn Văn Đức" -> nguyen, van, duc)
+     */
+    private function words(string $text): array
+    {
+        $words = preg_split('/[^a-z0-9]+/', Str::lower(Str::ascii($text)), -1, PREG_SPLIT_NO_EMPTY);
+
+        return array_values(array_unique(array_map(fn ($word) => substr($word, 0, self::TOKEN_LENGTH), $words)));
+    }
+}
@@ -0,0 +1,96 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Support\Facades\DB;
+
+class CodeSequenceService
+{
+    /**
+     * Các dãy đã chắc chắn có dòng trong code_sequences (trong tiến trình hiện tại)
+     */
+    private static array $ensured = [];
+
+    /**
+     * Cấp $count số liên tiếp của dãy mã và trả về số đầu tiên.
+     * Hai request đồng thời không bao giờ nhận cùng một số.
+     */
+    public function allocate(string $table, string $column, string $prefix, int $count = 1): int
+    {
+        $name = "{$table}:{$prefix}";
+
+        for ($attempt = 0; ; $attempt++) {
+            $this->ensureSequence($name, $table, $column, $prefix);
+
+            $last = $this->increment($name, $count);
+            if ($last !== null) {
+                return $last - $count + 1;
+            }
+            if ($attempt > 0) {
+                throw new \RuntimeException("Không khởi tạo được dãy mã {$name}");
+            }
+
+            // Dòng bộ đếm đã mất (migrate:fresh, RefreshDatabase) nhưng tiến trình vẫn nhớ là có → khởi tạo lại
+            unset(self::$ensured[$name]);
+        }
+    }
+
+    /**
+     * Tăng bộ đếm và trả về số cuối cùng vừa cấp; null nếu dãy chưa có dòng trong code_sequences
+     */
+    private function increment(string $name, int $count): ?int
+    {
+        if (in_array(DB::getDriverName(), ['mysql', 'mariadb'], true)) {
+            // LAST_INSERT_ID(expr) giữ giá trị vừa tăng cho connection này: tăng và đọc trong một câu lệnh
+            $updated = DB::update('UPDATE code_sequences SET value = LAST_INSERT_ID(value + ?) WHERE name = ?', [$count, $name]);
+
+            return $updated ? (int) DB::selectOne('SELECT LAST_INSERT_ID() AS value')->value : null;
+        }
+
+        // SQLite/PostgreSQL: UPDATE khoá dòng (hoặc cả DB) tới hết transaction nên đọc lại là số của mình
+        return DB::transaction(function () use ($name, $count) {
+            if (!DB::table('code_sequences')->where('name', $name)->increment('value', $count)) {
+                return null;
+            }
+
+            return (int) DB::table('code_sequences')->where('name', $name)->value('value');
+        });
+    }
+
+    /**
+     * Mã dạng tiền tố + số, tối thiểu 3 chữ số (LH001, ..., LH999, LH1000)
+     */
+    public function format(string $prefix, int $number): string
+    {
+        return $prefix . str_pad((string) $number, 3, '0', STR_PAD_LEFT);
+    }
+
+    /**
+     * Lần đầu dùng một dãy: khởi tạo bộ đếm từ số lớn nhất trong các mã đã có
+     */
+    private function ensureSequence(string $name, string $table, string $column, string $prefix): void
+    {
+        if (isset(self::$ensured[$name])) {
+            return;
+        }
+
+        if (!DB::table('code_sequences')->where('name', $name)->exists()) {
+            $max = 0;
+            DB::table($table)
+                ->where($column, 'like', $prefix . '%')
+                ->select('id', $column)
+                ->lazyById(2000)
+                ->each(function ($row) use ($column, $prefix, &$max) {
+                    $suffix = substr($row->$column, strlen($prefix));
+                    if (ctype_digit($suffix)) {
+                        $max = max($max, (int) $suffix);
+                    }
+                });
+
+            // Tiến trình khác khởi tạo cùng lúc thì giữ dòng của nó (cùng giá trị max)
+            DB::table('code_sequences')->insertOrIgnore(['name' => $name, 'value' => $max]);
+        }
+
+        self::$ensured[$name] = true;
+    }
+}
@@ -0,0 +1,382 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Classroom;
+use App\Models\Course;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Hash;
+use Illuminate\Support\Facades\Validator;
+
+class CsvImportService
+{
+    public const TYPES = ['teachers', 'courses', 'classrooms'];
+
+    /**
+     * Số dòng CSV được kiểm tra và insert mỗi lần
+     */
+    public const BATCH_SIZE = 500;
+
+    /**
+     * Số dòng lỗi tối đa trả về trong báo cáo (tổng số dòng lỗi vẫn đếm đủ)
+     */
+    private const MAX_REPORTED_ERRORS = 1000;
+
+    protected $dashboardCache;
+    protected $search;
+    protected $referenceData;
+
+    public function __construct(DashboardCacheService $dashboardCache, ClassroomSearchService $search, ReferenceDataService $referenceData)
+    {
+        $this->dashboardCache = $dashboardCache;
+        $this->search = $search;
+        $this->referenceData = $referenceData;
+    }
+
+    /**
+     * Nhập một file CSV: đọc từng lô, kiểm tra, insert các dòng hợp lệ và gom dòng lỗi vào báo cáo.
+     * dry_run chỉ kiểm tra, không ghi gì vào DB.
+     */
+    public function import(string $type, string $path, bool $dryRun = false): array
+    {
+        $report = [
+            'type' => $type,
+            'dry_run' => $dryRun,
+            'total' => 0,
+            'imported' => 0,
+            'failed' => 0,
+            'errors' => [],
+        ];
+        // Giá trị đã gặp ở các lô trước, để bắt trùng ngay trong file
+        $seen = [];
+
+        $batch = [];
+        foreach ($this->rows($path) as $line => $row) {
+            $batch[$line] = $row;
+            if (count($batch) === self::BATCH_SIZE) {
+                $this->processBatch($type, $batch, $seen, $report, $dryRun);
+                $batch = [];
+            }
+        }
+        if ($batch) {
+            $this->processBatch($type, $batch, $seen, $report, $dryRun);
+        }
+
+        if (!$dryRun && $report['imported'] > 0) {
+            $this->dashboardCache->forget($type);
+            $this->referenceData->bump($type);
+        }
+
+        return $report;
+    }
+
+    /**
+     * Đọc CSV theo từng dòng (không nạp cả file): dòng đầu là tên cột, giá trị rỗng thành null
+     */
+    private function rows(string $path): \Generator
+    {
+        $handle = fopen($path, 'r');
+
+        try {
+            $header = fgetcsv($handle);
+            if (!$header) {
+                return;
+            }
+            $header[0] = preg_replace('/^\xEF\xBB\xBF/', '', $header[0]);
+            $header = array_map('trim', $header);
+
+            $line = 1;
+            while (($values = fgetcsv($handle)) !== false) {
+                $line++;
+                if ($values === [null]) {
+                    continue; // dòng trống
+                }
+
+                $values = array_slice(array_pad($values, count($header), null), 0, count($header));
+                yield $line => array_map(function ($value) {
+                    $value = $value === null ? null : trim($value);
+                    return $value === '' ? null : $value;
+                }, array_combine($header, $values));
+            }
+        } finally {
+            fclose($handle);
+        }
+    }
+
+    private function processBatch(string $type, array $batch, array &$seen, array &$report, bool $dryRun): void
+    {
+        $errors = [];
+        foreach ($batch as $line => $row) {
+            $validator = Validator::make($row, $this->rules($type), $this->messages());
+            if ($validator->fails()) {
+                $errors[$line] = array_map(fn ($messages) => $messages[0], $validator->errors()->toArray());
+            }
+        }
+
+        // Kiểm tra trùng và khoá ngoại cho cả lô bằng vài query whereIn
+        $valid = array_diff_key($batch, $errors);
+        $errors += match ($type) {
+            'teachers' => $this->checkTeachers($valid, $seen),
+            'courses' => $this->checkCourses($valid, $seen),
+            'classrooms' => $this->checkClassrooms($valid, $seen),
+        };
+        $valid = array_diff_key($batch, $errors);
+
+        if (!$dryRun && $valid) {
+            DB::transaction(fn () => match ($type) {
+                'teachers' => $this->insertTeachers($valid),
+                'courses' => $this->insertCourses($valid),
+                'classrooms' => $this->insertClassrooms($valid),
+            });
+        }
+
+        $report['total'] += count($batch);
+        $report['imported'] += count($valid);
+        $report['failed'] += count($errors);
+
+        ksort($errors);
+        foreach ($errors as $line => $lineErrors) {
+            if (count($report['errors']) >= self::MAX_REPORTED_ERRORS) {
+                break;
+            }
+            $report['errors'][] = ['line' => $line, 'errors' => $lineErrors];
+        }
+    }
+
+    // ========== Rules ==========
+
+    private function rules(string $type): array
+    {
+        return match ($type) {
+            'teachers' => [
+                'fullName' => 'required|string|max:255',
+                'DOB' => 'required|date',
+                'phone' => ['required', 'string', 'regex:/^[0-9]{10,11}$/'],
+                'email' => 'required|string|max:255|email',
+                'degree_id' => 'required|integer',
+                'department_id' => 'required|integer',
+                'password' => 'required|string|min:8',
+                'role' => 'nullable|string|in:teacher,department_head,accountant',
+            ],
+            'courses' => [
+                'name' => 'required|string|max:255',
+                'credits' => 'required|integer|min:1|max:10',
+                'lessons' => 'required|integer|min:1',
+                'department_id' => 'nullable|integer',
+                'course_coefficient' => 'required|numeric|min:1.0|max:1.5',
+            ],
+            'classrooms' => [
+                'name' => 'required|string|max:255',
+                'semester_id' => 'required|integer',
+                'course_id' => 'required|integer',
+                'teacher_id' => 'nullable|integer',
+                'students' => 'required|integer|min:0|max:200',
+            ],
+        };
+    }
+
+    private function messages(): array
+    {
+        return [
+            'required' => ':attribute là bắt buộc',
+            'phone.regex' => 'Số điện thoại chỉ được chứa số và có độ dài 10-11 chữ số',
+            'email.email' => 'Email không hợp lệ',
+            'password.min' => 'Mật khẩu phải có ít nhất 8 ký tự',
+            'role.in' => 'Vai trò không hợp lệ',
+            'course_coefficient.min' => 'Hệ số môn học phải từ 1.0 trở lên',
+            'course_coefficient.max' => 'Hệ số môn học không được vượt quá 1.5',
+        ];
+    }
+
+    // ========== Kiểm tra theo lô ==========
+
+    private function checkTeachers(array $rows, array &$seen): array
+    {
+        $phones = $this->existing('teachers', 'phone', array_column($rows, 'phone'));
+        $emails = $this->existing('teachers', 'email', array_column($rows, 'email'))
+            + $this->existing('users', 'email', array_column($rows, 'email'));
+        $degrees = $this->existing('degrees', 'id', array_column($rows, 'degree_id'));
+        $departments = $this->existing('departments', 'id', array_column($rows, 'department_id'));
+
+        $errors = [];
+        foreach ($rows as $line => $row) {
+            $rowErrors = [];
+            if (isset($phones[$row['phone']]) || isset($seen['phone'][$row['phone']])) {
+                $rowErrors['phone'] = 'Số điện thoại này đã được sử dụng';
+            }
+            if (isset($emails[$row['email']]) || isset($seen['email'][$row['email']])) {
+                $rowErrors['email'] = 'Email này đã được sử dụng';
+            }
+            if (!isset($degrees[$row['degree_id']])) {
+                $rowErrors['degree_id'] = 'Bằng cấp không tồn tại';
+            }
+            if (!isset($departments[$row['department_id']])) {
+                $rowErrors['department_id'] = 'Khoa không tồn tại';
+            }
+
+            $seen['phone'][$row['phone']] = true;
+            $seen['email'][$row['email']] = true;
+            if ($rowErrors) {
+                $errors[$line] = $rowErrors;
+            }
+        }
+
+        return $errors;
+    }
+
+    private function checkCourses(array $rows, array &$seen): array
+    {
+        $names = $this->existing('courses', 'name', array_column($rows, 'name'));
+        $departments = $this->existing('departments', 'id', array_filter(array_column($rows, 'department_id')));
+
+        $errors = [];
+        foreach ($rows as $line => $row) {
+            $rowErrors = [];
+            if (isset($names[$row['name']]) || isset($seen['name'][$row['name']])) {
+                $rowErrors['name'] = 'Tên môn học này đã tồn tại';
+            }
+            if (($row['department_id'] ?? null) !== null && !isset($departments[$row['department_id']])) {
+                $rowErrors['department_id'] = 'Khoa không tồn tại';
+            }
+
+            $seen['name'][$row['name']] = true;
+            if ($rowErrors) {
+                $errors[$line] = $rowErrors;
+            }
+        }
+
+        return $errors;
+    }
+
+    private function checkClassrooms(array $rows, array &$seen): array
+    {
+        $semesters = $this->existing('semesters', 'id', array_column($rows, 'semester_id'));
+        $courses = $this->existing('courses', 'id', array_column($rows, 'course_id'));
+        $teachers = $this->existing('teachers', 'id', array_filter(array_column($rows, 'teacher_id')));
+        // Học kỳ đã tính/đóng lương thì không được thêm lớp, như form tạo lớp
+        $lockedSemesters = array_flip(DB::table('salary_configs')
+            ->whereIn('semester_id', array_keys($semesters))
+            ->whereIn('status', ['active', 'closed'])
+            ->pluck('semester_id')
+            ->all());
+        $existingClasses = array_flip(DB::table('classrooms')
+            ->whereIn('name', array_column($rows, 'name'))
+            ->whereIn('semester_id', array_keys($semesters))
+            ->get(['name', 'semester_id', 'course_id'])
+            ->map(fn ($classroom) => "{$classroom->semester_id}|{$classroom->course_id}|{$classroom->name}")
+            ->all());
+
+        $errors = [];
+        foreach ($rows as $line => $row) {
+            $rowErrors = [];
+            $key = "{$row['semester_id']}|{$row['course_id']}|{$row['name']}";
+            if (!isset($semesters[$row['semester_id']])) {
+                $rowErrors['semester_id'] = 'Học kỳ không tồn tại';
+            } elseif (isset($lockedSemesters[$row['semester_id']])) {
+                $rowErrors['semester_id'] = 'Học kỳ đã tính hoặc đóng bảng lương, không thể thêm lớp';
+            }
+            if (!isset($courses[$row['course_id']])) {
+                $rowErrors['course_id'] = 'Môn học không tồn tại';
+            }
+            if (($row['teacher_id'] ?? null) !== null && !isset($teachers[$row['teacher_id']])) {
+                $rowErrors['teacher_id'] = 'Giáo viên không tồn tại';
+            }
+            if (isset($existingClasses[$key]) || isset($seen['classroom'][$key])) {
+                $rowErrors['name'] = "Lớp học '{$row['name']}' đã tồn tại trong học kỳ này";
+            }
+
+            $seen['classroom'][$key] = true;
+            if ($rowErrors) {
+                $errors[$line] = $rowErrors;
+            }
+        }
+
+        return $errors;
+    }
+
+    /**
+     * Các giá trị trong $values đã có trong bảng, dạng [giá trị => true] để tra bằng isset
+     */
+    private function existing(string $table, string $column, array $values): array
+    {
+        $values = array_values(array_unique(array_filter($values, fn ($value) => $value !== null)));
+        if (!$values) {
+            return [];
+        }
+
+        return array_fill_keys(DB::table($table)->whereIn($column, $values)->pluck($column)->all(), true);
+    }
+
+    // ========== Insert ==========
+
+    private function insertTeachers(array $rows): void
+    {
+        $now = now();
+        // Các dòng cùng mật khẩu khởi tạo dùng chung một lần băm (bcrypt chậm có chủ đích)
+        $hashes = [];
+        $teachers = [];
+        $users = [];
+        foreach ($rows as $row) {
+            $hashes[$row['password']] ??= Hash::make($row['password']);
+
+            $teachers[] = [
+                'fullName' => $row['fullName'],
+                'DOB' => $row['DOB'],
+                'phone' => $row['phone'],
+                'email' => $row['email'],
+                'degree_id' => $row['degree_id'],
+                'department_id' => $row['department_id'],
+                'created_at' => $now,
+                'updated_at' => $now,
+            ];
+            $users[] = [
+                'name' => $row['fullName'],
+                'email' => $row['email'],
+                'password' => $hashes[$row['password']],
+                'role' => $row['role'] ?? 'teacher',
+                'department_id' => $row['department_id'],
+                'created_at' => $now,
+                'updated_at' => $now,
+            ];
+        }
+
+        DB::table('teachers')->insert($teachers);
+        DB::table('users')->insert($users);
+    }
+
+    private function insertCourses(array $rows): void
+    {
+        $now = now();
+        $codes = Course::generateCodes(count($rows));
+
+        DB::table('courses')->insert(array_map(fn ($row, $code) => [
+            'name' => $row['name'],
+            'code' => $code,
+            'credits' => $row['credits'],
+            'lessons' => $row['lessons'],
+            'department_id' => $row['department_id'] ?? null,
+            'course_coefficient' => $row['course_coefficient'],
+            'created_at' => $now,
+            'updated_at' => $now,
+        ], array_values($rows), $codes));
+    }
+
+    private function insertClassrooms(array $rows): void
+    {
+        $now = now();
+        $codes = Classroom::generateCodes(count($rows));
+
+        DB::table('classrooms')->insert(array_map(fn ($row, $code) => [
+            'name' => $row['name'],
+            'code' => $code,
+            'semester_id' => $row['semester_id'],
+            'course_id' => $row['course_id'],
+            'teacher_id' => $row['teacher_id'] ?? null,
+            'students' => $row['students'],
+            'created_at' => $now,
+            'updated_at' => $now,
+        ], array_values($rows), $codes));
+
+        $this->search->indexCodes($codes);
+    }
+}
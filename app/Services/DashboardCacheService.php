@@ -0,0 +1,83 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\AcademicYear;
+use App\Models\Classroom;
+use App\Models\Course;
+use App\Models\Degree;
+use App\Models\Department;
+use App\Models\SalaryConfig;
+use App\Models\Semester;
+use App\Models\Teacher;
+use Illuminate\Cache\Repository;
+use Illuminate\Support\Facades\Cache;
+
+class DashboardCacheService
+{
+    /**
+     * Dữ liệu mới trong 5 phút; từ 5 phút tới 1 giờ vẫn trả bản cũ và tính lại sau khi response đã gửi
+     */
+    private const FRESH_SECONDS = 300;
+    private const STALE_SECONDS = 3600;
+
+    /**
+     * Nguồn dữ liệu mà mỗi widget dashboard đọc
+     */
+    public const WIDGETS = [
+        'stats' => ['teachers', 'departments', 'courses', 'classrooms', 'semesters'],
+        'teachersByDepartment' => ['teachers', 'departments'],
+        'teachersByDegree' => ['teachers', 'degrees'],
+        'salaryStats' => ['salaries', 'semesters'],
+        'recentActivities' => ['teachers', 'departments', 'classrooms', 'courses', 'salaries', 'semesters'],
+        'monthlyTrends' => ['teachers', 'classrooms', 'salaries'],
+        'classroomStats' => ['classrooms'],
+        'performanceMetrics' => ['teachers', 'classrooms', 'salaries'],
+    ];
+
+    /**
+     * Model mà khi ghi (saved/deleted) sẽ xoá cache các widget đọc nguồn tương ứng
+     */
+    public const MODEL_SOURCES = [
+        Teacher::class => 'teachers',
+        Department::class => 'departments',
+        Degree::class => 'degrees',
+        Course::class => 'courses',
+        Classroom::class => 'classrooms',
+        Semester::class => 'semesters',
+        AcademicYear::class => 'semesters',
+        SalaryConfig::class => 'salaries',
+    ];
+
+    public function remember(string $widget, callable $callback)
+    {
+        return $this->store()->flexible($this->key($widget), [self::FRESH_SECONDS, self::STALE_SECONDS], $callback);
+    }
+
+    /**
+     * Xoá cache của mọi widget đọc từ nguồn dữ liệu vừa thay đổi
+     */
+    public function forget(string $source): void
+    {
+        foreach (self::WIDGETS as $widget => $sources) {
+            if (in_array($source, $sources, true)) {
+                $this->store()->forget($this->key($widget));
+                // Cache::flexible lưu thêm mốc thời gian tạo bên cạnh giá trị
+                $this->store()->forget("illuminate:cache:flexible:created:{$this->key($widget)}");
+            }
+        }
+    }
+
+    /**
+     * Worker tính lương cũng xoá cache này, nên dùng store chung thay vì APCu của từng tiến trình
+     */
+    private function store(): Repository
+    {
+        return Cache::store(config('cache.shared_store'));
+    }
+
+    private function key(string $widget): string
+    {
+        return "dashboard:{$widget}";
+    }
+}
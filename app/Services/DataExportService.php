@@ -0,0 +1,190 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\SalaryAggregate;
+use App\Models\SalaryConfig;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\LazyCollection;
+use Symfony\Component\HttpFoundation\Response;
+
+class DataExportService
+{
+    /**
+     * Số dòng đọc từ DB mỗi lần (lazyById), giữ bộ nhớ cố định với bảng lương rất lớn
+     */
+    private const CHUNK_SIZE = 2000;
+
+    public const SALARY_COLUMNS = [
+        'Mã lớp', 'Tên lớp', 'Mã môn', 'Môn học', 'Giáo viên', 'Khoa', 'Số sinh viên', 'Số tiết thực tế',
+        'Hệ số lớp', 'Hệ số học phần', 'Hệ số giáo viên', 'Số tiết quy đổi', 'Thành tiền'
+    ];
+
+    public const YEARLY_COLUMNS = [
+        'Năm học', 'Học kỳ', 'Khoa', 'Mã GV', 'Giáo viên', 'Số lớp', 'Số tiết quy đổi', 'Tổng tiền'
+    ];
+
+    /**
+     * Các dòng lương theo lớp của một học kỳ (lọc theo khoa nếu có)
+     */
+    public function salaryRows(SalaryConfig $salaryConfig, ?int $departmentId = null): LazyCollection
+    {
+        return DB::table('teacher_salaries')
+            ->join('teachers', 'teachers.id', '=', 'teacher_salaries.teacher_id')
+            ->leftJoin('departments', 'departments.id', '=', 'teachers.department_id')
+            ->join('classrooms', 'classrooms.id', '=', 'teacher_salaries.classroom_id')
+            ->join('courses', 'courses.id', '=', 'classrooms.course_id')
+            ->where('teacher_salaries.salary_config_id', $salaryConfig->id)
+            ->when($departmentId !== null, fn ($query) => $query->where('teachers.department_id', $departmentId))
+            ->select(
+                'teacher_salaries.id', 'classrooms.code as classroom_code', 'classrooms.name as classroom_name',
+                'courses.code as course_code', 'courses.name as course_name', 'teachers.fullName as teacher_name',
+                'departments.name as department_name', 'classrooms.students', 'teacher_salaries.actual_lessons',
+                'teacher_salaries.class_coefficient', 'teacher_salaries.course_coefficient',
+                'teacher_salaries.teacher_coefficient', 'teacher_salaries.converted_lessons',
+                'teacher_salaries.total_salary'
+            )
+            ->lazyById(self::CHUNK_SIZE, 'teacher_salaries.id', 'id')
+            ->map(fn ($row) => [
+                $row->classroom_code, $row->classroom_name, $row->course_code, $row->course_name,
+                $row->teacher_name, $row->department_name, (int) $row->students, (int) $row->actual_lessons,
+                (float) $row->class_coefficient, (float) $row->course_coefficient, (float) $row->teacher_coefficient,
+                (float) $row->converted_lessons, (float) $row->total_salary,
+            ]);
+    }
+
+    /**
+     * Tổng theo giáo viên từng học kỳ trong năm học, đọc từ salary_aggregates (lọc theo khoa nếu có)
+     */
+    public function yearlyRows(int $academicYearId, ?int $departmentId = null): LazyCollection
+    {
+        return DB::table('salary_aggregates')
+            ->join('academic_years', 'academic_years.id', '=', 'salary_aggregates.academic_year_id')
+            ->join('semesters', 'semesters.id', '=', 'salary_aggregates.semester_id')
+            ->join('departments', 'departments.id', '=', 'salary_aggregates.department_id')
+            ->join('teachers', 'teachers.id', '=', 'salary_aggregates.teacher_id')
+            ->where('salary_aggregates.level', SalaryAggregate::LEVEL_TEACHER)
+            ->where('salary_aggregates.academic_year_id', $academicYearId)
+            ->when($departmentId !== null, fn ($query) => $query->where('salary_aggregates.department_id', $departmentId))
+            ->select(
+                'salary_aggregates.id', 'academic_years.name as academic_year_name', 'semesters.name as semester_name',
+                'departments.name as department_name', 'teachers.id as teacher_id', 'teachers.fullName as teacher_name',
+                'salary_aggregates.total_classes', 'salary_aggregates.total_lessons', 'salary_aggregates.total_salary'
+            )
+            ->lazyById(self::CHUNK_SIZE, 'salary_aggregates.id', 'id')
+            ->map(fn ($row) => [
+                $row->academic_year_name, $row->semester_name, $row->department_name, (int) $row->teacher_id,
+                $row->teacher_name, (int) $row->total_classes, (float) $row->total_lessons, (float) $row->total_salary,
+            ]);
+    }
+
+    /**
+     * Ghi dòng ra response ngay khi đọc được: CSV stream thẳng, XLSX ghi sheet ra file tạm rồi nén
+     */
+    public function download(string $format, string $filename, array $columns, LazyCollection $rows): Response
+    {
+        return $format === 'xlsx'
+            ? $this->xlsx("{$filename}.xlsx", $columns, $rows)
+            : $this->csv("{$filename}.csv", $columns, $rows);
+    }
+
+    private function csv(string $filename, array $columns, LazyCollection $rows): Response
+    {
+        return response()->streamDownload(function () use ($filename, $columns, $rows) {
+            memory_reset_peak_usage();
+            $out = fopen('php://output', 'w');
+            // BOM để Excel nhận đúng UTF-8
+            fwrite($out, "\xEF\xBB\xBF");
+            fputcsv($out, $columns);
+
+            $count = 0;
+            foreach ($rows as $row) {
+                fputcsv($out, $row);
+                if (++$count % self::CHUNK_SIZE === 0) {
+                    flush();
+                }
+            }
+            fclose($out);
+
+            $this->logFinished($filename, $count);
+        }, $filename, ['Content-Type' => 'text/csv; charset=UTF-8']);
+    }
+
+    private function xlsx(string $filename, array $columns, LazyCollection $rows): Response
+    {
+        memory_reset_peak_usage();
+        $sheetPath = tempnam(sys_get_temp_dir(), 'sheet');
+        $sheet = fopen($sheetPath, 'w');
+        fwrite($sheet, '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            . '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>');
+        fwrite($sheet, $this->xlsxRow($columns));
+
+        $count = 0;
+        foreach ($rows as $row) {
+            fwrite($sheet, $this->xlsxRow($row));
+            $count++;
+        }
+        fwrite($sheet, '</sheetData></worksheet>');
+        fclose($sheet);
+
+        $zipPath = tempnam(sys_get_temp_dir(), 'xlsx');
+        $zip = new \ZipArchive();
+        $zip->open($zipPath, \ZipArchive::OVERWRITE);
+        $zip->addFromString('[Content_Types].xml', '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            . '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            . '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            . '<Default Extension="xml" ContentType="application/xml"/>'
+            . '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            . '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            . '</Types>');
+        $zip->addFromString('_rels/.rels', '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            . '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            . '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            . '</Relationships>');
+        $zip->addFromString('xl/workbook.xml', '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            . '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            . 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            . '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets></workbook>');
+        $zip->addFromString('xl/_rels/workbook.xml.rels', '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            . '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            . '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+            . '</Relationships>');
+        $zip->addFile($sheetPath, 'xl/worksheets/sheet1.xml');
+        $zip->close();
+        unlink($sheetPath);
+
+        $this->logFinished($filename, $count);
+
+        return response()->download($zipPath, $filename, [
+            'Content-Type' => 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        ])->deleteFileAfterSend();
+    }
+
+    /**
+     * Một dòng sheet: số ghi dạng số, còn lại là inline string (không cần sharedStrings.xml)
+     */
+    private function xlsxRow(array $values): string
+    {
+        $cells = '';
+        foreach ($values as $value) {
+            if (is_int($value) || is_float($value)) {
+                $cells .= '<c><v>' . $value . '</v></c>';
+            } else {
+                $cells .= '<c t="inlineStr"><is><t>' . htmlspecialchars((string) $value, ENT_XML1) . '</t></is></c>';
+            }
+        }
+
+        return '<row>' . $cells . '</row>';
+    }
+
+    private function logFinished(string $filename, int $rows): void
+    {
+        // exportTest.py đọc dòng log này để kiểm tra bộ nhớ không tăng theo số dòng
+        Log::info('Export finished', [
+            'file' => $filename,
+            'rows' => $rows,
+            'peak_memory_mb' => round(memory_get_peak_usage(true) / 1048576, 1),
+        ]);
+    }
+}
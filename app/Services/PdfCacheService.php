@@ -0,0 +1,147 @@
+<?php
+
+namespace App\Services;
+
+use App\Jobs\RenderPdfReport;
+use App\Models\SalaryConfig;
+use Barryvdh\DomPDF\Facade\Pdf;
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Contracts\Filesystem\Filesystem;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Storage;
+
+class PdfCacheService
+{
+    /**
+     * Thời gian giữ khoá render một file (bằng timeout của RenderPdfReport)
+     */
+    private const RENDER_LOCK_SECONDS = 600;
+
+    /**
+     * Request web chỉ chờ lần render đang chạy trong vài giây, quá thì trả 202 để client poll
+     */
+    private const REQUEST_WAIT_SECONDS = 3;
+
+    protected $pdfReports;
+
+    public function __construct(PdfReportService $pdfReports)
+    {
+        $this->pdfReports = $pdfReports;
+    }
+
+    public function disk(): Filesystem
+    {
+        return Storage::disk(config('salary.pdf_cache_disk'));
+    }
+
+    /**
+     * Đường dẫn file cache: pdf-cache/year-{id}/{sha256 của loại báo cáo, tham số và phiên bản dữ liệu}.pdf
+     */
+    public function path(string $type, array $params): string
+    {
+        $academicYearId = $this->pdfReports->academicYearId($type, $params);
+        ksort($params);
+
+        $hash = hash('sha256', json_encode([$type, $params, $this->dataVersion($academicYearId)]));
+
+        return "pdf-cache/year-{$academicYearId}/{$hash}.pdf";
+    }
+
+    /**
+     * Mốc cập nhật bảng tổng hợp của năm học: tính lại hay đóng bảng lương đều đổi mốc này
+     */
+    private function dataVersion(int $academicYearId): ?string
+    {
+        return DB::table('salary_aggregates')->where('academic_year_id', $academicYearId)->max('updated_at');
+    }
+
+    public function has(string $type, array $params): bool
+    {
+        return $this->disk()->exists($this->path($type, $params));
+    }
+
+    /**
+     * Render PDF bằng DomPDF và lưu vào disk cache (bỏ qua nếu đã có).
+     * Khoá theo file: job và request tải cùng lúc chờ lần render đang chạy rồi dùng lại file đó.
+     * Chờ quá $wait giây thì ném LockTimeoutException.
+     */
+    public function render(string $type, array $params, int $wait = self::RENDER_LOCK_SECONDS): string
+    {
+        $path = $this->path($type, $params);
+
+        if ($this->disk()->exists($path)) {
+            return $path;
+        }
+
+        return Cache::store(config('cache.shared_store'))
+            ->lock("pdf-render:{$path}", self::RENDER_LOCK_SECONDS)
+            ->block($wait, function () use ($type, $params, $path) {
+                if ($this->disk()->exists($path)) {
+                    return $path;
+                }
+
+                $document = $this->pdfReports->build($type, $params);
+
+                $pdf = Pdf::loadView($document['view'], $document['data']);
+                $pdf->setPaper('A4', $document['orientation']);
+                if ($document['options']) {
+                    $pdf->setOptions($document['options']);
+                }
+
+                $this->disk()->put($path, $pdf->output());
+
+                return $path;
+            });
+    }
+
+    /**
+     * Trả PDF từ cache; chưa có thì render ngay trong request rồi lưu lại.
+     * File đang được render ở nơi khác (job, request khác) thì không giữ worker chờ: đưa vào hàng đợi và trả 202.
+     */
+    public function response(string $type, array $params, string $filename, string $disposition = 'attachment')
+    {
+        try {
+            $path = $this->render($type, $params, self::REQUEST_WAIT_SECONDS);
+        } catch (LockTimeoutException $e) {
+            RenderPdfReport::dispatch($type, $params);
+
+            return response('PDF đang được tạo, vui lòng thử lại sau ít phút.', 202);
+        }
+
+        return $this->disk()->response($path, $filename, ['Content-Type' => 'application/pdf'], $disposition);
+    }
+
+    /**
+     * Request JSON (nút tải/xem PDF poll qua lib/pdf-export.ts): báo PDF đã sẵn sàng hay đưa việc render
+     * vào hàng đợi. Request thường (mở link trực tiếp): tải/xem PDF như trước.
+     */
+    public function respond(Request $request, string $type, array $params, string $filename, string $disposition = 'attachment')
+    {
+        if (!$request->wantsJson()) {
+            return $this->response($type, $params, $filename, $disposition);
+        }
+
+        if ($this->has($type, $params)) {
+            return response()->json(['status' => 'ready', 'url' => $request->fullUrl()]);
+        }
+
+        RenderPdfReport::dispatch($type, $params);
+
+        return response()->json(['status' => 'pending'], 202);
+    }
+
+    /**
+     * Xoá toàn bộ PDF đã cache của năm học chứa bảng lương rồi render trước các báo cáo hay tải nhất
+     */
+    public function refresh(SalaryConfig $salaryConfig): void
+    {
+        $academicYearId = (int) $salaryConfig->semester->academicYear_id;
+
+        $this->disk()->deleteDirectory("pdf-cache/year-{$academicYearId}");
+
+        RenderPdfReport::dispatch('salary', ['salary_config_id' => $salaryConfig->id, 'department_id' => null]);
+        RenderPdfReport::dispatch('school', ['academic_year_id' => $academicYearId]);
+    }
+}
@@ -0,0 +1,176 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\AcademicYear;
+use App\Models\Department;
+use App\Models\SalaryConfig;
+
+class PdfReportService
+{
+    protected $reportService;
+    protected $salaryCalculator;
+
+    public function __construct(ReportService $reportService, SalaryCalculatorService $salaryCalculator)
+    {
+        $this->reportService = $reportService;
+        $this->salaryCalculator = $salaryCalculator;
+    }
+
+    /**
+     * Năm học chứa dữ liệu của báo cáo, dùng làm phạm vi cache và huỷ cache
+     */
+    public function academicYearId(string $type, array $params): int
+    {
+        if ($type === 'salary') {
+            return (int) SalaryConfig::with('semester')->findOrFail($params['salary_config_id'])->semester->academicYear_id;
+        }
+
+        return (int) $params['academic_year_id'];
+    }
+
+    /**
+     * Dựng view + data cho DomPDF theo loại báo cáo (không kiểm tra quyền, controller đã kiểm tra)
+     */
+    public function build(string $type, array $params): array
+    {
+        return match ($type) {
+            'salary' => $this->salaryDocument($params['salary_config_id'], $params['department_id'] ?? null),
+            'teacher' => $this->teacherYearlyDocument($params['teacher_id'], $params['academic_year_id']),
+            'department' => $this->departmentDocument($params['department_id'], $params['academic_year_id']),
+            'school' => $this->schoolDocument($params['academic_year_id']),
+            default => throw new \InvalidArgumentException("Loại báo cáo PDF không hợp lệ: {$type}"),
+        };
+    }
+
+    private function salaryDocument(int $salaryConfigId, ?int $departmentId): array
+    {
+        $salaryConfig = SalaryConfig::with(['semester.academicYear'])->findOrFail($salaryConfigId);
+        $salaryReport = $this->salaryCalculator->getSalaryReport($salaryConfig);
+
+        // Trưởng khoa chỉ xem giáo viên thuộc khoa
+        if ($departmentId !== null) {
+            $salaryReport = $salaryReport->filter(function ($item) use ($departmentId) {
+                return $item['teacher']->department_id === $departmentId;
+            });
+        }
+
+        $totalStats = $salaryReport->reduce(function ($carry, $teacherData) {
+            return [
+                'totalTeachers' => ($carry['totalTeachers'] ?? 0) + 1,
+                'totalClasses' => ($carry['totalClasses'] ?? 0) + $teacherData['total_classes'],
+                'totalLessons' => ($carry['totalLessons'] ?? 0) + $teacherData['total_lessons'],
+                'totalSalary' => ($carry['totalSalary'] ?? 0) + $teacherData['total_salary']
+            ];
+        }, ['totalTeachers' => 0, 'totalClasses' => 0, 'totalLessons' => 0, 'totalSalary' => 0]);
+
+        return [
+            'view' => 'salary.report-pdf',
+            'data' => [
+                'salaryConfig' => $salaryConfig,
+                'salaryReport' => $salaryReport,
+                'totalStats' => $totalStats,
+                'statusLabels' => [
+                    'draft' => 'Bản nháp',
+                    'active' => 'Đã tính',
+                    'closed' => 'Đã đóng'
+                ]
+            ],
+            'orientation' => 'portrait',
+            'options' => [
+                'dpi' => 150,
+                'defaultFont' => 'DejaVu Sans',
+                'isRemoteEnabled' => true,
+                'isHtml5ParserEnabled' => true,
+            ]
+        ];
+    }
+
+    private function teacherYearlyDocument(int $teacherId, int $academicYearId): array
+    {
+        $reportData = $this->reportService->teacherYearlyReport($teacherId, $academicYearId);
+
+        // FIX: Convert arrays to objects để PDF template có thể dùng arrow notation
+        $pdfData = [
+            'teacher' => (object) $reportData['teacher']->toArray(),
+            'academicYear' => (object) $reportData['academicYear']->toArray(),
+            'salaryData' => $reportData['salaryData']->map(function ($semesterSalaries) {
+                return collect($semesterSalaries)->map(function ($salary) {
+                    // FIX: Ensure classroom and course are objects
+                    $salaryArray = $salary->toArray();
+                    $salaryArray['classroom'] = (object) $salary->classroom->toArray();
+                    $salaryArray['classroom']->course = (object) $salary->classroom->course->toArray();
+                    return (object) $salaryArray;
+                });
+            })->toArray(),
+            'summary' => $reportData['summary']
+        ];
+
+        // FIX: Add department and degree as objects
+        if (isset($reportData['teacher']->department)) {
+            $pdfData['teacher']->department = (object) $reportData['teacher']->department->toArray();
+        }
+
+        if (isset($reportData['teacher']->degree)) {
+            $pdfData['teacher']->degree = (object) $reportData['teacher']->degree->toArray();
+        }
+
+        return ['view' => 'reports.teacher-yearly-pdf', 'data' => $pdfData, 'orientation' => 'portrait', 'options' => []];
+    }
+
+    private function departmentDocument(int $departmentId, int $academicYearId): array
+    {
+        $reportData = $this->reportService->departmentReport($departmentId, $academicYearId);
+
+        return [
+            'view' => 'reports.department-pdf',
+            'data' => [
+                'department' => Department::findOrFail($departmentId)->toArray(),
+                'academicYear' => AcademicYear::findOrFail($academicYearId)->toArray(),
+                'teachersData' => $reportData['teachersData']->map(function ($item) {
+                    return [
+                        'teacher' => $item['teacher']->toArray(),
+                        'totalSalary' => $item['totalSalary'],
+                        'totalClasses' => $item['totalClasses'],
+                        'totalLessons' => $item['totalLessons']
+                    ];
+                })->toArray(),
+                'departmentTotals' => $reportData['departmentTotals']
+            ],
+            'orientation' => 'landscape',
+            'options' => []
+        ];
+    }
+
+    private function schoolDocument(int $academicYearId): array
+    {
+        $reportData = $this->reportService->schoolReport($academicYearId);
+
+        return [
+            'view' => 'reports.school-pdf',
+            'data' => [
+                'academicYear' => AcademicYear::findOrFail($academicYearId)->toArray(),
+                'departmentsData' => $reportData['departmentsData']->map(function ($item) {
+                    return [
+                        'department' => $item['department']->toArray(),
+                        'teachersCount' => $item['teachersCount'],
+                        'totalSalary' => $item['totalSalary'],
+                        'totalClasses' => $item['totalClasses'],
+                        'totalLessons' => $item['totalLessons'],
+                        'teachers' => collect($item['teachers'])->map(function ($teacher) {
+                            return [
+                                'teacher' => $teacher['teacher']->toArray(),
+                                'totalSalary' => $teacher['totalSalary'],
+                                'totalClasses' => $teacher['totalClasses'],
+                                'totalLessons' => $teacher['totalLessons']
+                            ];
+                        })->toArray()
+                    ];
+                })->toArray(),
+                'schoolTotals' => $reportData['schoolTotals']
+            ],
+            'orientation' => 'landscape',
+            'options' => []
+        ];
+    }
+}
@@ -0,0 +1,84 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Database\Events\QueryExecuted;
+use Illuminate\Support\Facades\DB;
+
+class QueryStatsService
+{
+    /**
+     * Bảng của session/cache/queue: số query phụ thuộc driver đang chọn (database, file, redis...)
+     * nên đếm riêng, ngân sách query của route chỉ tính query của ứng dụng
+     */
+    private const INFRA_TABLES = ['sessions', 'cache', 'cache_locks', 'jobs', 'job_batches', 'failed_jobs'];
+
+    /**
+     * Cùng một câu SQL chạy từ số lần này trở lên trong một request thì coi là mẫu N+1
+     */
+    private const REPEAT_THRESHOLD = 3;
+
+    private array $queries = [];
+
+    /**
+     * Không bao giờ bật trên production: header để lộ câu SQL
+     */
+    public function enabled(): bool
+    {
+        return (bool) config('app.query_stats') && !app()->isProduction();
+    }
+
+    /**
+     * Đăng ký một lần khi boot; mỗi request gọi reset() rồi summary()
+     */
+    public function listen(): void
+    {
+        DB::listen(fn (QueryExecuted $query) => $this->queries[] = [
+            'sql' => $query->sql,
+            'bindings' => $query->connection->prepareBindings($query->bindings),
+            'time' => $query->time,
+        ]);
+    }
+
+    public function reset(): void
+    {
+        $this->queries = [];
+    }
+
+    /**
+     * Số query, tổng thời gian DB, query lặp y hệt (cùng bindings) và mẫu N+1 (cùng SQL, khác bindings)
+     */
+    public function summary(): array
+    {
+        $app = array_filter($this->queries, fn ($query) => !$this->isInfra($query['sql']));
+
+        $bySql = [];
+        $exact = [];
+        foreach ($app as $query) {
+            $bySql[$query['sql']] = ($bySql[$query['sql']] ?? 0) + 1;
+            $key = $query['sql'] . '|' . json_encode($query['bindings']);
+            $exact[$key] = ($exact[$key] ?? 0) + 1;
+        }
+        arsort($bySql);
+
+        $repeated = [];
+        foreach ($bySql as $sql => $count) {
+            if ($count >= self::REPEAT_THRESHOLD) {
+                $repeated[] = ['sql' => $sql, 'count' => $count];
+            }
+        }
+
+        return [
+            'count' => count($app),
+            'infra_count' => count($this->queries) - count($app),
+            'time_ms' => round(array_sum(array_column($this->queries, 'time')), 2),
+            'duplicates' => array_sum(array_map(fn ($count) => $count - 1, $exact)),
+            'repeated' => $repeated,
+        ];
+    }
+
+    private function isInfra(string $sql): bool
+    {
+        return (bool) preg_match('/\b(?:from|into|update)\s+[`"]?(?:' . implode('|', self::INFRA_TABLES) . ')[`"]?(?:\s|$)/i', $sql);
+    }
+}
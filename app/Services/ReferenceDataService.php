@@ -0,0 +1,108 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Cache\Repository;
+use Illuminate\Contracts\Support\Arrayable;
+use Illuminate\Support\Facades\Cache;
+
+class ReferenceDataService
+{
+    /**
+     * Bản cũ (phiên bản không còn dùng) tự hết hạn sau 1 ngày
+     */
+    private const TTL_SECONDS = 86400;
+
+    /**
+     * Dữ liệu dropdown trên các trang danh sách và nguồn (xem DashboardCacheService::MODEL_SOURCES) mà nó đọc
+     */
+    public const DATASETS = [
+        'courses' => ['courses', 'departments'],
+        'teachers' => ['teachers', 'departments', 'degrees'],
+        'academicYears' => ['semesters'],
+        'semesters' => ['semesters'],
+        'degrees' => ['degrees'],
+        'departments' => ['departments'],
+    ];
+
+    /**
+     * Phiên bản nguồn đã đọc trong request hiện tại
+     */
+    private array $versions = [];
+
+    /**
+     * Props Inertia cho các dataset: [tên prop => [phạm vi, callback]].
+     * Mỗi prop là closure nên partial reload (`only`) không đụng tới; kèm hai prop phiên bản:
+     * referenceVersion luôn được client xin lại, loadedReferenceVersion chỉ đi cùng dữ liệu.
+     * Client thấy hai giá trị lệch nhau thì tải lại riêng các dataset.
+     */
+    public function props(array $datasets): array
+    {
+        $props = [];
+        foreach ($datasets as $dataset => [$scope, $callback]) {
+            $props[$dataset] = fn () => $this->get($dataset, $scope, $callback);
+        }
+
+        $version = fn () => $this->version(array_keys($datasets));
+        $props['referenceVersion'] = $version;
+        $props['loadedReferenceVersion'] = $version;
+
+        return $props;
+    }
+
+    /**
+     * Dataset theo phạm vi (vd. "all", "department:3"), cache theo phiên bản hiện tại của các nguồn
+     */
+    public function get(string $dataset, string $scope, callable $callback): array
+    {
+        $key = "reference-data:{$dataset}:{$scope}:" . $this->version([$dataset]);
+
+        return $this->store()->remember($key, self::TTL_SECONDS, function () use ($callback) {
+            $value = $callback();
+
+            return $value instanceof Arrayable ? $value->toArray() : $value;
+        });
+    }
+
+    /**
+     * Phiên bản gộp của các dataset: đổi khi bất kỳ nguồn nào của chúng thay đổi
+     */
+    public function version(array $datasets): string
+    {
+        $sources = [];
+        foreach ($datasets as $dataset) {
+            $sources = [...$sources, ...self::DATASETS[$dataset]];
+        }
+        $sources = array_unique($sources);
+        sort($sources);
+
+        return substr(md5(implode('|', array_map(fn ($source) => $this->sourceVersion($source), $sources))), 0, 12);
+    }
+
+    /**
+     * Nguồn dữ liệu vừa thay đổi: mọi dataset đọc nó nhận phiên bản mới
+     */
+    public function bump(string $source): void
+    {
+        $this->versions[$source] = uniqid('', true);
+        $this->store()->forever($this->sourceKey($source), $this->versions[$source]);
+    }
+
+    private function sourceVersion(string $source): string
+    {
+        return $this->versions[$source] ??= $this->store()->rememberForever($this->sourceKey($source), fn () => uniqid('', true));
+    }
+
+    /**
+     * Import CSV và worker cũng đổi phiên bản, nên dùng store chung thay vì APCu của từng tiến trình
+     */
+    private function store(): Repository
+    {
+        return Cache::store(config('cache.shared_store'));
+    }
+
+    private function sourceKey(string $source): string
+    {
+        return "reference-data:source:{$source}";
+    }
+}
@@ -0,0 +1,193 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\AcademicYear;
+use App\Models\Department;
+use App\Models\SalaryAggregate;
+use App\Models\Teacher;
+use App\Models\TeacherSalary;
+use Illuminate\Database\Query\Builder;
+use Illuminate\Support\Collection;
+use Illuminate\Support\Facades\DB;
+
+class ReportService
+{
+    /**
+     * Số giáo viên lương cao nhất hiển thị cho mỗi khoa trong báo cáo toàn trường
+     */
+    private const TOP_TEACHERS_PER_DEPARTMENT = 5;
+
+    /**
+     * Các dòng tổng hợp (salary_config, giáo viên) thuộc một năm học, lọc theo khoa nếu có
+     */
+    private function teacherRows(int $academicYearId, ?int $departmentId = null): Builder
+    {
+        return DB::table('salary_aggregates')
+            ->where('salary_aggregates.level', SalaryAggregate::LEVEL_TEACHER)
+            ->where('salary_aggregates.academic_year_id', $academicYearId)
+            ->when($departmentId !== null, fn ($query) => $query->where('salary_aggregates.department_id', $departmentId));
+    }
+
+    private function formatTotals(object $row): array
+    {
+        return [
+            'totalSalary' => (float) $row->salary_sum,
+            'totalClasses' => (int) $row->classes_count,
+            'totalLessons' => (float) $row->lessons_sum,
+        ];
+    }
+
+    /**
+     * Tổng theo giáo viên trong năm học, chỉ giáo viên có lương > 0, giảm dần theo tổng lương
+     */
+    public function teacherTotals(int $academicYearId, ?int $departmentId = null): Collection
+    {
+        return $this->teacherRows($academicYearId, $departmentId)
+            ->select('teacher_id', 'department_id')
+            ->selectRaw('SUM(total_salary) as salary_sum, SUM(total_classes) as classes_count, '
+                . 'SUM(total_lessons) as lessons_sum')
+            ->groupBy('teacher_id', 'department_id')
+            ->havingRaw('SUM(total_salary) > 0')
+            ->orderByDesc('salary_sum')
+            ->get();
+    }
+
+    /**
+     * Tổng theo giáo viên và học kỳ trong năm học (mỗi học kỳ có một cấu hình lương)
+     */
+    public function teacherSemesterTotals(int $academicYearId, ?int $departmentId = null): Collection
+    {
+        return $this->teacherRows($academicYearId, $departmentId)
+            ->join('semesters', 'semesters.id', '=', 'salary_aggregates.semester_id')
+            ->select('salary_aggregates.teacher_id', 'semesters.id as semester_id', 'semesters.name as semester_name',
+                'salary_aggregates.total_salary as salary_sum', 'salary_aggregates.total_classes as classes_count',
+                'salary_aggregates.total_lessons as lessons_sum')
+            ->orderBy('semesters.id')
+            ->get();
+    }
+
+    /**
+     * Tổng theo khoa trong năm học, đọc thẳng từ dòng tổng hợp (năm học, khoa)
+     */
+    public function departmentTotals(int $academicYearId): Collection
+    {
+        return DB::table('salary_aggregates')
+            ->where('level', SalaryAggregate::LEVEL_YEAR_DEPARTMENT)
+            ->where('academic_year_id', $academicYearId)
+            ->select('department_id', 'teachers_count', 'total_salary as salary_sum',
+                'total_classes as classes_count', 'total_lessons as lessons_sum')
+            ->orderByDesc('total_salary')
+            ->get();
+    }
+
+    /**
+     * Dữ liệu báo cáo năm của một giáo viên: các dòng lương nhóm theo học kỳ và tổng cả năm
+     */
+    public function teacherYearlyReport(int $teacherId, int $academicYearId): array
+    {
+        $teacher = Teacher::with(['department', 'degree'])->find($teacherId);
+        $academicYear = AcademicYear::with('semesters')->find($academicYearId);
+
+        $salaryData = TeacherSalary::with([
+            'salaryConfig.semester',
+            'classroom.course'
+        ])
+        ->where('teacher_id', $teacherId)
+        ->whereHas('salaryConfig.semester', function ($q) use ($academicYearId) {
+            $q->where('academicYear_id', $academicYearId);
+        })
+        ->get()
+        ->groupBy('salaryConfig.semester.name');
+
+        $salaries = $salaryData->flatten(1);
+        $totalSalary = (float) $salaries->sum(fn ($salary) => (float) ($salary->total_salary ?? 0));
+        $totalClasses = $salaries->count();
+        $totalLessons = (float) $salaries->sum(fn ($salary) => (float) ($salary->converted_lessons ?? 0));
+
+        return [
+            'teacher' => $teacher,
+            'academicYear' => $academicYear,
+            'salaryData' => $salaryData,
+            'summary' => [
+                'totalSalary' => $totalSalary,
+                'totalClasses' => $totalClasses,
+                'totalLessons' => $totalLessons,
+                'averageSalaryPerClass' => $totalClasses > 0 ? $totalSalary / $totalClasses : 0
+            ]
+        ];
+    }
+
+    /**
+     * Dữ liệu báo cáo khoa: danh sách giáo viên kèm tổng theo học kỳ và tổng của khoa
+     */
+    public function departmentReport(int $departmentId, int $academicYearId): array
+    {
+        $teacherTotals = $this->teacherTotals($academicYearId, $departmentId);
+        $teachers = Teacher::with('degree')->whereIn('id', $teacherTotals->pluck('teacher_id'))->get()->keyBy('id');
+        $semesterTotals = $this->teacherSemesterTotals($academicYearId, $departmentId)->groupBy('teacher_id');
+
+        $teachersData = $teacherTotals
+            ->map(fn ($row) => [
+                'teacher' => $teachers->get($row->teacher_id),
+                ...$this->formatTotals($row),
+                'salaryBySemester' => $semesterTotals->get($row->teacher_id, collect())
+                    ->mapWithKeys(fn ($semester) => [$semester->semester_name => $this->formatTotals($semester)]),
+            ])
+            ->values();
+
+        $totalSalary = $teachersData->sum('totalSalary');
+
+        return [
+            'teachersData' => $teachersData,
+            'departmentTotals' => [
+                'totalTeachers' => $teachersData->count(),
+                'totalSalary' => $totalSalary,
+                'totalClasses' => $teachersData->sum('totalClasses'),
+                'totalLessons' => $teachersData->sum('totalLessons'),
+                'averageSalaryPerTeacher' => $teachersData->count() > 0 ? $totalSalary / $teachersData->count() : 0
+            ]
+        ];
+    }
+
+    /**
+     * Dữ liệu báo cáo toàn trường: tổng theo khoa, top giáo viên mỗi khoa và tổng toàn trường
+     */
+    public function schoolReport(int $academicYearId): array
+    {
+        $departments = Department::get()->keyBy('id');
+        $topByDepartment = $this->teacherTotals($academicYearId)
+            ->groupBy('department_id')
+            ->map(fn ($rows) => $rows->take(self::TOP_TEACHERS_PER_DEPARTMENT));
+        $teachers = Teacher::whereIn('id', $topByDepartment->flatten(1)->pluck('teacher_id'))->get()->keyBy('id');
+
+        $departmentsData = $this->departmentTotals($academicYearId)
+            ->filter(fn ($row) => $departments->has($row->department_id))
+            ->map(fn ($row) => [
+                'department' => $departments->get($row->department_id),
+                'teachersCount' => (int) $row->teachers_count,
+                ...$this->formatTotals($row),
+                'teachers' => $topByDepartment->get($row->department_id, collect())
+                    ->map(fn ($teacher) => ['teacher' => $teachers->get($teacher->teacher_id), ...$this->formatTotals($teacher)])
+                    ->values(),
+            ])
+            ->values();
+
+        $totalTeachers = $departmentsData->sum('teachersCount');
+        $totalSalary = $departmentsData->sum('totalSalary');
+
+        return [
+            'departmentsData' => $departmentsData,
+            'schoolTotals' => [
+                'totalDepartments' => $departmentsData->count(),
+                'totalTeachers' => $totalTeachers,
+                'totalSalary' => $totalSalary,
+                'totalClasses' => $departmentsData->sum('totalClasses'),
+                'totalLessons' => $departmentsData->sum('totalLessons'),
+                'averageSalaryPerTeacher' => $totalTeachers > 0 ? $totalSalary / $totalTeachers : 0,
+                'averageSalaryPerDepartment' => $departmentsData->count() > 0 ?
+                    $totalSalary / $departmentsData->count() : 0
+            ]
+        ];
+    }
+}
@@ -0,0 +1,110 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\SalaryAggregate;
+use App\Models\SalaryConfig;
+use Illuminate\Support\Facades\DB;
+
+class SalaryAggregateService
+{
+    private const COLUMNS = [
+        'level', 'salary_config_id', 'semester_id', 'academic_year_id', 'department_id', 'teacher_id',
+        'teachers_count', 'total_classes', 'total_lessons', 'total_salary', 'is_frozen', 'created_at', 'updated_at'
+    ];
+
+    protected $dashboardCache;
+
+    public function __construct(DashboardCacheService $dashboardCache)
+    {
+        $this->dashboardCache = $dashboardCache;
+    }
+
+    /**
+     * Tính lại bảng tổng hợp của một cấu hình lương từ teacher_salaries.
+     * Cấu hình đã đóng chỉ được tổng hợp một lần rồi giữ nguyên.
+     */
+    public function refresh(SalaryConfig $salaryConfig): void
+    {
+        $frozen = SalaryAggregate::where('salary_config_id', $salaryConfig->id)
+            ->where('is_frozen', true)
+            ->exists();
+
+        if ($frozen) {
+            return;
+        }
+
+        $semester = $salaryConfig->semester;
+        $isClosed = $salaryConfig->status === 'closed';
+        $now = now()->toDateTimeString();
+
+        DB::transaction(function () use ($salaryConfig, $semester, $isClosed, $now) {
+            SalaryAggregate::where('salary_config_id', $salaryConfig->id)->delete();
+
+            // (salary_config, giáo viên)
+            DB::table('salary_aggregates')->insertUsing(self::COLUMNS,
+                DB::table('teacher_salaries')
+                    ->join('teachers', 'teachers.id', '=', 'teacher_salaries.teacher_id')
+                    ->where('teacher_salaries.salary_config_id', $salaryConfig->id)
+                    ->selectRaw('?, ?, ?, ?, teachers.department_id, teacher_salaries.teacher_id, 1, COUNT(*), '
+                        . 'SUM(teacher_salaries.converted_lessons), SUM(teacher_salaries.total_salary), ?, ?, ?', [
+                        SalaryAggregate::LEVEL_TEACHER, $salaryConfig->id, $semester->id,
+                        $semester->academicYear_id, $isClosed, $now, $now
+                    ])
+                    ->groupBy('teacher_salaries.teacher_id', 'teachers.department_id')
+            );
+
+            // (học kỳ, khoa): chỉ tính giáo viên có lương > 0 như báo cáo
+            DB::table('salary_aggregates')->insertUsing(self::COLUMNS,
+                DB::table('salary_aggregates')
+                    ->where('level', SalaryAggregate::LEVEL_TEACHER)
+                    ->where('salary_config_id', $salaryConfig->id)
+                    ->where('total_salary', '>', 0)
+                    ->selectRaw('?, salary_config_id, semester_id, academic_year_id, department_id, NULL, COUNT(*), '
+                        . 'SUM(total_classes), SUM(total_lessons), SUM(total_salary), ?, ?, ?', [
+                        SalaryAggregate::LEVEL_SEMESTER_DEPARTMENT, $isClosed, $now, $now
+                    ])
+                    ->groupBy('salary_config_id', 'semester_id', 'academic_year_id', 'department_id')
+            );
+
+            $this->refreshYear($semester->academicYear_id, $now);
+        });
+
+        // Dòng lương được insert hàng loạt, không qua model event
+        $this->dashboardCache->forget('salaries');
+    }
+
+    /**
+     * Tính lại tổng (năm học, khoa) từ các dòng theo giáo viên của cả năm học.
+     * Năm học chỉ chốt khi mọi cấu hình lương trong năm đã đóng.
+     */
+    private function refreshYear(int $academicYearId, string $now): void
+    {
+        $isClosed = !SalaryConfig::whereHas('semester', function ($query) use ($academicYearId) {
+            $query->where('academicYear_id', $academicYearId);
+        })->where('status', '!=', 'closed')->exists();
+
+        SalaryAggregate::where('level', SalaryAggregate::LEVEL_YEAR_DEPARTMENT)
+            ->where('academic_year_id', $academicYearId)
+            ->delete();
+
+        $perTeacher = DB::table('salary_aggregates')
+            ->where('level', SalaryAggregate::LEVEL_TEACHER)
+            ->where('academic_year_id', $academicYearId)
+            ->select('department_id', 'teacher_id')
+            ->selectRaw('SUM(total_classes) as total_classes, SUM(total_lessons) as total_lessons, '
+                . 'SUM(total_salary) as total_salary')
+            ->groupBy('department_id', 'teacher_id')
+            ->havingRaw('SUM(total_salary) > 0');
+
+        DB::table('salary_aggregates')->insertUsing(self::COLUMNS,
+            DB::query()
+                ->fromSub($perTeacher, 'teacher_totals')
+                ->selectRaw('?, NULL, NULL, ?, department_id, NULL, COUNT(*), SUM(total_classes), '
+                    . 'SUM(total_lessons), SUM(total_salary), ?, ?, ?', [
+                    SalaryAggregate::LEVEL_YEAR_DEPARTMENT, $academicYearId, $isClosed, $now, $now
+                ])
+                ->groupBy('department_id')
+        );
+    }
+}
@@ -63,58 +63,143 @@ public function calculateSalaryForClassroom(Classroom $classroom, SalaryConfig $
 
     /**
      * Tính lương cho tất cả lớp học trong học kỳ
+     *
+     * Lớp học được đọc theo từng chunk (chunkById) và lương của mỗi chunk được
+     * insert thành một batch riêng, nên bộ nhớ và kích thước câu INSERT không
+     * tăng theo số lớp của học kỳ. $onProgress nhận ($processed, $total) sau mỗi chunk.
      */
-    public function calculateSalariesForSemester(SalaryConfig $salaryConfig): array
+    public function calculateSalariesForSemester(SalaryConfig $salaryConfig, ?callable $onProgress = null): array
     {
-        // FIX: Eager load tất cả relationships cần thiết
-        $classrooms = Classroom::with([
-            'teacher.degree', 
-            'teacher.department',
-            'course',
-            'semester'
-        ])
-        ->where('semester_id', $salaryConfig->semester_id)
-        ->whereNotNull('teacher_id')
-        ->get();
-
-        $results = [];
-        $errors = [];
-        $bulkInsertData = [];
+        $startedAt = now();
 
         // FIX: Xóa dữ liệu cũ trước khi tính mới (nếu tính lại)
         if ($salaryConfig->status === 'active') {
             TeacherSalary::where('salary_config_id', $salaryConfig->id)->delete();
         }
 
-        foreach ($classrooms as $classroom) {
-            try {
-                $salaryData = $this->calculateSalaryForClassroom($classroom, $salaryConfig);
-                
-                // FIX: Collect data để bulk insert thay vì từng query
-                $bulkInsertData[] = array_merge($salaryData, [
-                    'created_at' => now(),
-                    'updated_at' => now()
-                ]);
-                
-                $results[] = $salaryData;
-            } catch (\Exception $e) {
-                $errors[] = [
-                    'classroom_id' => $classroom->id,
-                    'classroom_name' => $classroom->name,
-                    'error' => $e->getMessage()
-                ];
-            }
-        }
+        $result = $this->processClassrooms($this->semesterClassrooms($salaryConfig), $salaryConfig, $onProgress, false);
+        $salaryConfig->forceFill(['calculated_at' => $startedAt])->save();
+
+        return $result + ['mode' => 'full', 'total_removed' => 0];
+    }
 
-        // FIX: Bulk insert thay vì N queries
-        if (!empty($bulkInsertData)) {
-            TeacherSalary::insert($bulkInsertData);
+    /**
+     * Tính lại lương chỉ cho các lớp thay đổi kể từ lần tính trước
+     *
+     * Lớp được coi là thay đổi khi bản thân lớp, môn học, giáo viên hoặc bằng
+     * cấp của giáo viên có updated_at từ mốc calculated_at trở đi, hoặc lớp
+     * chưa có dòng lương. Các dòng đó được upsert theo (salary_config_id,
+     * classroom_id); dòng của lớp không còn giáo viên bị xoá. Cấu hình chưa
+     * từng tính thì tính đầy đủ.
+     */
+    public function recalculateChangedSalaries(SalaryConfig $salaryConfig, ?callable $onProgress = null): array
+    {
+        if (!$salaryConfig->calculated_at) {
+            return $this->calculateSalariesForSemester($salaryConfig, $onProgress);
         }
 
+        $startedAt = now();
+        $since = $salaryConfig->calculated_at;
+
+        $removed = TeacherSalary::where('salary_config_id', $salaryConfig->id)
+            ->whereIn('classroom_id', Classroom::select('id')
+                ->where('semester_id', $salaryConfig->semester_id)
+                ->whereNull('teacher_id'))
+            ->delete();
+
+        $query = $this->semesterClassrooms($salaryConfig)
+            ->where(function ($q) use ($since, $salaryConfig) {
+                $q->where('updated_at', '>=', $since)
+                    ->orWhereHas('course', fn ($course) => $course->where('updated_at', '>=', $since))
+                    ->orWhereHas('teacher', fn ($teacher) => $teacher->where('updated_at', '>=', $since)
+                        ->orWhereHas('degree', fn ($degree) => $degree->where('updated_at', '>=', $since)))
+                    ->orWhereDoesntHave('teacherSalaries', fn ($salary) => $salary->where('salary_config_id', $salaryConfig->id));
+            });
+
+        $result = $this->processClassrooms($query, $salaryConfig, $onProgress, true);
+        $salaryConfig->forceFill(['calculated_at' => $startedAt])->save();
+
+        return $result + ['mode' => 'incremental', 'total_removed' => $removed];
+    }
+
+    /**
+     * Lớp học có giáo viên của học kỳ ứng với cấu hình lương
+     */
+    protected function semesterClassrooms(SalaryConfig $salaryConfig)
+    {
+        return Classroom::where('semester_id', $salaryConfig->semester_id)
+            ->whereNotNull('teacher_id');
+    }
+
+    /**
+     * Tính lương theo từng chunk lớp học và ghi mỗi chunk thành một batch
+     */
+    protected function processClassrooms($query, SalaryConfig $salaryConfig, ?callable $onProgress, bool $upsert): array
+    {
+        $chunkSize = (int) config('salary.chunk_size', 1000);
+        $total = (clone $query)->count();
+
+        $errors = [];
+        $totalCalculated = 0;
+        $processed = 0;
+
+        // FIX: Eager load tất cả relationships cần thiết, theo từng chunk
+        $query->with([
+            'teacher.degree', 
+            'teacher.department',
+            'course',
+            'semester'
+        ])->chunkById($chunkSize, function ($classrooms) use ($salaryConfig, $onProgress, $upsert, $total, &$errors, &$totalCalculated, &$processed) {
+            $now = now();
+            $bulkInsertData = [];
+
+            foreach ($classrooms as $classroom) {
+                try {
+                    $salaryData = $this->calculateSalaryForClassroom($classroom, $salaryConfig);
+                    
+                    // FIX: Collect data để bulk insert thay vì từng query
+                    $bulkInsertData[] = array_merge($salaryData, [
+                        'created_at' => $now,
+                        'updated_at' => $now
+                    ]);
+                } catch (\Exception $e) {
+                    $errors[] = [
+                        'classroom_id' => $classroom->id,
+                        'classroom_name' => $classroom->name,
+                        'error' => $e->getMessage()
+                    ];
+                }
+            }
+
+            // Mỗi chunk một câu INSERT, không vượt max_allowed_packet của MySQL
+            if (!empty($bulkInsertData)) {
+                if ($upsert) {
+                    TeacherSalary::upsert($bulkInsertData, ['salary_config_id', 'classroom_id'], [
+                        'teacher_id',
+                        'actual_lessons',
+                        'class_coefficient',
+                        'course_coefficient',
+                        'teacher_coefficient',
+                        'converted_lessons',
+                        'total_salary',
+                        'updated_at',
+                    ]);
+                } else {
+                    TeacherSalary::insert($bulkInsertData);
+                }
+            }
+
+            $totalCalculated += count($bulkInsertData);
+            $processed += $classrooms->count();
+
+            if ($onProgress) {
+                $onProgress($processed, $total);
+            }
+        });
+
         return [
-            'success' => $results,
             'errors' => $errors,
-            'total_calculated' => count($results),
+            'total_calculated' => $totalCalculated,
             'total_errors' => count($errors)
         ];
     }
@@ -0,0 +1,109 @@
+<?php
+
+namespace App\Services;
+
+use Illuminate\Database\Events\QueryExecuted;
+use Illuminate\Support\Facades\DB;
+
+class ServerTimingService
+{
+    /**
+     * Các pha theo thứ tự trong header Server-Timing (tên => mô tả hiện trong DevTools)
+     */
+    public const PHASES = [
+        'bootstrap' => 'Bootstrap',
+        'session' => 'Auth/session middleware',
+        'app' => 'Controller',
+        'db' => 'DB',
+        'inertia' => 'Inertia props + JSON',
+        'view' => 'View render',
+    ];
+
+    private array $durations = [];
+
+    private ?string $phase = null;
+
+    private float $since = 0.0;
+
+    /**
+     * Thời gian DB (ms) đã trừ khỏi pha hiện tại, tính từ lúc vào pha
+     */
+    private float $dbSince = 0.0;
+
+    private int $queries = 0;
+
+    public function enabled(): bool
+    {
+        return (bool) config('app.server_timing');
+    }
+
+    /**
+     * Thời gian query cộng vào pha "db" thay vì pha đang chạy
+     */
+    public function listen(): void
+    {
+        DB::listen(function (QueryExecuted $query) {
+            if ($this->phase === null) {
+                return;
+            }
+            $this->durations['db'] = ($this->durations['db'] ?? 0) + $query->time;
+            $this->dbSince += $query->time;
+            $this->queries++;
+        });
+    }
+
+    /**
+     * Gọi ở middleware ngoài cùng: từ LARAVEL_START tới đây là bootstrap
+     */
+    public function begin(): void
+    {
+        $this->durations = [];
+        $this->queries = 0;
+        $this->phase = 'bootstrap';
+        $this->since = defined('LARAVEL_START') ? LARAVEL_START : microtime(true);
+        $this->dbSince = 0.0;
+        $this->enter('session');
+    }
+
+    public function phase(): ?string
+    {
+        return $this->phase;
+    }
+
+    /**
+     * Kết thúc pha hiện tại (trừ thời gian DB chạy trong pha) và chuyển sang pha mới
+     */
+    public function enter(?string $phase): void
+    {
+        $now = microtime(true);
+        if ($this->phase !== null) {
+            $elapsed = ($now - $this->since) * 1000 - $this->dbSince;
+            $this->durations[$this->phase] = ($this->durations[$this->phase] ?? 0) + max($elapsed, 0);
+        }
+        $this->phase = $phase;
+        $this->since = $now;
+        $this->dbSince = 0.0;
+    }
+
+    /**
+     * Đóng pha cuối rồi dựng giá trị header, ví dụ: bootstrap;desc="Bootstrap";dur=12.4, ..., total;dur=85.1
+     */
+    public function finish(): string
+    {
+        $this->enter(null);
+
+        $metrics = [];
+        foreach (self::PHASES as $name => $description) {
+            if (!isset($this->durations[$name])) {
+                continue;
+            }
+            if ($name === 'db') {
+                $description .= " ({$this->queries} query)";
+            }
+            $metrics[] = sprintf('%s;desc="%s";dur=%.1f', $name, $description, $this->durations[$name]);
+        }
+        $metrics[] = sprintf('total;dur=%.1f', array_sum($this->durations));
+
+        return implode(', ', $metrics);
+    }
+}
@@ -1,7 +1,11 @@
 <?php
 
+use App\Http\Middleware\AddQueryStatsHeaders;
+use App\Http\Middleware\AddServerTiming;
 use App\Http\Middleware\HandleAppearance;
 use App\Http\Middleware\HandleInertiaRequests;
+use App\Http\Middleware\MarkServerTimingApp;
+use Illuminate\Contracts\Auth\Middleware\AuthenticatesRequests;
 use Illuminate\Foundation\Application;
 use Illuminate\Foundation\Configuration\Exceptions;
 use Illuminate\Foundation\Configuration\Middleware;
@@ -15,6 +19,9 @@
         health: '/up',
     )
     ->withMiddleware(function (Middleware $middleware) {
+        // Ngoài cùng để đếm cả query session (chỉ hoạt động khi QUERY_STATS bật)
+        $middleware->prepend(AddQueryStatsHeaders::class);
+        $middleware->prepend(AddServerTiming::class);
         $middleware->encryptCookies(except: ['appearance', 'sidebar_state']);
         $middleware->alias([
             'role' => \App\Http\Middleware\CheckRole::class,
@@ -23,7 +30,10 @@
             HandleAppearance::class,
             HandleInertiaRequests::class,
             AddLinkHeadersForPreloadedAssets::class,
+            MarkServerTimingApp::class,
         ]);
+        // Mốc Server-Timing "app" luôn chạy sau middleware xác thực của route
+        $middleware->appendToPriorityList(AuthenticatesRequests::class, MarkServerTimingApp::class);
     })
     ->withExceptions(function (Exceptions $exceptions) {
         //
@@ -41,6 +41,32 @@
 
     'debug' => (bool) env('APP_DEBUG', false),
 
+    /*
+    |--------------------------------------------------------------------------
+    | Query Stats Headers
+    |--------------------------------------------------------------------------
+    |
+    | Khi bật, mỗi response có header X-Query-Count, X-Query-Time-Ms,
+    | X-Query-Duplicates, X-Query-Repeated (mẫu N+1) để test Python kiểm
+    | tra ngân sách query theo route. Mặc định chỉ bật với APP_ENV=testing.
+    |
+    */
+
+    'query_stats' => (bool) env('QUERY_STATS', env('APP_ENV') === 'testing'),
+
+    /*
+    |--------------------------------------------------------------------------
+    | Server-Timing Header
+    |--------------------------------------------------------------------------
+    |
+    | Mỗi response có header Server-Timing chia thời gian xử lý thành
+    | bootstrap, auth/session, controller, DB, Inertia và render view
+    | (xem trong tab Network của DevTools hoặc selenium/timingCollector.py).
+    |
+    */
+
+    'server_timing' => (bool) env('SERVER_TIMING', true),
+
     /*
     |--------------------------------------------------------------------------
     | Application URL
@@ -26,13 +26,21 @@
     | well as their drivers. You may even define multiple stores for the
     | same cache driver to group types of items stored in your caches.
     |
-    | Supported drivers: "array", "database", "file", "memcached",
+    | Supported drivers: "apc", "array", "database", "file", "memcached",
     |                    "redis", "dynamodb", "octane", "null"
     |
+    | Với DB ở xa, "database" tốn một round trip cho mỗi lần đọc cache. "apc"
+    | (APCu, bộ nhớ chung của các worker PHP-FPM) và "file" đọc ngay trên
+    | máy chủ web; "redis" dùng được với Redis/Valkey chạy cạnh ứng dụng.
+    |
     */
 
     'stores' => [
 
+        'apc' => [
+            'driver' => 'apc',
+        ],
+
         'array' => [
             'driver' => 'array',
             'serialize' => false,
@@ -92,6 +100,21 @@
 
     ],
 
+    /*
+    |--------------------------------------------------------------------------
+    | Shared Cache Store
+    |--------------------------------------------------------------------------
+    |
+    | Store cho dữ liệu mà web và queue worker cùng đọc ghi: khoá và tiến độ
+    | tính lương, cache widget dashboard (worker xoá sau khi tính lương). APCu
+    | riêng cho từng tiến trình và không hỗ trợ lock, nên khi CACHE_STORE=apc
+    | hãy đặt CACHE_SHARED_STORE=database (hoặc redis/file). Để trống thì dùng
+    | store mặc định.
+    |
+    */
+
+    'shared_store' => env('CACHE_SHARED_STORE'),
+
     /*
     |--------------------------------------------------------------------------
     | Cache Key Prefix
@@ -117,6 +117,18 @@
 
     ],
 
+    /*
+    |--------------------------------------------------------------------------
+    | Query Log
+    |--------------------------------------------------------------------------
+    |
+    | Khi bật, mỗi query được ghi vào log kèm bindings và đường dẫn request
+    | để selenium/queryPlanCheck.py chạy EXPLAIN. Chỉ bật khi đo đạc.
+    |
+    */
+
+    'log_queries' => env('DB_LOG_QUERIES', false),
+
     /*
     |--------------------------------------------------------------------------
     | Migration Repository Table
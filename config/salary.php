@@ -0,0 +1,30 @@
+<?php
+
+return [
+
+    /*
+    |--------------------------------------------------------------------------
+    | Salary Calculation
+    |--------------------------------------------------------------------------
+    |
+    | Số lớp học được đọc và insert lương trong mỗi batch khi tính lương học
+    | kỳ. Giá trị nhỏ giữ bộ nhớ PHP và kích thước câu INSERT ổn định với học
+    | kỳ rất lớn; giá trị lớn giảm số query.
+    |
+    */
+
+    'chunk_size' => (int) env('SALARY_CHUNK_SIZE', 1000),
+
+    /*
+    |--------------------------------------------------------------------------
+    | PDF Cache Disk
+    |--------------------------------------------------------------------------
+    |
+    | Disk lưu các file PDF báo cáo đã render (pdf-cache/year-{id}/{hash}.pdf).
+    | File được xoá khi bảng lương trong năm học được tính lại hoặc đóng.
+    |
+    */
+
+    'pdf_cache_disk' => env('PDF_CACHE_DISK', env('FILESYSTEM_DISK', 'local')),
+
+];
@@ -0,0 +1,38 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::table('salary_configs', function (Blueprint $table) {
+            // Mốc bắt đầu lần tính lương gần nhất, dùng để tìm lớp thay đổi khi tính lại
+            $table->timestamp('calculated_at')->nullable()->after('status');
+        });
+
+        Schema::table('teacher_salaries', function (Blueprint $table) {
+            // Mỗi lớp chỉ có 1 dòng lương trong 1 cấu hình, khoá cho upsert khi tính lại
+            $table->unique(['salary_config_id', 'classroom_id']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('teacher_salaries', function (Blueprint $table) {
+            $table->dropUnique(['salary_config_id', 'classroom_id']);
+        });
+
+        Schema::table('salary_configs', function (Blueprint $table) {
+            $table->dropColumn('calculated_at');
+        });
+    }
+};
@@ -0,0 +1,53 @@
+<?php
+
+use App\Models\SalaryConfig;
+use App\Services\SalaryAggregateService;
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::create('salary_aggregates', function (Blueprint $table) {
+            $table->id();
+            // teacher: (salary_config, teacher) | semester_department: (semester, khoa) | year_department: (năm học, khoa)
+            $table->string('level', 32);
+            $table->foreignId('salary_config_id')->nullable()->constrained('salary_configs')->onDelete('cascade');
+            $table->foreignId('semester_id')->nullable()->constrained('semesters')->onDelete('cascade');
+            $table->foreignId('academic_year_id')->constrained('academic_years')->onDelete('cascade');
+            $table->foreignId('department_id')->constrained('departments')->onDelete('cascade');
+            $table->foreignId('teacher_id')->nullable()->constrained('teachers')->onDelete('cascade');
+            $table->unsignedInteger('teachers_count')->default(0);
+            $table->unsignedInteger('total_classes')->default(0);
+            $table->decimal('total_lessons', 12, 2)->default(0);
+            $table->decimal('total_salary', 16, 2)->default(0);
+            // Bảng lương đã đóng: số liệu chốt, không tính lại
+            $table->boolean('is_frozen')->default(false);
+            $table->timestamps();
+
+            $table->index(['level', 'academic_year_id', 'department_id']);
+            $table->index(['level', 'salary_config_id']);
+        });
+
+        // Tổng hợp luôn lương đã tính để báo cáo, xuất file và dashboard có số liệu ngay sau khi migrate.
+        // refresh() chốt (is_frozen) các cấu hình đã đóng.
+        $aggregates = app(SalaryAggregateService::class);
+        SalaryConfig::with('semester')
+            ->whereIn('status', ['active', 'closed'])
+            ->lazyById()
+            ->each(fn (SalaryConfig $salaryConfig) => $aggregates->refresh($salaryConfig));
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('salary_aggregates');
+    }
+};
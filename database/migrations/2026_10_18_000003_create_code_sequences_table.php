@@ -0,0 +1,28 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Bộ đếm cấp mã tự sinh (courses:CS, classrooms:LH...), mỗi lần cấp tăng value một cách nguyên tử
+        Schema::create('code_sequences', function (Blueprint $table) {
+            $table->string('name')->primary();
+            $table->unsignedBigInteger('value')->default(0);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('code_sequences');
+    }
+};
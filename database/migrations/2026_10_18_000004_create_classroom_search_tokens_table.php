@@ -0,0 +1,47 @@
+<?php
+
+use App\Services\ClassroomSearchService;
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Từ khoá tìm kiếm của mỗi lớp (tên/mã lớp, tên/mã môn, tên giáo viên), tìm theo tiền tố trên index
+        Schema::create('classroom_search_tokens', function (Blueprint $table) {
+            $table->string('token', 64);
+            $table->foreignId('classroom_id')->constrained('classrooms')->cascadeOnDelete();
+
+            $table->primary(['token', 'classroom_id']);
+        });
+
+        // Dựng từ khoá cho các lớp đã có, để tìm kiếm đúng ngay sau khi migrate
+        app(ClassroomSearchService::class)->reindexAll();
+
+        // Phân trang keyset: ORDER BY created_at DESC, id DESC và WHERE (created_at, id) < cursor
+        Schema::table('classrooms', function (Blueprint $table) {
+            $table->index(['created_at', 'id']);
+            $table->index(['semester_id', 'created_at', 'id']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        // Tạo lại index đơn của khoá ngoại trước khi bỏ index ghép (MySQL cần một index cho mỗi khoá ngoại)
+        Schema::table('classrooms', function (Blueprint $table) {
+            $table->index('semester_id');
+            $table->dropIndex(['semester_id', 'created_at', 'id']);
+            $table->dropIndex(['created_at', 'id']);
+        });
+
+        Schema::dropIfExists('classroom_search_tokens');
+    }
+};
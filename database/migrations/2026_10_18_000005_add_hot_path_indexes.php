@@ -0,0 +1,66 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Index cho các bộ lọc chạy thường xuyên (kiểm tra bằng selenium/queryPlanCheck.py).
+        // Trên MySQL, index ghép bắt đầu bằng cột khoá ngoại thay luôn index tự tạo của khoá ngoại đó.
+        Schema::table('teacher_salaries', function (Blueprint $table) {
+            // Báo cáo lương học kỳ: lọc theo cấu hình lương rồi gom theo giáo viên
+            $table->index(['salary_config_id', 'teacher_id']);
+        });
+
+        Schema::table('classrooms', function (Blueprint $table) {
+            // Kiểm tra trùng tên lớp (tạo lẻ, tạo hàng loạt, import) trong cùng học kỳ + môn học
+            $table->index(['semester_id', 'course_id', 'name']);
+            // Dashboard giáo viên: số lớp của giáo viên trong học kỳ hiện tại
+            $table->index(['teacher_id', 'semester_id']);
+        });
+
+        Schema::table('semesters', function (Blueprint $table) {
+            // Học kỳ theo năm học (bộ lọc lớp học, báo cáo năm), sắp theo tên
+            $table->index(['academicYear_id', 'name']);
+        });
+
+        Schema::table('teachers', function (Blueprint $table) {
+            // Trưởng khoa: danh sách giáo viên trong khoa, phân trang theo id
+            $table->index(['department_id', 'id']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        // Tạo lại index đơn của khoá ngoại trước khi bỏ index ghép (MySQL cần một index cho mỗi khoá ngoại)
+        Schema::table('teachers', function (Blueprint $table) {
+            $table->index('department_id');
+            $table->dropIndex(['department_id', 'id']);
+        });
+
+        Schema::table('semesters', function (Blueprint $table) {
+            $table->index('academicYear_id');
+            $table->dropIndex(['academicYear_id', 'name']);
+        });
+
+        Schema::table('classrooms', function (Blueprint $table) {
+            $table->index('teacher_id');
+            $table->dropIndex(['teacher_id', 'semester_id']);
+            $table->dropIndex(['semester_id', 'course_id', 'name']);
+        });
+
+        // salary_config_id vẫn có unique (salary_config_id, classroom_id) làm index cho khoá ngoại
+        Schema::table('teacher_salaries', function (Blueprint $table) {
+            $table->dropIndex(['salary_config_id', 'teacher_id']);
+        });
+    }
+};
@@ -14,9 +14,11 @@ interface PaginationProps {
   from: number;
   to: number;
   total: number;
+  // Partial reload: chỉ xin lại các prop này khi chuyển trang
+  only?: string[];
 }
 
-export function Pagination({ links, from, to, total }: PaginationProps) {
+export function Pagination({ links, from, to, total, only }: PaginationProps) {
   // Nếu không có links hoặc chỉ có 1 trang thì không hiển thị phân trang
   if (!links || links.length <= 3 || total <= 10) return null;
 
@@ -37,7 +39,7 @@ export function Pagination({ links, from, to, total }: PaginationProps) {
             size="sm" 
             asChild
           >
-            <Link href={prevLink.url}>
+            <Link href={prevLink.url} only={only}>
               <ChevronLeft className="h-4 w-4 mr-1" />
               Trước
             </Link>
@@ -62,7 +64,7 @@ export function Pagination({ links, from, to, total }: PaginationProps) {
                 size="sm"
                 asChild
               >
-                <Link href={link.url}>
+                <Link href={link.url} only={only}>
                   <span dangerouslySetInnerHTML={{ __html: link.label }} />
                 </Link>
               </Button>
@@ -85,7 +87,7 @@ export function Pagination({ links, from, to, total }: PaginationProps) {
             size="sm" 
             asChild
           >
-            <Link href={nextLink.url}>
+            <Link href={nextLink.url} only={only}>
               Tiếp
               <ChevronRight className="h-4 w-4 ml-1" />
             </Link>
@@ -103,4 +105,53 @@ export function Pagination({ links, from, to, total }: PaginationProps) {
       </div>
     </div>
   );
-}
\ No newline at end of file
+}
+
+interface CursorPaginationProps {
+  prevUrl: string | null;
+  nextUrl: string | null;
+  count: number;
+  only?: string[];
+}
+
+// Phân trang theo cursor: chỉ có Trước/Tiếp, không có số trang và tổng số
+export function CursorPagination({ prevUrl, nextUrl, count, only }: CursorPaginationProps) {
+  if (!prevUrl && !nextUrl) return null;
+
+  return (
+    <div className="flex flex-col sm:flex-row items-center justify-between gap-4 py-4">
+      <div className="text-sm text-muted-foreground">
+        Hiển thị <span className="font-medium">{count}</span> kết quả trên trang này
+      </div>
+      <div className="flex items-center space-x-2">
+        {prevUrl ? (
+          <Button variant="outline" size="sm" asChild>
+            <Link href={prevUrl} only={only}>
+              <ChevronLeft className="h-4 w-4 mr-1" />
+              Trước
+            </Link>
+          </Button>
+        ) : (
+          <Button variant="outline" size="sm" disabled>
+            <ChevronLeft className="h-4 w-4 mr-1" />
+            Trước
+          </Button>
+        )}
+
+        {nextUrl ? (
+          <Button variant="outline" size="sm" asChild>
+            <Link href={nextUrl} only={only}>
+              Tiếp
+              <ChevronRight className="h-4 w-4 ml-1" />
+            </Link>
+          </Button>
+        ) : (
+          <Button variant="outline" size="sm" disabled>
+            Tiếp
+            <ChevronRight className="h-4 w-4 ml-1" />
+          </Button>
+        )}
+      </div>
+    </div>
+  );
+}
@@ -0,0 +1,21 @@
+import { router } from '@inertiajs/react';
+import { useEffect } from 'react';
+
+export interface ReferenceVersionProps {
+    // Phiên bản hiện tại trên server, đi kèm mọi partial reload
+    referenceVersion?: string;
+    // Phiên bản của dữ liệu dropdown đang có trên trang
+    loadedReferenceVersion?: string;
+}
+
+// Lọc/lật trang chỉ xin lại danh sách (partial reload), dữ liệu dropdown giữ nguyên.
+// Khi server báo phiên bản mới (có người sửa môn học, giáo viên...), tải lại riêng các prop đó.
+export function useReferenceData(props: string[], { referenceVersion, loadedReferenceVersion }: ReferenceVersionProps) {
+    useEffect(() => {
+        if (!referenceVersion || referenceVersion === loadedReferenceVersion) {
+            return;
+        }
+
+        router.reload({ only: [...props, 'loadedReferenceVersion'] });
+    }, [referenceVersion, loadedReferenceVersion]);
+}
@@ -0,0 +1,60 @@
+import { toast } from 'sonner';
+
+const POLL_INTERVAL_MS = 2000;
+const MAX_WAIT_MS = 5 * 60 * 1000;
+
+interface PdfStatus {
+    status: 'ready' | 'pending';
+    url?: string;
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+/**
+ * Tải hoặc xem trước PDF báo cáo mà không để server render trong request:
+ * hỏi trạng thái bằng Accept: application/json, PDF chưa có thì server đưa vào hàng đợi (202)
+ * và client poll cho tới khi file cache sẵn sàng rồi mới mở URL tải.
+ */
+export async function exportPdf(url: string, mode: 'download' | 'preview' = 'download') {
+    // Mở tab ngay trong lúc click để trình duyệt không chặn popup
+    const preview = mode === 'preview' ? window.open('', '_blank') : null;
+    preview?.document.write('Đang tạo PDF...');
+
+    const startedAt = Date.now();
+    let notified = false;
+
+    try {
+        while (Date.now() - startedAt < MAX_WAIT_MS) {
+            const response = await fetch(url, {
+                headers: { Accept: 'application/json', 'X-Requested-With': 'XMLHttpRequest' },
+                credentials: 'same-origin',
+            });
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+
+            const result: PdfStatus = await response.json();
+            if (result.status === 'ready') {
+                const target = result.url || url;
+                if (preview) {
+                    preview.location.href = target;
+                } else {
+                    window.location.href = target;
+                }
+                return;
+            }
+
+            if (!notified) {
+                toast.info('Đang tạo PDF, file sẽ tự tải khi xong...');
+                notified = true;
+            }
+            await sleep(POLL_INTERVAL_MS);
+        }
+
+        throw new Error('quá thời gian chờ');
+    } catch (error) {
+        preview?.close();
+        console.error('PDF export error:', error);
+        toast.error('Không tạo được PDF, vui lòng thử lại sau');
+    }
+}
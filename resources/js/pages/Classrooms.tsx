@@ -6,7 +6,8 @@ import { Head, Link, useForm, usePage, router } from "@inertiajs/react";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
-import { Pagination } from '@/components/ui/pagination';
+import { CursorPagination } from '@/components/ui/pagination';
+import { useReferenceData, type ReferenceVersionProps } from '@/hooks/use-reference-data';
 import { toast, Toaster } from 'sonner';
 import { createClassroomColumns } from '@/components/columns/classroom-columns';
 import {
@@ -118,27 +119,35 @@ interface Classroom {
     teacher: Teacher | null;
 }
 
+// Phân trang cursor (keyset) của Laravel: không có tổng số và số trang
 interface PaginatedClassrooms {
     data: Classroom[];
-    current_page: number;
-    last_page: number;
+    path: string;
     per_page: number;
+    next_cursor: string | null;
+    next_page_url: string | null;
+    prev_cursor: string | null;
+    prev_page_url: string | null;
+}
+
+interface ClassroomCounts {
     total: number;
-    from: number;
-    to: number;
-    links: {
-        url?: string;
-        label: string;
-        active: boolean;
-    }[];
+    with_teacher: number;
 }
 
-interface ClassroomsPageProps {
+// Lọc và lật trang chỉ xin lại các prop này (partial reload), không gửi lại dữ liệu dropdown
+const LIST_PROPS = ['classrooms', 'classroomCounts', 'filters', 'referenceVersion'];
+const REFERENCE_PROPS = ['courses', 'teachers', 'semesters', 'academicYears'];
+
+interface ClassroomsPageProps extends ReferenceVersionProps {
     classrooms: PaginatedClassrooms;
+    // Deferred prop: tải sau khi trang đã hiển thị
+    classroomCounts?: ClassroomCounts;
     teachers: Teacher[];
     courses: Course[];
     semesters: Semester[];
     academicYears: AcademicYear[];
+    bulkMaxClasses: number;
     filters: {
         academic_year_id?: string;
         semester_id?: string;
@@ -148,12 +157,18 @@ interface ClassroomsPageProps {
 
 export default function Classrooms({
     classrooms,
+    classroomCounts,
     teachers,
     courses,
     semesters,
     academicYears,
-    filters = {}
+    bulkMaxClasses = 20,
+    filters = {},
+    referenceVersion,
+    loadedReferenceVersion,
 }: ClassroomsPageProps) {
+    useReferenceData(REFERENCE_PROPS, { referenceVersion, loadedReferenceVersion });
+
     const { props } = usePage();
     const user = (props as any).auth?.user;
     const isAdmin = user?.role === 'admin';
@@ -374,6 +389,7 @@ export default function Classrooms({
             route('classrooms.index');
 
         router.visit(url, {
+            only: LIST_PROPS,
             preserveState: true,
             preserveScroll: true,
         });
@@ -386,6 +402,7 @@ export default function Classrooms({
         setSearchTerm('');
 
         router.visit(route('classrooms.index'), {
+            only: LIST_PROPS,
             preserveState: true,
             preserveScroll: true,
         });
@@ -402,11 +419,9 @@ export default function Classrooms({
     };
 
     // Calculate stats for current filter
-    const totalClassrooms = Array.isArray(classrooms) ? classrooms.length : classrooms.total || 0;
-    const classroomsWithTeacher = Array.isArray(classrooms)
-        ? classrooms.filter(c => c.teacher_id).length
-        : classrooms.data?.filter(c => c.teacher_id).length || 0;
-    const classroomsWithoutTeacher = totalClassrooms - classroomsWithTeacher;
+    const totalClassrooms = classroomCounts ? classroomCounts.total : '…';
+    const classroomsWithTeacher = classroomCounts ? classroomCounts.with_teacher : '…';
+    const classroomsWithoutTeacher = classroomCounts ? classroomCounts.total - classroomCounts.with_teacher : '…';
 
     return (
         <AppLayout breadcrumbs={breadcrumbs}>
@@ -659,7 +674,7 @@ export default function Classrooms({
                                                 id="bulk-number_of_classes"
                                                 type="number"
                                                 min="1"
-                                                max="20"
+                                                max={bulkMaxClasses}
                                                 value={bulkData.number_of_classes}
                                                 onChange={(e) => setBulkData('number_of_classes', parseInt(e.target.value) || 1)}
                                                 className="w-full"
@@ -927,12 +942,12 @@ export default function Classrooms({
                                 Danh sách lớp học
                                 {hasActiveFilters && (
                                     <span className="text-sm font-normal text-muted-foreground ml-2">
-                                        ({classrooms.from}-{classrooms.to} / {totalClassrooms} - đã lọc)
+                                        ({totalClassrooms} - đã lọc)
                                     </span>
                                 )}
                                 {!hasActiveFilters && (
                                     <span className="text-sm font-normal text-muted-foreground ml-2">
-                                        ({classrooms.from}-{classrooms.to} / {totalClassrooms})
+                                        ({totalClassrooms})
                                     </span>
                                 )}
                             </CardTitle>
@@ -959,19 +974,14 @@ export default function Classrooms({
                         />
 
                         {/* Pagination */}
-                        {classrooms.links && (
-                            <div className="mt-6">
-                                <Pagination
-                                    links={classrooms.links.map(link => ({
-                                        ...link,
-                                        url: link.url ?? null
-                                    }))}
-                                    from={classrooms.from || 0}
-                                    to={classrooms.to || 0}
-                                    total={classrooms.total || 0}
-                                />
-                            </div>
-                        )}
+                        <div className="mt-6">
+                            <CursorPagination
+                                prevUrl={classrooms.prev_page_url}
+                                nextUrl={classrooms.next_page_url}
+                                count={classroomData.length}
+                                only={LIST_PROPS}
+                            />
+                        </div>
                     </CardContent>
                 </Card>
             </div>
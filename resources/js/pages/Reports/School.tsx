@@ -1,5 +1,7 @@
 import { Head } from '@inertiajs/react';
 import AppLayout from '@/layouts/app-layout';
+import { exportPdf } from '@/lib/pdf-export';
+import { Toaster } from 'sonner';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
@@ -123,6 +125,7 @@ export default function SchoolReport({
     return (
         <AppLayout breadcrumbs={breadcrumbs}>
             <Head title={`Báo cáo toàn trường - ${academicYear.name}`} />
+            <Toaster position="top-right" />
 
             <div className="container mx-auto px-6 py-8 space-y-8">
                 {/* Header */}
@@ -144,8 +147,7 @@ export default function SchoolReport({
                             <Button
                                 variant="outline"
                                 onClick={() => {
-                                    const url = `/reports/export-pdf?type=school&academic_year_id=${academicYear.id}`;
-                                    window.open(url, '_blank');
+                                    exportPdf(`/reports/export-pdf?type=school&academic_year_id=${academicYear.id}`, 'preview');
                                 }}
                             >
                                 <Eye className="w-4 h-4 mr-2" />
@@ -153,14 +155,22 @@ export default function SchoolReport({
                             </Button>
                             <Button
                                 onClick={() => {
-                                    const url = `/reports/export-pdf?type=school&academic_year_id=${academicYear.id}`;
-                                    window.location.href = url;
+                                    exportPdf(`/reports/export-pdf?type=school&academic_year_id=${academicYear.id}`);
                                 }}
                                 className="bg-red-600 hover:bg-red-700"
                             >
                                 <Download className="w-4 h-4 mr-2" />
                                 Tải PDF
                             </Button>
+                            <Button
+                                variant="outline"
+                                onClick={() => {
+                                    window.location.href = `/reports/export?type=school&academic_year_id=${academicYear.id}&format=xlsx`;
+                                }}
+                            >
+                                <Download className="w-4 h-4 mr-2" />
+                                Tải Excel
+                            </Button>
                         </div>
                     </div>
                 </div>
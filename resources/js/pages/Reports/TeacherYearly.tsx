@@ -2,6 +2,8 @@
 
 import { Head } from '@inertiajs/react';
 import AppLayout from '@/layouts/app-layout';
+import { exportPdf } from '@/lib/pdf-export';
+import { Toaster } from 'sonner';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
@@ -134,6 +136,7 @@ export default function TeacherYearly({
     return (
         <AppLayout breadcrumbs={breadcrumbs}>
             <Head title={`Báo cáo cá nhân - ${teacher?.fullName || 'N/A'}`} />
+            <Toaster position="top-right" />
 
             <div className="container mx-auto px-6 py-8 space-y-8">
                 {/* Header */}
@@ -155,8 +158,7 @@ export default function TeacherYearly({
                             <Button
                                 variant="outline"
                                 onClick={() => {
-                                    const url = `/reports/export-pdf?type=teacher&teacher_id=${teacher?.id}&academic_year_id=${academicYear?.id}`;
-                                    window.open(url, '_blank');
+                                    exportPdf(`/reports/export-pdf?type=teacher&teacher_id=${teacher?.id}&academic_year_id=${academicYear?.id}`, 'preview');
                                 }}
                             >
                                 <Eye className="w-4 h-4 mr-2" />
@@ -164,8 +166,7 @@ export default function TeacherYearly({
                             </Button>
                             <Button
                                 onClick={() => {
-                                    const url = `/reports/export-pdf?type=teacher&teacher_id=${teacher?.id}&academic_year_id=${academicYear?.id}`;
-                                    window.location.href = url;
+                                    exportPdf(`/reports/export-pdf?type=teacher&teacher_id=${teacher?.id}&academic_year_id=${academicYear?.id}`);
                                 }}
                                 className="bg-red-600 hover:bg-red-700"
                             >
@@ -1,6 +1,7 @@
-import React, { useState, useMemo } from 'react';
+import React, { useState, useMemo, useEffect, useRef } from 'react';
 import { Head, useForm, router } from '@inertiajs/react';
 import AppLayout from '@/layouts/app-layout';
+import { exportPdf } from '@/lib/pdf-export';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
@@ -68,6 +69,13 @@ interface SalaryConfig {
     created_at: string;
 }
 
+interface CalculationProgress {
+    status: 'idle' | 'queued' | 'running' | 'completed' | 'failed';
+    processed: number;
+    total: number | null;
+    message?: string | null;
+}
+
 interface Props {
     salaryConfigs: {
         data: SalaryConfig[];
@@ -78,10 +86,67 @@ interface Props {
         total: number;
     };
     semesters: Semester[];
+    // Lần tính đang chạy lúc tải trang (reload, quay lại trang) theo id cấu hình
+    calculations: Record<number, CalculationProgress>;
 }
 
-export default function SalaryIndex({ salaryConfigs, semesters }: Props) {
+export default function SalaryIndex({ salaryConfigs, semesters, calculations: runningCalculations }: Props) {
     const [createDialogOpen, setCreateDialogOpen] = useState(false);
+    // Tiến độ các lần tính lương đang chạy trong hàng đợi, theo id cấu hình
+    const [calculations, setCalculations] = useState<Record<number, CalculationProgress>>({});
+    const pollers = useRef<Record<number, ReturnType<typeof setInterval>>>({});
+
+    useEffect(() => {
+        // Tiếp tục theo dõi các lần tính đã chạy trước khi mở trang
+        salaryConfigs.data
+            .filter(config => runningCalculations?.[config.id])
+            .forEach(config => pollCalculation(config, runningCalculations[config.id]));
+
+        return () => Object.values(pollers.current).forEach(clearInterval);
+    }, []);
+
+    const stopPolling = (id: number) => {
+        clearInterval(pollers.current[id]);
+        delete pollers.current[id];
+        setCalculations(prev => {
+            const next = { ...prev };
+            delete next[id];
+            return next;
+        });
+    };
+
+    // Poll tiến độ job tính lương cho tới khi xong hoặc lỗi
+    const pollCalculation = (
+        salaryConfig: SalaryConfig,
+        initial: CalculationProgress = { status: 'queued', processed: 0, total: null },
+    ) => {
+        if (pollers.current[salaryConfig.id]) return;
+
+        setCalculations(prev => ({ ...prev, [salaryConfig.id]: initial }));
+        pollers.current[salaryConfig.id] = setInterval(async () => {
+            try {
+                const response = await fetch(route('salary.calculation-status', salaryConfig.id), {
+                    headers: { Accept: 'application/json' },
+                    credentials: 'same-origin',
+                });
+                const progress: CalculationProgress = await response.json();
+
+                if (progress.status === 'completed') {
+                    stopPolling(salaryConfig.id);
+                    toast.success(progress.message || 'Tính lương thành công!');
+                    router.visit(route('salary.report', salaryConfig.id));
+                } else if (progress.status === 'failed') {
+                    stopPolling(salaryConfig.id);
+                    toast.error(progress.message || 'Tính lương thất bại');
+                    router.reload({ only: ['salaryConfigs'] });
+                } else {
+                    setCalculations(prev => ({ ...prev, [salaryConfig.id]: progress }));
+                }
+            } catch (error) {
+                console.error('Calculation status error:', error);
+            }
+        }, 2000);
+    };
 
     const { data, setData, post, processing, errors, reset } = useForm({
         semester_id: '',
@@ -138,8 +203,10 @@ export default function SalaryIndex({ salaryConfigs, semesters }: Props) {
         const semesterName = salaryConfig.semester?.name || 'N/A';
         if (confirm(`Bạn có chắc muốn tính lương cho học kỳ ${semesterName}?\n\nHệ thống sẽ tính lương cho tất cả lớp học có giáo viên trong học kỳ này.`)) {
             router.post(route('salary.calculate', salaryConfig.id), {}, {
+                preserveScroll: true,
                 onSuccess: () => {
-                    toast.success('Tính lương thành công!');
+                    toast.info('Đã đưa việc tính lương vào hàng đợi');
+                    pollCalculation(salaryConfig);
                 },
                 onError: (errors) => {
                     console.error('Calculation errors:', errors);
@@ -165,8 +232,10 @@ export default function SalaryIndex({ salaryConfigs, semesters }: Props) {
             `Bạn có chắc chắn muốn tiếp tục?`
         )) {
             router.post(route('salary.calculate', salaryConfig.id), {}, {
+                preserveScroll: true,
                 onSuccess: () => {
-                    toast.success('Tính lại lương thành công!');
+                    toast.info('Đã đưa việc tính lại lương vào hàng đợi');
+                    pollCalculation(salaryConfig);
                 },
                 onError: (errors) => {
                     if (errors.status) {
@@ -410,6 +479,13 @@ export default function SalaryIndex({ salaryConfigs, semesters }: Props) {
                                                 </TableCell>
                                                 <TableCell>
                                                     {getStatusBadge(config.status)}
+                                                    {calculations[config.id] && (
+                                                        <div className="text-xs text-muted-foreground mt-1">
+                                                            {calculations[config.id].status === 'queued'
+                                                                ? 'Đang chờ tính...'
+                                                                : `Đang tính ${calculations[config.id].processed}/${calculations[config.id].total ?? '?'} lớp`}
+                                                        </div>
+                                                    )}
                                                 </TableCell>
                                                 <TableCell>
                                                     {new Date(config.created_at).toLocaleDateString('vi-VN')}
@@ -420,6 +496,7 @@ export default function SalaryIndex({ salaryConfigs, semesters }: Props) {
                                                             <Button
                                                                 size="sm"
                                                                 onClick={() => handleCalculate(config)}
+                                                                disabled={!!calculations[config.id]}
                                                                 className="bg-blue-600 hover:bg-blue-700"
                                                             >
                                                                 <Calculator className="w-4 h-4 mr-1" />
@@ -448,17 +525,29 @@ export default function SalaryIndex({ salaryConfigs, semesters }: Props) {
                                                                     </DropdownMenuTrigger>
                                                                     <DropdownMenuContent align="end">
                                                                         <DropdownMenuItem
-                                                                            onClick={() => window.open(route('salary.preview-pdf', config.id), '_blank')}
+                                                                            onClick={() => exportPdf(route('salary.preview-pdf', config.id), 'preview')}
                                                                         >
                                                                             <Eye className="w-4 h-4 mr-2" />
                                                                             Xem trước PDF
                                                                         </DropdownMenuItem>
                                                                         <DropdownMenuItem
-                                                                            onClick={() => window.location.href = route('salary.export-pdf', config.id)}
+                                                                            onClick={() => exportPdf(route('salary.export-pdf', config.id))}
                                                                         >
                                                                             <Download className="w-4 h-4 mr-2" />
                                                                             Tải PDF
                                                                         </DropdownMenuItem>
+                                                                        <DropdownMenuItem
+                                                                            onClick={() => window.location.href = route('salary.export', { salaryConfig: config.id, format: 'csv' })}
+                                                                        >
+                                                                            <Download className="w-4 h-4 mr-2" />
+                                                                            Tải CSV
+                                                                        </DropdownMenuItem>
+                                                                        <DropdownMenuItem
+                                                                            onClick={() => window.location.href = route('salary.export', { salaryConfig: config.id, format: 'xlsx' })}
+                                                                        >
+                                                                            <Download className="w-4 h-4 mr-2" />
+                                                                            Tải Excel (XLSX)
+                                                                        </DropdownMenuItem>
                                                                     </DropdownMenuContent>
                                                                 </DropdownMenu>
                                                             </>
@@ -470,6 +559,7 @@ export default function SalaryIndex({ salaryConfigs, semesters }: Props) {
                                                                 size="sm"
                                                                 variant="outline"
                                                                 onClick={() => handleRecalculate(config)}
+                                                                disabled={!!calculations[config.id]}
                                                                 className="border-orange-500 text-orange-600 hover:bg-orange-50"
                                                             >
                                                                 <RefreshCw className="w-4 h-4 mr-1" />
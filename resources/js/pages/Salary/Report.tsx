@@ -1,6 +1,8 @@
 import React from 'react';
 import { Head } from '@inertiajs/react';
 import AppLayout from '@/layouts/app-layout';
+import { exportPdf } from '@/lib/pdf-export';
+import { Toaster } from 'sonner';
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card';
 import { Badge } from '@/components/ui/badge';
 import {
@@ -124,6 +126,7 @@ export default function SalaryReport({ salaryConfig, salaryReport }: Props) {
     return (
         <AppLayout breadcrumbs={breadcrumbs}>
             <Head title={`Báo cáo lương - ${salaryConfig.semester?.name || 'NA'}`} />
+            <Toaster position="top-right" />
 
             <div className="container mx-auto px-6 py-8 space-y-8">
                 {/* Header */}
@@ -153,13 +156,13 @@ export default function SalaryReport({ salaryConfig, salaryReport }: Props) {
                             <div className="flex gap-2">
                                 <Button
                                     variant="outline"
-                                    onClick={() => window.open(route('salary.preview-pdf', salaryConfig.id), '_blank')}
+                                    onClick={() => exportPdf(route('salary.preview-pdf', salaryConfig.id), 'preview')}
                                 >
                                     <Eye className="w-4 h-4 mr-2" />
                                     Xem trước PDF
                                 </Button>
                                 <Button
-                                    onClick={() => window.location.href = route('salary.export-pdf', salaryConfig.id)}
+                                    onClick={() => exportPdf(route('salary.export-pdf', salaryConfig.id))}
                                     className="bg-red-600 hover:bg-red-700"
                                 >
                                     <Download className="w-4 h-4 mr-2" />
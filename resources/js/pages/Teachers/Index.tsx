@@ -12,6 +12,7 @@ import { toast } from 'sonner';
 import { Input } from "@/components/ui/input"
 import { Label } from "@/components/ui/label"
 import { Pagination } from '@/components/ui/pagination';
+import { useReferenceData, type ReferenceVersionProps } from '@/hooks/use-reference-data';
 
 import {
     Sheet,
@@ -80,7 +81,11 @@ interface Teacher {
     updatedAt: Date,
 }
 
-interface CustomPageProps {
+// Lật trang chỉ xin lại danh sách giáo viên, bằng cấp/khoa giữ nguyên (partial reload)
+const LIST_PROPS = ['teachers', 'referenceVersion'];
+const REFERENCE_PROPS = ['degrees', 'departments'];
+
+interface CustomPageProps extends ReferenceVersionProps {
     teachers: {
         data: Teacher[];
         links: {
@@ -103,7 +108,8 @@ interface CustomPageProps {
     };
 }
 
-export default function Index({ teachers, degrees, departments }: CustomPageProps) {
+export default function Index({ teachers, degrees, departments, referenceVersion, loadedReferenceVersion }: CustomPageProps) {
+    useReferenceData(REFERENCE_PROPS, { referenceVersion, loadedReferenceVersion });
     const page = usePage<PageProps>();
     const flash = page.props?.flash as CustomPageProps['flash'];
 
@@ -631,6 +637,7 @@ export default function Index({ teachers, degrees, departments }: CustomPageProp
                     from={teachers.from}
                     to={teachers.to}
                     total={teachers.total}
+                    only={LIST_PROPS}
                 />
             </div>
 
@@ -2,6 +2,8 @@
 
 import React from 'react';
 import AppLayout from '@/layouts/app-layout';
+import { exportPdf } from '@/lib/pdf-export';
+import { Toaster } from 'sonner';
 import { type BreadcrumbItem } from '@/types';
 import { Head, Link } from '@inertiajs/react';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
@@ -59,6 +61,7 @@ export default function TeacherReportsIndex({ teacher, academicYears }: Props) {
     return (
         <AppLayout breadcrumbs={breadcrumbs}>
             <Head title="Báo cáo lương - Giảng viên" />
+            <Toaster position="top-right" />
             
             <div className="space-y-6 p-4">
                 {/* Header */}
@@ -161,14 +164,12 @@ export default function TeacherReportsIndex({ teacher, academicYears }: Props) {
                                                     </Link>
                                                 </Button>
                                                 <Button 
-                                                    asChild 
                                                     size="sm"
                                                     className="flex-1 bg-red-600 hover:bg-red-700"
+                                                    onClick={() => exportPdf(`/teacher/reports/${academicYear.id}/pdf`)}
                                                 >
-                                                    <Link href={`/teacher/reports/${academicYear.id}/pdf`}>
-                                                        <Download className="w-4 h-4 mr-2" />
-                                                        Tải PDF
-                                                    </Link>
+                                                    <Download className="w-4 h-4 mr-2" />
+                                                    Tải PDF
                                                 </Button>
                                             </div>
                                         </CardContent>
@@ -2,6 +2,8 @@
 
 import React from 'react';
 import AppLayout from '@/layouts/app-layout';
+import { exportPdf } from '@/lib/pdf-export';
+import { Toaster } from 'sonner';
 import { type BreadcrumbItem } from '@/types';
 import { Head, Link } from '@inertiajs/react';
 import { Card, CardContent, CardHeader, CardTitle, CardDescription } from '@/components/ui/card';
@@ -133,6 +135,7 @@ export default function TeacherYearlyReport({ teacher, academicYear, salaryData,
     return (
         <AppLayout breadcrumbs={breadcrumbs}>
             <Head title={`Báo cáo lương ${academicYear?.name || 'N/A'} - ${teacher?.fullName || 'N/A'}`} />
+            <Toaster position="top-right" />
             
             <div className="space-y-6 p-4">
                 {/* Header */}
@@ -158,8 +161,7 @@ export default function TeacherYearlyReport({ teacher, academicYear, salaryData,
                         <Button
                             variant="outline"
                             onClick={() => {
-                                const url = `/teacher/reports/${academicYear?.id}/pdf`;
-                                window.open(url, '_blank');
+                                exportPdf(`/teacher/reports/${academicYear?.id}/pdf`, 'preview');
                             }}
                         >
                             <Eye className="w-4 h-4 mr-2" />
@@ -167,8 +169,7 @@ export default function TeacherYearlyReport({ teacher, academicYear, salaryData,
                         </Button>
                         <Button
                             onClick={() => {
-                                const url = `/teacher/reports/${academicYear?.id}/pdf`;
-                                window.location.href = url;
+                                exportPdf(`/teacher/reports/${academicYear?.id}/pdf`);
                             }}
                             className="bg-red-600 hover:bg-red-700"
                         >
@@ -1,8 +1,28 @@
 <?php
 
+use App\Models\SalaryConfig;
+use App\Services\ClassroomSearchService;
+use App\Services\SalaryAggregateService;
 use Illuminate\Foundation\Inspiring;
 use Illuminate\Support\Facades\Artisan;
 
 Artisan::command('inspire', function () {
     $this->comment(Inspiring::quote());
 })->purpose('Display an inspiring quote');
+
+Artisan::command('salary:aggregate {salaryConfig? : ID cấu hình lương, bỏ trống = tất cả}', function (SalaryAggregateService $aggregates, $salaryConfig = null) {
+    $configs = SalaryConfig::with('semester')
+        ->whereIn('status', ['active', 'closed'])
+        ->when($salaryConfig, fn ($query) => $query->where('id', $salaryConfig))
+        ->get();
+
+    foreach ($configs as $config) {
+        $aggregates->refresh($config);
+        $this->info("Đã tổng hợp lương học kỳ {$config->semester->name} (#{$config->id})");
+    }
+})->purpose('Build salary_aggregates from teacher_salaries (closed configs are only built once)');
+
+Artisan::command('classrooms:search-index', function (ClassroomSearchService $search) {
+    $count = $search->reindexAll();
+    $this->info("Đã dựng lại từ khoá tìm kiếm cho {$count} lớp học");
+})->purpose('Rebuild classroom_search_tokens from classrooms, courses and teachers');
@@ -12,6 +12,8 @@
 use App\Http\Controllers\ClassroomController;
 use App\Http\Controllers\SalaryController;
 use App\Http\Controllers\ReportController;
+use App\Http\Controllers\ImportController;
+use App\Services\CsvImportService;
 
 
 Route::get('/', function () {
@@ -40,15 +42,24 @@
         Route::get('/salary', [SalaryController::class, 'index'])->name('salary.index');
         Route::post('/salary', [SalaryController::class, 'store'])->name('salary.store');
         Route::post('/salary/{salaryConfig}/calculate', [SalaryController::class, 'calculate'])->name('salary.calculate');
+        Route::get('/salary/{salaryConfig}/calculation', [SalaryController::class, 'calculationStatus'])->name('salary.calculation-status');
         Route::get('/salary/{salaryConfig}/report', [SalaryController::class, 'report'])->name('salary.report');
         Route::patch('/salary/{salaryConfig}/close', [SalaryController::class, 'close'])->name('salary.close');
         Route::put('/courses/{course}', [CourseController::class, 'update'])->name('courses.update');
 
         Route::get('/salary/{salaryConfig}/export-pdf', [SalaryController::class, 'exportPdf'])
             ->name('salary.export-pdf');
+
+        Route::get('/salary/{salaryConfig}/export', [SalaryController::class, 'exportData'])
+            ->name('salary.export');
             
         Route::get('/salary/{salaryConfig}/preview-pdf', [SalaryController::class, 'previewPdf'])
             ->name('salary.preview-pdf');
+
+        // Nhập CSV hàng loạt (teachers | courses | classrooms), dùng với selenium/importCsv.py
+        Route::post('/import/{type}', [ImportController::class, 'store'])
+            ->whereIn('type', CsvImportService::TYPES)
+            ->name('import.store');
     });
     // FIX: Teacher routes - Thêm routes mới cho giáo viên
     Route::middleware('role:teacher')->prefix('teacher')->name('teacher.')->group(function () {
@@ -104,6 +115,9 @@
             
             // Export PDFs
             Route::get('/export-pdf', [ReportController::class, 'exportPdf'])->name('export-pdf');
+
+            // Export CSV/XLSX
+            Route::get('/export', [ReportController::class, 'exportData'])->name('export');
         });
     });
 });
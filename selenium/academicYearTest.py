@@ -1,7 +1,4 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -9,20 +6,13 @@ import time
 import random
 import traceback
 from datetime import datetime
+import sessionCache
+from driverPool import create_driver
+from testCases import http_entries
 
 # ========== Setup ==========
-def create_driver():
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    return webdriver.Chrome(options=options)
-
 def login(driver):
-    driver.get("http://localhost:8000/login")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
-    driver.find_element(By.ID, "email").send_keys("alex@alex.com")
-    driver.find_element(By.ID, "password").send_keys("12345678" + Keys.ENTER)
-    WebDriverWait(driver, 10).until(EC.url_contains("/dashboard"))
+    sessionCache.login(driver)
 
 def open_academic_year_form(driver):
     driver.get("http://localhost:8000/academicyears")
@@ -134,6 +124,10 @@ def test_valid_input(driver):
         EC.presence_of_element_located((By.XPATH, f"//*[contains(text(),'{name}')]"))
     )
 
+# ========== Case HTTP (httpRunner.py) ==========
+# Các case validate khai báo trong testCases.py, chạy thẳng qua request Inertia
+HTTP_CASES = http_entries("academic_year")
+
 # ========== Main ==========
 if __name__ == "__main__":
     driver = create_driver()
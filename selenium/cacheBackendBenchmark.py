@@ -0,0 +1,157 @@
+# So sánh độ trễ request giữa các backend cache/session (database, file, apc, redis).
+#
+# Với mỗi backend, script chạy `php artisan serve --no-reload` trên một cổng
+# riêng với CACHE_STORE / SESSION_DRIVER ghi đè qua biến môi trường (giá trị
+# trong .env giữ nguyên), đăng nhập rồi gửi tuần tự các request Inertia tới
+# từng route và ghi p50/p95. Backend đầu tiên là mốc so sánh.
+# apc cần extension APCu; redis cần Redis/Valkey chạy ở REDIS_HOST:REDIS_PORT.
+#
+#   python cacheBackendBenchmark.py
+#   python cacheBackendBenchmark.py --backends database file redis --requests 100 --output cache-bench.json
+
+from datetime import datetime
+import argparse
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+from httpRunner import InertiaSession
+from loadTest import percentile
+from salaryBenchmark import ROOT
+
+# Biến môi trường ghi đè cho từng backend; lock/tiến độ tính lương luôn ở store chung
+BACKENDS = {
+    "database": {"CACHE_STORE": "database", "SESSION_DRIVER": "database"},
+    "file": {"CACHE_STORE": "file", "SESSION_DRIVER": "file"},
+    "apc": {"CACHE_STORE": "apc", "SESSION_DRIVER": "apc", "CACHE_SHARED_STORE": "database"},
+    "redis": {"CACHE_STORE": "redis", "SESSION_DRIVER": "redis"},
+}
+ROUTES = ["/dashboard", "/teachers", "/classrooms"]
+BASE_PORT = 8100
+
+# ========== Server ==========
+def start_server(backend, port, ready_timeout, env=None):
+    # env: biến môi trường ghi đè, mặc định theo BACKENDS[backend] (queryPlanCheck dùng bộ riêng)
+    env = {**os.environ, **(BACKENDS[backend] if env is None else env)}
+    process = subprocess.Popen(
+        ["php", "artisan", "serve", "--host=127.0.0.1", f"--port={port}", "--no-reload"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        # artisan serve chạy php -S ở tiến trình con, tách nhóm để dừng được cả hai
+        start_new_session=os.name == "posix",
+    )
+    # Cùng host với APP_URL (localhost) để cookie phiên lưu trong sessionCache dùng lại được
+    url = f"http://localhost:{port}"
+    deadline = time.perf_counter() + ready_timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"php artisan serve ({backend}) thoát với mã {process.returncode}")
+        try:
+            if httpx.get(f"{url}/login", timeout=2).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    stop_server(process)
+    raise RuntimeError(f"server {backend} không phản hồi sau {ready_timeout}s")
+
+def stop_server(process):
+    if process.poll() is not None:
+        return
+    if os.name == "posix":
+        os.killpg(process.pid, signal.SIGTERM)
+    else:
+        process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+# ========== Đo ==========
+def measure_backend(backend, url, args):
+    client = httpx.Client(base_url=url, timeout=args.timeout, follow_redirects=True)
+    session = InertiaSession(f"backend-{backend}", client=client)
+    session.login()
+    rows = []
+    try:
+        for route in args.routes:
+            timings, errors = [], 0
+            for i in range(args.warmup + args.requests):
+                started = time.perf_counter()
+                response = client.get(route, headers=session.headers())
+                elapsed = time.perf_counter() - started
+                if response.status_code != 200 or response.headers.get("X-Inertia") != "true":
+                    errors += 1
+                elif i >= args.warmup:
+                    timings.append(elapsed * 1000)
+            timings.sort()
+            rows.append({
+                "route": route,
+                "requests": len(timings),
+                "errors": errors,
+                "p50_ms": round(percentile(timings, 50), 1),
+                "p95_ms": round(percentile(timings, 95), 1),
+                "mean_ms": round(statistics.mean(timings), 1) if timings else 0.0,
+            })
+    finally:
+        session.close()
+    return rows
+
+def print_results(results):
+    baseline = next((rows for rows in results.values() if rows), None)
+    for backend, rows in results.items():
+        if not rows:
+            continue
+        print(f"\n▶️ {backend}")
+        for row, base in zip(rows, baseline):
+            speedup = base["p50_ms"] / row["p50_ms"] if row["p50_ms"] else 0
+            print(f"   {row['route']:<14} p50 {row['p50_ms']:>8.1f} ms   p95 {row['p95_ms']:>8.1f} ms   "
+                  f"x{speedup:.2f}   lỗi {row['errors']}")
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="So sánh độ trễ request giữa các backend cache/session")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=["database", "file"])
+    parser.add_argument("--routes", nargs="+", default=ROUTES)
+    parser.add_argument("--requests", type=int, default=50, help="Số request đo cho mỗi route")
+    parser.add_argument("--warmup", type=int, default=5, help="Số request làm nóng (không tính)")
+    parser.add_argument("--port", type=int, default=BASE_PORT, help="Cổng đầu tiên, mỗi backend một cổng")
+    parser.add_argument("--ready-timeout", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--output", default=None, help="Ghi kết quả ra file JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results, failures = {}, {}
+    for offset, backend in enumerate(args.backends):
+        try:
+            process, url = start_server(backend, args.port + offset, args.ready_timeout)
+        except RuntimeError as e:
+            print(f"   ❌ {backend}: {e}")
+            failures[backend] = str(e)
+            results[backend] = []
+            continue
+        try:
+            results[backend] = measure_backend(backend, url, args)
+        except (RuntimeError, httpx.HTTPError) as e:
+            print(f"   ❌ {backend}: {e}")
+            failures[backend] = str(e)
+            results[backend] = []
+        finally:
+            stop_server(process)
+
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"started_at": datetime.now().isoformat(timespec="seconds"), "results": results,
+                       "failures": failures}, f, ensure_ascii=False, indent=2)
+        print(f"\n📄 Kết quả JSON: {args.output}")
+    errors = any(row["errors"] for rows in results.values() for row in rows)
+    return 1 if failures or errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,29 +1,26 @@
-from selenium import webdriver
-import time  # cần để dùng time.sleep
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import os
 import traceback
 import random
+import time
 from datetime import datetime
+import sessionCache
+import salaryBenchmark
+from formHelpers import set_values, click_and_wait
+from driverPool import create_driver
+from testCases import http_entries
 
-# ========== Setup ==========
-def create_driver():
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    return webdriver.Chrome(options=options)
+# Lô lớn cho admin (tối đa 500 lớp) và thời gian tối đa cho một lần tạo
+LARGE_BATCH = int(os.environ.get("CLASSROOM_LARGE_BATCH", "200"))
+LARGE_BATCH_MAX_SECONDS = float(os.environ.get("CLASSROOM_LARGE_BATCH_MAX_SECONDS", "10"))
 
+# ========== Setup ==========
 def login(driver):
     print("Đăng nhập...")
-    driver.get("http://localhost:8000/login")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
-    driver.find_element(By.ID, "email").send_keys("alex@alex.com")
-    driver.find_element(By.ID, "password").send_keys("12345678" + Keys.ENTER)
-    WebDriverWait(driver, 10).until(EC.url_contains("/dashboard"))
+    sessionCache.login(driver)
     print("✅ Đăng nhập thành công")
 
 def open_classroom_form(driver):
@@ -42,21 +39,16 @@ def fill_classroom_form(driver, name, students=0):
         driver.find_element(By.ID, "name").clear()
         driver.find_element(By.ID, "name").send_keys(name)
 
+    # Chọn option thứ 10 (hoặc option cuối) của cả ba dropdown trong một lần gọi JS
     dropdown_ids = ["semester_id", "course_id", "teacher_id"]
     for dropdown_id in dropdown_ids:
-        element = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.ID, dropdown_id)))
-        element.click()
-        for _ in range(10):
-            element.send_keys(Keys.DOWN)
-            time.sleep(0.1)
-        element.send_keys(Keys.ENTER)
-
-    students_input = driver.find_element(By.ID, "students")
-    students_input.clear()
-    students_input.send_keys(str(students))
+        WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.ID, dropdown_id)))
+    values = {dropdown_id: {"index": 10} for dropdown_id in dropdown_ids}
+    values["students"] = students
+    set_values(driver, values)
 
     submit_btn = driver.find_element(By.XPATH, "//button[contains(.,'Thêm mới')]")
-    driver.execute_script("arguments[0].click();", submit_btn)
+    click_and_wait(driver, submit_btn, timeout=5)
 
 def open_batch_classroom_form(driver):
     print("Mở form Thêm lớp học hàng loạt...")
@@ -69,49 +61,27 @@ def open_batch_classroom_form(driver):
         EC.visibility_of_element_located((By.XPATH, "//h2[contains(.,'Thêm lớp học hàng loạt')]"))
     )
 
-def fill_batch_classroom_form(driver, prefix, count=1, students_per_class=30):
+def fill_batch_classroom_form(driver, prefix, count=1, students_per_class=30, timeout=5):
     # Tên ID của các dropdown <select>
     select_ids = ["bulk-course_id", "bulk-semester_id", "bulk-teacher_id"]
-
     for select_id in select_ids:
-        select_elem = WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, select_id)))
-        options = select_elem.find_elements(By.TAG_NAME, "option")
-        if len(options) > 1:
-            last_value = options[-1].get_attribute("value")
-            driver.execute_script(f"""
-                const el = document.getElementById('{select_id}');
-                el.value = '{last_value}';
-                el.dispatchEvent(new Event('input', {{ bubbles: true }}));
-                el.dispatchEvent(new Event('change', {{ bubbles: true }}));
-            """)
-            time.sleep(0.2)
-
-    # Nhập số lượng lớp học
-    driver.execute_script("""
-        const el = document.getElementById('bulk-number_of_classes');
-        el.value = arguments[0];
-        el.dispatchEvent(new Event('input', { bubbles: true }));
-    """, str(count))
-
-    # Nhập số học sinh mỗi lớp
-    driver.execute_script("""
-        const el = document.getElementById('bulk-students_per_class');
-        el.value = arguments[0];
-        el.dispatchEvent(new Event('input', { bubbles: true }));
-    """, str(students_per_class))
-
-    # Nhập tiền tố tên lớp
-    driver.execute_script("""
-        const el = document.getElementById('bulk-class_name_prefix');
-        el.value = arguments[0];
-        el.dispatchEvent(new Event('input', { bubbles: true }));
-    """, prefix)
-
-    # Click nút "Tạo 1 lớp học"
+        WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, select_id)))
+
+    # Chọn option cuối của mỗi dropdown, nhập số lớp, số học sinh và tiền tố tên lớp
+    values = {select_id: {"last": True} for select_id in select_ids}
+    values["bulk-number_of_classes"] = count
+    values["bulk-students_per_class"] = students_per_class
+    # Tiền tố phải gán sau course_id vì form tự sinh tiền tố khi đổi môn học
+    set_values(driver, values)
+    set_values(driver, {"bulk-class_name_prefix": prefix})
+
+    # Click nút "Tạo N lớp học", trả về thời gian từ lúc bấm tới khi Inertia xử lý xong response
     submit_btn = WebDriverWait(driver, 10).until(EC.element_to_be_clickable(
-        (By.XPATH, "//button[@type='submit' and @form='bulk-classroom-form' and contains(text(), 'Tạo 1 lớp học')]")
+        (By.XPATH, f"//button[@type='submit' and @form='bulk-classroom-form' and contains(text(), 'Tạo {count} lớp học')]")
     ))
-    driver.execute_script("arguments[0].click();", submit_btn)
+    started = time.perf_counter()
+    click_and_wait(driver, submit_btn, timeout=timeout)
+    return time.perf_counter() - started
 
 
 # ========== Check ==========
@@ -184,19 +154,55 @@ def test_invalid_students_batch(driver):
 def test_valid_batch_classroom(driver):
     open_batch_classroom_form(driver)
     prefix = f"TEST{random.randint(1000,9999)}"
+    # fill_batch_classroom_form đã chờ Inertia redirect về danh sách lớp xong
     fill_batch_classroom_form(driver, prefix=prefix, count=1, students_per_class=25)
 
-    # Chờ quá trình xử lý (nếu có loading)
-    time.sleep(1)
-
-    # Làm mới trang để đảm bảo hiển thị lớp mới tạo
-    driver.refresh()
-
     # Đợi bảng lớp học render lại
     WebDriverWait(driver, 10).until(
         EC.presence_of_element_located((By.XPATH, f"//*[contains(text(),'{prefix}')]"))
     )
 
+def count_batch_classrooms(prefix):
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    try:
+        rows = db.execute("SELECT code FROM classrooms WHERE name LIKE ?", (f"{prefix} N%",)).fetchall()
+        return [code for (code,) in rows]
+    finally:
+        db.close()
+
+def delete_batch_classrooms(prefix):
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    try:
+        db.execute("DELETE FROM classrooms WHERE name LIKE ?", (f"{prefix} N%",))
+        db.commit()
+    finally:
+        db.close()
+
+def timed_batch_classroom(driver, count):
+    open_batch_classroom_form(driver)
+    prefix = f"BULK{random.randint(1000,9999)}"
+    try:
+        elapsed = fill_batch_classroom_form(driver, prefix=prefix, count=count, students_per_class=40,
+                                            timeout=max(LARGE_BATCH_MAX_SECONDS * 3, 30))
+        codes = count_batch_classrooms(prefix)
+        print(f"⏱️ Tạo {count} lớp: {elapsed:.2f}s")
+        assert len(codes) == count, f"tạo được {len(codes)}/{count} lớp"
+        assert len(set(codes)) == count, "mã lớp bị trùng trong lô"
+        return elapsed
+    finally:
+        delete_batch_classrooms(prefix)
+
+def test_large_batch_classroom(driver):
+    # Lô nhỏ làm mốc: lô lớn một insert nên không được chậm theo số lớp như vòng lặp cũ
+    small = timed_batch_classroom(driver, 5)
+    large = timed_batch_classroom(driver, LARGE_BATCH)
+    assert large <= LARGE_BATCH_MAX_SECONDS, f"tạo {LARGE_BATCH} lớp mất {large:.2f}s (> {LARGE_BATCH_MAX_SECONDS}s)"
+    print(f"   x{large / small:.1f} thời gian cho x{LARGE_BATCH / 5:.0f} số lớp")
+
+
+# ========== Case HTTP (httpRunner.py) ==========
+# Các case validate khai báo trong testCases.py, chạy thẳng qua request Inertia
+HTTP_CASES = http_entries("classroom") + http_entries("classroom_bulk")
 
 # ========== Main ==========
 if __name__ == "__main__":
@@ -210,6 +216,7 @@ if __name__ == "__main__":
         run_test("Thiếu tiền tố tên lớp (batch)", driver, test_missing_prefix_batch)
         run_test("Số học sinh mỗi lớp không hợp lệ (batch)", driver, test_invalid_students_batch)
         run_test("Thêm lớp học hàng loạt hợp lệ", driver, test_valid_batch_classroom)
+        run_test(f"Thêm {LARGE_BATCH} lớp học hàng loạt (đo thời gian)", driver, test_large_batch_classroom)
     finally:
         driver.quit()
 
@@ -0,0 +1,74 @@
+# Tạo môn học song song: mã tự sinh (CS001, CS002...) không bị trùng.
+#
+# Mỗi luồng dùng một phiên đăng nhập riêng và gửi POST /courses cùng lúc.
+# Sau đó đọc DB: mọi môn đều phải được tạo và mã của chúng đôi một khác nhau
+# (trước đây hai request đồng thời có thể cùng đọc mã lớn nhất và cấp trùng).
+#
+#   python codeConcurrencyTest.py
+#   CODE_TEST_WORKERS=16 CODE_TEST_CREATES=200 python codeConcurrencyTest.py
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import threading
+import uuid
+import salaryBenchmark
+from httpRunner import InertiaSession
+
+WORKERS = int(os.environ.get("CODE_TEST_WORKERS", "8"))
+CREATES = int(os.environ.get("CODE_TEST_CREATES", "40"))
+
+_local = threading.local()
+_sessions = []
+_slot_lock = threading.Lock()
+
+# ========== Helpers ==========
+def _session():
+    session = getattr(_local, "session", None)
+    if session is None:
+        with _slot_lock:
+            session = InertiaSession(f"codes-{len(_sessions)}")
+            _sessions.append(session)
+        session.login()
+        _local.session = session
+    return session
+
+def create_course(name, department_id):
+    page = _session().visit("POST", "/courses", {
+        "name": name, "credits": 3, "lessons": 45, "department_id": department_id, "course_coefficient": 1.0,
+    }, referer="/courses")
+    return page is not None and not page["props"].get("errors")
+
+# ========== Test Cases ==========
+def test_parallel_course_codes_are_unique():
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    tag = uuid.uuid4().hex[:8]
+    names = [f"Môn song song {tag} {i:04d}" for i in range(CREATES)]
+    try:
+        department_id = db.scalar_list("SELECT id FROM departments ORDER BY id LIMIT 1")[0]
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            results = list(pool.map(lambda name: create_course(name, department_id), names))
+
+        rows = db.execute("SELECT name, code FROM courses WHERE name LIKE ?", (f"Môn song song {tag}%",)).fetchall()
+        codes = [code for _, code in rows]
+        assert len(rows) == CREATES, (
+            f"chỉ tạo được {len(rows)}/{CREATES} môn ({results.count(False)} request báo lỗi)"
+        )
+        duplicates = sorted({code for code in codes if codes.count(code) > 1})
+        assert not duplicates, f"mã bị trùng: {duplicates}"
+        print(f"   {CREATES} môn, {WORKERS} luồng: {min(codes)} … {max(codes, key=lambda c: (len(c), c))}")
+    finally:
+        db.execute("DELETE FROM courses WHERE name LIKE ?", (f"Môn song song {tag}%",))
+        db.commit()
+        db.close()
+        for session in _sessions:
+            session.close()
+
+# ========== Main ==========
+if __name__ == "__main__":
+    try:
+        test_parallel_course_codes_are_unique()
+        print("✅ Mã môn học không trùng khi tạo song song: PASSED")
+    except AssertionError as e:
+        print(f"❌ Mã môn học song song: FAILED - {e}")
+        sys.exit(1)
@@ -0,0 +1,89 @@
+# Dashboard cập nhật ngay sau khi ghi dữ liệu, không phải chờ cache 5 phút hết hạn.
+#
+# Đọc props của /dashboard (qua httpRunner), thêm một giáo viên qua form trên
+# trình duyệt rồi đọc lại ngay: tổng số giáo viên và "hoạt động gần đây" phải đổi.
+# Cuối cùng xoá giáo viên đó qua DELETE /teachers/{id} và kiểm tra số liệu trở lại.
+#
+#   python dashboardCacheTest.py
+
+import random
+import sys
+import time
+import salaryBenchmark
+from driverPool import create_driver
+from formHelpers import set_values
+from httpRunner import InertiaSession
+from teacherTest import login, open_teacher_form, fill_teacher_form
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# Thời gian chờ tối đa để dashboard phản ánh thay đổi (xa dưới 5 phút TTL cũ)
+MAX_WAIT_SECONDS = 5
+
+# ========== Helpers ==========
+def dashboard_props(session):
+    page = session.visit("GET", "/dashboard")
+    assert page is not None, "GET /dashboard không trả về trang Inertia"
+    return page["props"]
+
+def wait_for_dashboard(session, check):
+    deadline = time.perf_counter() + MAX_WAIT_SECONDS
+    while True:
+        props = dashboard_props(session)
+        if check(props) or time.perf_counter() > deadline:
+            return props
+        time.sleep(0.5)
+
+def add_teacher_via_ui(driver, name, email):
+    open_teacher_form(driver)
+    # Form tạo luôn tài khoản đăng nhập nên cần mật khẩu (fill_teacher_form không điền)
+    set_values(driver, {"password": "12345678", "password_confirmation": "12345678"})
+    fill_teacher_form(driver, name, "1990-01-01", str(random.randint(1000000000, 9999999999)), email, 1, 1)
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.XPATH, "//*[contains(text(),'Thêm giáo viên và tài khoản thành công')]"))
+    )
+
+# ========== Test Cases ==========
+def test_dashboard_reflects_new_teacher():
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    session = InertiaSession("benchmark")
+    session.login()
+    driver = create_driver()
+    tag = random.randint(100000, 999999)
+    name, email = f"GV dashboard {tag}", f"dashboard{tag}@example.com"
+    teacher_id = None
+    try:
+        # Lần đọc đầu làm nóng cache các widget
+        before = dashboard_props(session)["stats"]["totalTeachers"]
+
+        login(driver)
+        add_teacher_via_ui(driver, name, email)
+        teacher_id = db.scalar_list("SELECT id FROM teachers WHERE email = ?", (email,))[0]
+
+        props = wait_for_dashboard(session, lambda p: p["stats"]["totalTeachers"] == before + 1)
+        assert props["stats"]["totalTeachers"] == before + 1, \
+            f"totalTeachers = {props['stats']['totalTeachers']}, mong đợi {before + 1}"
+        titles = [activity["title"] for activity in props["recentActivities"]]
+        assert any(name in title for title in titles), f"không thấy '{name}' trong hoạt động gần đây: {titles}"
+
+        session.visit("DELETE", f"/teachers/{teacher_id}", referer="/teachers")
+        teacher_id = None
+        props = wait_for_dashboard(session, lambda p: p["stats"]["totalTeachers"] == before)
+        assert props["stats"]["totalTeachers"] == before, \
+            f"sau khi xoá totalTeachers = {props['stats']['totalTeachers']}, mong đợi {before}"
+    finally:
+        if teacher_id is not None:
+            session.visit("DELETE", f"/teachers/{teacher_id}", referer="/teachers")
+        driver.quit()
+        session.close()
+        db.close()
+
+# ========== Main ==========
+if __name__ == "__main__":
+    try:
+        test_dashboard_reflects_new_teacher()
+        print("✅ Dashboard cập nhật ngay sau khi thêm/xoá giáo viên: PASSED")
+    except AssertionError as e:
+        print(f"❌ Dashboard cache: FAILED - {e}")
+        sys.exit(1)
@@ -1,27 +1,16 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import random
 import time
+import sessionCache
+from driverPool import create_driver
+from testCases import http_entries
 
 # ====================== Setup ======================
-def create_driver():
-    options = Options()
-    options.add_argument("--log-level=3")
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    options.add_argument("--start-maximized")
-    return webdriver.Chrome(options=options)
-
 def login(driver):
-    driver.get("http://localhost:8000/login")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
-    driver.find_element(By.ID, "email").send_keys("alex@alex.com")
-    driver.find_element(By.ID, "password").send_keys("12345678" + Keys.ENTER)
-    WebDriverWait(driver, 10).until(EC.url_contains("/dashboard"))
+    sessionCache.login(driver)
 
 def open_degree_form(driver):
     driver.get("http://localhost:8000/degrees")
@@ -84,6 +73,10 @@ def test_valid_degree(driver):
         EC.text_to_be_present_in_element((By.TAG_NAME, "body"), "Thêm bằng cấp mới thành công")
     )
 
+# ========== Case HTTP (httpRunner.py) ==========
+# Các case validate khai báo trong testCases.py, chạy thẳng qua request Inertia
+HTTP_CASES = http_entries("degree")
+
 # ====================== Main ======================
 if __name__ == "__main__":
     test_cases = [
@@ -1,28 +1,16 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 import random
-import time
-
-# ========== Driver Setup ==========
-def create_driver():
-    options = Options()
-    options.add_argument("--log-level=3")
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    options.add_argument("--start-maximized")
-    return webdriver.Chrome(options=options)
+import sessionCache
+from formHelpers import click_and_wait
+from driverPool import create_driver
+from testCases import http_entries
 
 # ========== Login ==========
 def login(driver):
-    driver.get("http://localhost:8000/login")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
-    driver.find_element(By.ID, "email").send_keys("alex@alex.com")
-    driver.find_element(By.ID, "password").send_keys("12345678" + Keys.ENTER)
-    WebDriverWait(driver, 10).until(EC.url_contains("/dashboard"))
+    sessionCache.login(driver)
 
 # ========== Mở form ==========
 def open_department_form(driver):
@@ -39,7 +27,8 @@ def open_department_form(driver):
 def fill_and_submit_form(driver, name, abbr):
     WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.ID, "name"))).send_keys(name)
     driver.find_element(By.ID, "abbrName").send_keys(abbr)
-    driver.find_element(By.XPATH, "//button[contains(.,'Thêm mới')]").click()
+    # Chờ request Inertia xong thay vì sleep giữa các case
+    click_and_wait(driver, driver.find_element(By.XPATH, "//button[contains(.,'Thêm mới')]"), timeout=5)
 
 # ========== Kiểm tra lỗi ==========
 def has_error(driver, message):
@@ -66,16 +55,21 @@ def test_case(driver, title, name, abbr, expected_error):
     except:
         return False
 
+# ========== Bảng test case ==========
+tests = [
+    ("Test missing name", "", "MNC", "Tên khoa là bắt buộc"),
+    ("Test missing abbrName", "Công nghệ thông tin", "", "Tên viết tắt là bắt buộc"),
+    ("Test duplicate name", "Công nghệ thông tin", "DH1", "Thêm khoa mới thất bại"),
+    ("Test duplicate abbrName", "Khoa A", "CNTT", "Thêm khoa mới thất bại"),
+    ("Test valid department", f"Khoa Test {random.randint(1000,9999)}", f"KT{random.randint(10,99)}", None)
+]
+
+# ========== Case HTTP (httpRunner.py) ==========
+# Các case validate khai báo trong testCases.py, chạy thẳng qua request Inertia
+HTTP_CASES = http_entries("department")
+
 # ========== Run all tests ==========
 if __name__ == "__main__":
-    tests = [
-        ("Test missing name", "", "MNC", "Tên khoa là bắt buộc"),
-        ("Test missing abbrName", "Công nghệ thông tin", "", "Tên viết tắt là bắt buộc"),
-        ("Test duplicate name", "Công nghệ thông tin", "DH1", "Thêm khoa mới thất bại"),
-        ("Test duplicate abbrName", "Khoa A", "CNTT", "Thêm khoa mới thất bại"),
-        ("Test valid department", f"Khoa Test {random.randint(1000,9999)}", f"KT{random.randint(10,99)}", None)
-    ]
-
     driver = create_driver()
     passed = 0
     try:
@@ -87,7 +81,6 @@ if __name__ == "__main__":
                 passed += 1
             else:
                 print(f"❌ {title}: FAILED")
-            time.sleep(1)
         print(f"\n✅ Tổng kết: {passed}/{len(tests)} test PASSED")
     finally:
         driver.quit()
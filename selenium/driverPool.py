@@ -0,0 +1,197 @@
+# Khởi tạo Chrome dùng chung cho mọi module test và pool driver "nóng".
+#
+# Chrome khởi động mất 1–3s mỗi lần, nên pool mở sẵn N trình duyệt headless
+# rồi cho các test mượn lần lượt. Giữa hai lần mượn chỉ dọn localStorage /
+# sessionStorage và trang Inertia hiện tại, cookie đăng nhập được giữ lại.
+# Driver bị thay mới sau `max_uses` lần mượn hoặc khi bộ nhớ vượt `max_memory_mb`.
+# Chrome thay thế mở lỗi thì thử lại vài lần; chờ driver quá SELENIUM_POOL_TIMEOUT
+# giây thì acquire() báo lỗi để lần chạy CI dừng thay vì treo.
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import os
+import queue
+import threading
+import sessionCache
+
+try:
+    import psutil
+except ImportError:  # psutil không bắt buộc, khi thiếu chỉ đo heap JS
+    psutil = None
+
+HEADLESS = os.environ.get("SELENIUM_HEADLESS", "0") == "1"
+# Chờ driver rảnh tối đa (giây): pool cạn vì Chrome không mở lại được thì báo lỗi thay vì treo
+ACQUIRE_TIMEOUT = float(os.environ.get("SELENIUM_POOL_TIMEOUT", "300"))
+# Số lần thử mở lại Chrome thay thế khi create_driver() lỗi
+SPAWN_RETRIES = 2
+
+# ========== Driver Setup ==========
+def create_driver(headless=None):
+    if headless is None:
+        headless = HEADLESS
+    options = Options()
+    options.add_argument("--log-level=3")
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-dev-shm-usage")
+    else:
+        options.add_argument("--start-maximized")
+    return webdriver.Chrome(options=options)
+
+# ========== Pool ==========
+class PooledDriver:
+    def __init__(self, driver, slot):
+        self.driver = driver
+        self.slot = slot
+        self.uses = 0
+        self.logged_in = False
+
+    def memory_mb(self):
+        if psutil is not None:
+            try:
+                process = psutil.Process(self.driver.service.process.pid)
+                total = sum(p.memory_info().rss for p in [process, *process.children(recursive=True)])
+                return total / (1024 * 1024)
+            except Exception:
+                pass
+        try:
+            used = self.driver.execute_script(
+                "return performance.memory ? performance.memory.usedJSHeapSize : 0;")
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def reset(self):
+        # Xoá trạng thái phía client, giữ nguyên cookie đăng nhập
+        try:
+            self.driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass
+        # Rời trang hiện tại để bỏ page/history state của Inertia
+        self.driver.get("about:blank")
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+class DriverPool:
+    def __init__(self, size, max_uses=50, max_memory_mb=1024, headless=True):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.headless = headless
+        self.available = queue.Queue()
+        self.all = []
+        self.lock = threading.Lock()
+        self.counter = 0
+        self.spawn_errors = []
+        self.spawner = ThreadPoolExecutor(max_workers=size, thread_name_prefix="chrome")
+
+    def _next_slot(self):
+        with self.lock:
+            slot = f"pool-{self.counter % self.size}"
+            self.counter += 1
+            return slot
+
+    def _spawn(self, slot):
+        pooled = PooledDriver(create_driver(self.headless), slot)
+        with self.lock:
+            self.all.append(pooled)
+        self.available.put(pooled)
+        return pooled
+
+    def start(self):
+        # Mở song song toàn bộ Chrome trước khi chạy test
+        futures = [self.spawner.submit(self._spawn, self._next_slot()) for _ in range(self.size)]
+        for future in futures:
+            future.result()
+        return self
+
+    def acquire(self, authenticated=True, timeout=ACQUIRE_TIMEOUT):
+        try:
+            pooled = self.available.get(timeout=timeout)
+        except queue.Empty:
+            reason = f", lỗi mở Chrome gần nhất: {self.spawn_errors[-1]!r}" if self.spawn_errors else ""
+            raise RuntimeError(f"Không có driver rảnh sau {timeout}s ({len(self.all)}/{self.size} còn sống{reason})")
+        pooled.uses += 1
+        driver = pooled.driver
+        if not authenticated:
+            # Driver đang ở about:blank nên xoá cookie qua CDP cho mọi domain
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            pooled.logged_in = False
+        elif not pooled.logged_in:
+            try:
+                sessionCache.login(driver, slot=pooled.slot)
+            except Exception:
+                self.release(pooled, broken=True)
+                raise
+            pooled.logged_in = True
+        return pooled
+
+    def release(self, pooled, broken=False):
+        if broken:
+            # Test lỗi có thể để phiên ở trạng thái lạ, lần sau kiểm tra lại đăng nhập
+            pooled.logged_in = False
+        if pooled.uses >= self.max_uses or pooled.memory_mb() > self.max_memory_mb:
+            self._recycle(pooled)
+            return
+        try:
+            pooled.reset()
+        except Exception:
+            self._recycle(pooled)
+            return
+        self.available.put(pooled)
+
+    def _recycle(self, pooled):
+        with self.lock:
+            if pooled in self.all:
+                self.all.remove(pooled)
+        pooled.quit()
+        # Mở Chrome thay thế ở nền, test khác không phải chờ
+        self._respawn(pooled.slot)
+
+    def _respawn(self, slot, attempt=0):
+        try:
+            future = self.spawner.submit(self._spawn, slot)
+        except RuntimeError:
+            return  # pool đã đóng
+        future.add_done_callback(lambda f: self._spawn_done(f, slot, attempt))
+
+    def _spawn_done(self, future, slot, attempt):
+        error = future.exception()
+        if error is None:
+            return
+        if attempt < SPAWN_RETRIES:
+            print(f"⚠️ Mở lại Chrome cho {slot} lỗi ({error!r}), thử lại lần {attempt + 1}")
+            self._respawn(slot, attempt + 1)
+            return
+        # Hết lượt thử: ghi lại để acquire() báo lỗi rõ ràng khi pool cạn
+        print(f"❌ Không mở lại được Chrome cho {slot}: {error!r}")
+        with self.lock:
+            self.spawn_errors.append(error)
+
+    @contextmanager
+    def lease(self, authenticated=True):
+        pooled = self.acquire(authenticated)
+        broken = False
+        try:
+            yield pooled.driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(pooled, broken)
+
+    def close(self):
+        self.spawner.shutdown(wait=True)
+        with self.lock:
+            drivers, self.all = self.all, []
+        for pooled in drivers:
+            pooled.quit()
@@ -0,0 +1,129 @@
+# Xuất CSV/XLSX lớn: đủ số dòng và bộ nhớ PHP không tăng theo số dòng.
+#
+# Seed các học kỳ với số lớp tăng dần (qua salaryBenchmark) kèm sẵn dòng lương,
+# tải GET /salary/{id}/export?format=csv|xlsx theo kiểu stream, đếm số dòng dữ
+# liệu và đọc bộ nhớ đỉnh từ dòng log "Export finished" mà DataExportService ghi.
+#
+#   python exportTest.py
+#   EXPORT_SIZES=10000,200000 python exportTest.py
+
+import csv
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+import salaryBenchmark
+from httpRunner import InertiaSession
+
+SIZES = [int(n) for n in os.environ.get("EXPORT_SIZES", "2000,50000").split(",")]
+# Cho phép lệch tối đa: 25% hoặc 16 MB so với lần xuất nhỏ nhất (lấy giá trị lớn hơn)
+MAX_GROWTH_RATIO = 1.25
+MAX_GROWTH_MB = 16
+_LOG_RE = re.compile(r"Export finished (\{.*\})")
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+# ========== Seed ==========
+def seed_salaries(db, size):
+    seeded = salaryBenchmark.seed(db, size)
+    now = salaryBenchmark._now()
+    classrooms = db.execute("SELECT id, teacher_id FROM classrooms WHERE semester_id = ?",
+                            (seeded["semester_id"],))
+    db.insert_many("teacher_salaries", ["teacher_id", "classroom_id", "salary_config_id", "actual_lessons",
+                                        "class_coefficient", "course_coefficient", "teacher_coefficient",
+                                        "converted_lessons", "total_salary", "created_at", "updated_at"],
+                   ((teacher_id, classroom_id, seeded["salary_config_id"], 45, 0.1, 1.2, 1.5, 58.5,
+                     58.5 * 1.5 * 100000, now, now)
+                    for classroom_id, teacher_id in classrooms.fetchall()))
+    db.commit()
+    return seeded
+
+def read_export_log(offset):
+    try:
+        with open(salaryBenchmark.LOG_FILE, encoding="utf-8", errors="replace") as f:
+            f.seek(offset)
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        match = _LOG_RE.search(line)
+        if match:
+            return json.loads(match.group(1))
+    return None
+
+# ========== Tải & đếm ==========
+def download(session, path, fmt, target):
+    with session.client.stream("GET", path, params={"format": fmt}, timeout=600) as response:
+        assert response.status_code == 200, f"{path}?format={fmt} trả HTTP {response.status_code}"
+        for chunk in response.iter_bytes():
+            target.write(chunk)
+
+def count_csv_rows(session, path):
+    with tempfile.TemporaryFile() as f:
+        download(session, path, "csv", f)
+        f.seek(0)
+        reader = csv.reader(io.TextIOWrapper(f, encoding="utf-8-sig", newline=""))
+        header = next(reader)
+        return header, sum(1 for _ in reader)
+
+def count_xlsx_rows(session, path):
+    with tempfile.TemporaryFile() as f:
+        download(session, path, "xlsx", f)
+        f.seek(0)
+        with zipfile.ZipFile(f) as archive, archive.open("xl/worksheets/sheet1.xml") as sheet:
+            rows = 0
+            for _, element in ET.iterparse(sheet):
+                if element.tag == f"{_SHEET_NS}row":
+                    rows += 1
+                    element.clear()
+        return rows - 1  # bỏ dòng tiêu đề
+
+# ========== Test Cases ==========
+def test_large_export_is_streamed():
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    session = InertiaSession("benchmark")
+    session.login()
+    peaks = {}
+    try:
+        for size in SIZES:
+            seeded = seed_salaries(db, size)
+            path = f"/salary/{seeded['salary_config_id']}/export"
+            try:
+                offset = salaryBenchmark.log_offset()
+                header, rows = count_csv_rows(session, path)
+                assert rows == size, f"CSV có {rows} dòng, mong đợi {size}"
+                csv_log = read_export_log(offset)
+                assert csv_log is not None, "không thấy dòng log 'Export finished'"
+
+                offset = salaryBenchmark.log_offset()
+                xlsx_rows = count_xlsx_rows(session, path)
+                assert xlsx_rows == size, f"XLSX có {xlsx_rows} dòng, mong đợi {size}"
+                xlsx_log = read_export_log(offset)
+                assert xlsx_log is not None, "không thấy dòng log 'Export finished'"
+            finally:
+                salaryBenchmark.cleanup(db, seeded)
+            peaks[size] = max(csv_log["peak_memory_mb"], xlsx_log["peak_memory_mb"])
+            print(f"   {size:>8} dòng ({len(header)} cột): CSV {csv_log['peak_memory_mb']} MB, "
+                  f"XLSX {xlsx_log['peak_memory_mb']} MB đỉnh")
+    finally:
+        session.close()
+        db.close()
+
+    smallest, largest = peaks[min(peaks)], peaks[max(peaks)]
+    limit = max(smallest * MAX_GROWTH_RATIO, smallest + MAX_GROWTH_MB)
+    assert largest <= limit, (
+        f"bộ nhớ tăng theo số dòng: {smallest} MB ({min(peaks)} dòng) → {largest} MB ({max(peaks)} dòng), "
+        f"giới hạn {limit:.1f} MB"
+    )
+
+# ========== Main ==========
+if __name__ == "__main__":
+    try:
+        test_large_export_is_streamed()
+        print("✅ Xuất CSV/XLSX dạng stream: PASSED")
+    except AssertionError as e:
+        print(f"❌ Xuất CSV/XLSX: FAILED - {e}")
+        sys.exit(1)
@@ -0,0 +1,107 @@
+# Thao tác form nhanh cho các test: chọn option / gán giá trị bằng một lần gọi
+# JS và chờ sự kiện của Inertia thay vì time.sleep().
+#
+# Các input/select trong trang là component React có kiểm soát, nên phải gán
+# qua setter gốc của HTMLInputElement/HTMLSelectElement rồi phát sự kiện
+# input/change thì React mới nhận giá trị mới.
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait, Select
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+_SET_VALUE_JS = """
+const setValue = (el, value) => {
+    const proto = el.tagName === 'SELECT' ? HTMLSelectElement.prototype
+        : el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype
+        : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+    el.dispatchEvent(new Event('change', { bubbles: true }));
+};
+const values = arguments[0];
+const missing = [];
+for (const [id, value] of Object.entries(values)) {
+    const el = document.getElementById(id);
+    if (!el) { missing.push(id); continue; }
+    if (el.tagName === 'SELECT' && typeof value === 'object' && value !== null) {
+        // {index: n} hoặc {last: true}: chọn theo vị trí, không cần biết value
+        const options = el.options;
+        if (options.length === 0) { missing.push(id); continue; }
+        const i = value.last ? options.length - 1 : Math.min(value.index, options.length - 1);
+        setValue(el, options[i].value);
+    } else {
+        setValue(el, value === null || value === undefined ? '' : String(value));
+    }
+}
+return missing;
+"""
+
+_INSTALL_INERTIA_JS = """
+if (!window.__inertiaEvents) {
+    window.__inertiaEvents = { started: 0, finished: 0, success: 0, error: 0, navigated: 0, errors: {} };
+    const e = window.__inertiaEvents;
+    document.addEventListener('inertia:start', () => e.started++);
+    document.addEventListener('inertia:finish', () => e.finished++);
+    document.addEventListener('inertia:success', () => { e.success++; e.errors = {}; });
+    document.addEventListener('inertia:error', (ev) => { e.error++; e.errors = ev.detail.errors || {}; });
+    document.addEventListener('inertia:navigate', () => e.navigated++);
+}
+return window.__inertiaEvents.finished;
+"""
+
+# ========== Gán giá trị ==========
+# Gán nhiều field trong một lần gọi JS, trả về danh sách id không tìm thấy
+def set_values(driver, values):
+    return driver.execute_script(_SET_VALUE_JS, values)
+
+def set_value(driver, element_id, value):
+    missing = set_values(driver, {element_id: value})
+    if missing:
+        raise ValueError(f"Không tìm thấy phần tử #{element_id}")
+
+def select_option(driver, select_id, value=None, index=None, last=False, timeout=5):
+    element = WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.ID, select_id)))
+    if value is not None:
+        Select(element).select_by_value(str(value))
+        return
+    spec = {"last": True} if last else {"index": index}
+    missing = set_values(driver, {select_id: spec})
+    if missing:
+        raise ValueError(f"Dropdown #{select_id} không có option")
+
+# ========== Chờ Inertia ==========
+# Gắn listener sự kiện Inertia (một lần mỗi trang), trả về số visit đã xong
+def watch_inertia(driver):
+    return driver.execute_script(_INSTALL_INERTIA_JS)
+
+# Chờ tới khi có visit Inertia kết thúc sau mốc `since`, hết giờ trả về False
+def wait_for_inertia(driver, since, timeout=10):
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return window.__inertiaEvents ? window.__inertiaEvents.finished : 0;") > since
+        )
+        return True
+    except TimeoutException:
+        return False
+
+# Lỗi validate (props errors) của visit Inertia gần nhất, {} nếu visit thành công
+def last_errors(driver):
+    return driver.execute_script("return window.__inertiaEvents ? window.__inertiaEvents.errors : {};") or {}
+
+# Click (qua JS) rồi chờ request Inertia do click gây ra kết thúc. Nếu trình
+# duyệt chặn submit (thiếu field required, min/max...) thì sẽ không có visit
+# nào, khi đó trả về False ngay thay vì chờ hết timeout.
+_CLICK_JS = """
+const el = arguments[0];
+const form = el.form || (el.getAttribute('form') && document.getElementById(el.getAttribute('form')));
+const valid = !(el.type === 'submit' && form && !form.checkValidity());
+el.click();
+return valid;
+"""
+
+def click_and_wait(driver, element, timeout=10):
+    since = watch_inertia(driver)
+    if not driver.execute_script(_CLICK_JS, element):
+        return False
+    return wait_for_inertia(driver, since, timeout)
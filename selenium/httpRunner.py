@@ -0,0 +1,275 @@
+# Chạy các case kiểm tra validate phía server qua HTTP, không cần trình duyệt.
+#
+# Mỗi case gửi đúng request mà useForm() của Inertia gửi (POST JSON kèm
+# header X-Inertia), đi theo redirect back() rồi đọc props `errors` trong JSON
+# trang trả về. Các module test khai báo HTTP_CASES (lấy từ bảng trong
+# testCases.py); tên case trùng tên test selenium tương ứng để
+# runAllTests --ui-only bỏ qua chúng.
+#
+#   python httpRunner.py                       # mọi module có HTTP_CASES
+#   python httpRunner.py -w 16 --repeat 20 --report http.json
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html import unescape
+from urllib.parse import unquote, urlparse
+import argparse
+import importlib
+import json
+import re
+import sys
+import threading
+import time
+import traceback
+import httpx
+import sessionCache
+from sessionCache import BASE_URL, EMAIL, PASSWORD, SESSION_COOKIE
+
+MODULES = ["teacherTest", "courseTest", "departmentTest", "degreeTest", "academicYearTest", "classroomTest"]
+
+_DATA_PAGE_RE = re.compile(r'data-page="([^"]*)"')
+
+# ========== Client Inertia ==========
+def query_stats(response):
+    # Header X-Query-* do middleware AddQueryStatsHeaders gắn (chỉ khi server bật QUERY_STATS)
+    if "X-Query-Count" not in response.headers:
+        return None
+    return {
+        "count": int(response.headers["X-Query-Count"]),
+        "infra_count": int(response.headers.get("X-Query-Infra-Count", 0)),
+        "time_ms": float(response.headers.get("X-Query-Time-Ms", 0)),
+        "duplicates": int(response.headers.get("X-Query-Duplicates", 0)),
+        "repeated": json.loads(response.headers.get("X-Query-Repeated", "[]")),
+    }
+
+def _cookie_domain():
+    # http.cookiejar lưu cookie của host không có dấu chấm dưới tên "<host>.local"
+    host = urlparse(BASE_URL).hostname or "localhost"
+    return host if "." in host else f"{host}.local"
+
+class InertiaSession:
+    def __init__(self, slot, timeout=10, client=None):
+        self.slot = slot
+        self.client = client or httpx.Client(
+            base_url=BASE_URL,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=4),
+        )
+        self.version = None
+        self.last_stats = None
+
+    # ----- Cookie / phiên -----
+    def _load_cookies(self, cookies):
+        domain = _cookie_domain()
+        self.client.cookies.clear()
+        for cookie in cookies:
+            self.client.cookies.set(cookie["name"], cookie["value"], domain=domain, path=cookie.get("path", "/"))
+
+    def _dump_cookies(self):
+        host = urlparse(BASE_URL).hostname or "localhost"
+        cookies = []
+        for cookie in self.client.cookies.jar:
+            entry = {"name": cookie.name, "value": cookie.value, "path": cookie.path or "/", "domain": host}
+            if cookie.expires:
+                entry["expiry"] = int(cookie.expires)
+            cookies.append(entry)
+        return cookies
+
+    def headers(self, component=None, only=None):
+        headers = {
+            "X-Inertia": "true",
+            "X-Requested-With": "XMLHttpRequest",
+            "Accept": "text/html, application/xhtml+xml",
+        }
+        if self.version is not None:
+            headers["X-Inertia-Version"] = self.version
+        token = self.client.cookies.get("XSRF-TOKEN")
+        if token:
+            headers["X-XSRF-TOKEN"] = unquote(token)
+        if component and only:
+            # Partial reload: server chỉ resolve các prop cần (errors luôn có)
+            headers["X-Inertia-Partial-Component"] = component
+            headers["X-Inertia-Partial-Data"] = ",".join(only)
+        return headers
+
+    def _refresh_version(self, path="/login"):
+        # Lấy asset version từ data-page của lần tải trang HTML thường
+        response = self.client.get(path, headers={"Accept": "text/html"})
+        match = _DATA_PAGE_RE.search(response.text)
+        if match:
+            self.version = json.loads(unescape(match.group(1))).get("version")
+        return response
+
+    def login(self):
+        cookies = sessionCache.get_cookies(self.slot)
+        if cookies:
+            self._load_cookies(cookies)
+            self._refresh_version("/dashboard")
+            page = self.visit("GET", "/dashboard")
+            if page is not None and "/login" not in page.get("url", ""):
+                return False
+            sessionCache.invalidate(self.slot)
+            self.client.cookies.clear()
+
+        self._refresh_version("/login")
+        page = self.visit("POST", "/login", {"email": EMAIL, "password": PASSWORD, "remember": False})
+        if page is None or "/login" in page.get("url", "") or not self.client.cookies.get(SESSION_COOKIE):
+            raise RuntimeError(f"Đăng nhập HTTP thất bại cho {EMAIL}")
+        sessionCache.save_cookies(self._dump_cookies(), self.slot)
+        return True
+
+    # ----- Request -----
+    def visit(self, method, path, data=None, component=None, only=None, referer=None):
+        headers = self.headers(component, only)
+        # back() của Laravel quay về Referer, giống trình duyệt đang đứng ở trang danh sách
+        if referer:
+            headers["Referer"] = f"{BASE_URL}{referer}"
+        for _ in range(2):
+            response = self.client.request(method, path, json=data, headers=headers)
+            if response.status_code != 409:
+                break
+            # Asset version đổi (vừa build lại frontend) → lấy version mới rồi gửi lại
+            self._refresh_version(urlparse(response.headers.get("X-Inertia-Location", "/login")).path)
+            headers = {**headers, **self.headers(component, only)}
+        self.last_stats = query_stats(response)
+        if response.headers.get("X-Inertia") != "true":
+            return None
+        return response.json()
+
+    def close(self):
+        self.client.close()
+
+# ========== Case ==========
+class HttpCase:
+    def __init__(self, module, name, method, path, payload, expected, component=None):
+        self.module = module
+        self.name = name
+        self.method = method
+        self.path = path
+        self.payload = payload
+        self.expected = expected
+        self.component = component
+
+    @property
+    def id(self):
+        return f"{self.module.__name__}::{self.name}"
+
+    def build_payload(self):
+        # payload có thể là hàm để mỗi lần chạy sinh email/sđt ngẫu nhiên mới
+        return self.payload() if callable(self.payload) else dict(self.payload)
+
+def collect_cases(module):
+    cases = []
+    for entry in getattr(module, "HTTP_CASES", []):
+        name, method, path, payload, expected = entry[:5]
+        component = entry[5] if len(entry) > 5 else None
+        cases.append(HttpCase(module, name, method, path, payload, expected, component))
+    return cases
+
+def collect_all(module_names):
+    cases = []
+    for module_name in module_names:
+        cases.extend(collect_cases(importlib.import_module(module_name)))
+    return cases
+
+def check_errors(errors, expected):
+    # expected: None = phải thành công; dict field -> đoạn thông báo (None = chỉ cần có lỗi)
+    if expected is None:
+        if errors:
+            raise AssertionError(f"không mong đợi lỗi, nhận {errors}")
+        return
+    for field, message in expected.items():
+        if field not in errors:
+            raise AssertionError(f"thiếu lỗi '{field}', nhận {errors}")
+        if message is not None and message not in errors[field]:
+            raise AssertionError(f"lỗi '{field}' là '{errors[field]}', mong đợi chứa '{message}'")
+
+# ========== Worker ==========
+_local = threading.local()
+_slot_lock = threading.Lock()
+_sessions = []
+
+def _session():
+    session = getattr(_local, "session", None)
+    if session is None:
+        with _slot_lock:
+            slot = f"http-{len(_sessions)}"
+            session = InertiaSession(slot)
+            _sessions.append(session)
+        # Mỗi worker một phiên riêng để lỗi flash không bị worker khác đọc mất
+        session.login()
+        _local.session = session
+    return session
+
+def close_sessions():
+    with _slot_lock:
+        sessions = list(_sessions)
+    for session in sessions:
+        session.close()
+
+def run_case(case):
+    started = time.perf_counter()
+    result = {"id": case.id, "module": case.module.__name__, "name": case.name,
+              "worker": threading.current_thread().name}
+    try:
+        session = _session()
+        page = session.visit(case.method, case.path, case.build_payload(),
+                             component=case.component, only=["flash"], referer=case.path)
+        if page is None:
+            raise AssertionError("server không trả về trang Inertia")
+        check_errors(page.get("props", {}).get("errors") or {}, case.expected)
+        result["passed"] = True
+    except Exception as e:
+        result["passed"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    result["duration"] = round(time.perf_counter() - started, 4)
+    return result
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy các case validate qua HTTP (không mở trình duyệt)")
+    parser.add_argument("-w", "--workers", type=int, default=8, help="Số phiên HTTP chạy song song")
+    parser.add_argument("-m", "--modules", nargs="+", default=MODULES, help="Chỉ chạy các module được chọn")
+    parser.add_argument("-k", "--keyword", default=None, help="Chỉ chạy case có tên chứa chuỗi này")
+    parser.add_argument("--repeat", type=int, default=1, help="Lặp lại toàn bộ case N lần (đo thông lượng)")
+    parser.add_argument("--report", default=None, help="Ghi kết quả gộp ra file JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    from runAllTests import print_report, write_report
+
+    args = parse_args(argv)
+    cases = collect_all(args.modules)
+    if args.keyword:
+        cases = [case for case in cases if args.keyword in case.id]
+    cases = cases * max(1, args.repeat)
+    workers = max(1, min(args.workers, len(cases) or 1))
+
+    print(f"▶️ {len(cases)} case HTTP, {workers} worker")
+    started = time.perf_counter()
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http") as executor:
+            futures = [executor.submit(run_case, case) for case in cases]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if not result["passed"]:
+                    print(f"❌ {result['id']} - {result['error']}")
+    finally:
+        close_sessions()
+    wall_time = time.perf_counter() - started
+
+    if args.repeat == 1:
+        print_report(results, wall_time, workers)
+    else:
+        passed = sum(1 for r in results if r["passed"])
+        print(f"\n✅ Tổng: {passed}/{len(results)} case PASSED trong {wall_time:.1f}s")
+    print(f"🚀 {len(results) / wall_time:.0f} case/s")
+    if args.report:
+        write_report(args.report, results, wall_time, workers)
+    return 0 if all(r["passed"] for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# Nhập giáo viên / môn học / lớp học hàng loạt từ CSV qua POST /import/{type}.
+#
+# Dòng đầu của CSV là tên cột, trùng tên field của form:
+#   teachers:   fullName, DOB, phone, email, degree_id, department_id, password, role (tuỳ chọn)
+#   courses:    name, credits, lessons, department_id (tuỳ chọn), course_coefficient
+#   classrooms: name, semester_id, course_id, teacher_id (tuỳ chọn), students
+# Server kiểm tra theo lô, insert các dòng hợp lệ và trả về báo cáo các dòng lỗi.
+#
+#   python importCsv.py teachers khoa-moi.csv --dry-run
+#   python importCsv.py teachers khoa-moi.csv --errors loi.csv
+#   python importCsv.py teachers mau.csv --sample 300 --department 2 --degree 1
+
+from urllib.parse import unquote
+import argparse
+import csv
+import os
+import random
+import sys
+import time
+import uuid
+from httpRunner import InertiaSession
+
+TYPES = ["teachers", "courses", "classrooms"]
+COLUMNS = {
+    "teachers": ["fullName", "DOB", "phone", "email", "degree_id", "department_id", "password", "role"],
+    "courses": ["name", "credits", "lessons", "department_id", "course_coefficient"],
+    "classrooms": ["name", "semester_id", "course_id", "teacher_id", "students"],
+}
+
+# ========== File mẫu ==========
+def sample_row(import_type, i, tag, args):
+    if import_type == "teachers":
+        return [f"GV nhập {tag} {i}", "1985-01-01", f"09{random.randint(10000000, 99999999)}",
+                f"import{tag}{i}@example.com", args.degree, args.department, "12345678", "teacher"]
+    if import_type == "courses":
+        return [f"Môn nhập {tag} {i}", 3, random.choice([30, 45, 60]), args.department, random.choice([1.0, 1.2, 1.5])]
+    return [f"Lớp nhập {tag} {i}", args.semester, args.course, "", random.randint(20, 80)]
+
+def write_sample(path, import_type, count, args):
+    tag = uuid.uuid4().hex[:6]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS[import_type])
+        for i in range(count):
+            writer.writerow(sample_row(import_type, i, tag, args))
+    print(f"📝 Đã tạo {count} dòng mẫu: {path}")
+
+# ========== Upload ==========
+def upload(session, import_type, path, dry_run, timeout):
+    headers = {
+        "Accept": "application/json",
+        "X-Requested-With": "XMLHttpRequest",
+        "X-XSRF-TOKEN": unquote(session.client.cookies.get("XSRF-TOKEN", "")),
+    }
+    with open(path, "rb") as f:
+        # httpx đọc file theo từng khối khi gửi multipart, không nạp cả file vào bộ nhớ
+        response = session.client.post(
+            f"/import/{import_type}",
+            files={"file": (os.path.basename(path), f, "text/csv")},
+            data={"dry_run": "1" if dry_run else "0"},
+            headers=headers,
+            timeout=timeout,
+        )
+    if response.status_code == 422:
+        raise RuntimeError(f"file bị từ chối: {response.json().get('errors')}")
+    response.raise_for_status()
+    return response.json()
+
+def write_errors(path, report):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["line", "field", "message"])
+        for entry in report["errors"]:
+            for field, message in entry["errors"].items():
+                writer.writerow([entry["line"], field, message])
+    print(f"📄 Báo cáo lỗi: {path}")
+
+def print_report(report, elapsed):
+    mode = " (dry run, chưa ghi DB)" if report["dry_run"] else ""
+    print(f"▶️ {report['type']}{mode}: {report['total']} dòng trong {elapsed:.1f}s")
+    print(f"   ✅ hợp lệ/đã nhập: {report['imported']}   ❌ lỗi: {report['failed']}")
+    for entry in report["errors"][:20]:
+        details = "; ".join(f"{field}: {message}" for field, message in entry["errors"].items())
+        print(f"   dòng {entry['line']}: {details}")
+    if report["failed"] > 20:
+        print(f"   ... và {report['failed'] - 20} dòng lỗi khác (xem --errors)")
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Nhập dữ liệu hàng loạt từ file CSV")
+    parser.add_argument("type", choices=TYPES)
+    parser.add_argument("file", help="Đường dẫn file CSV")
+    parser.add_argument("--dry-run", action="store_true", help="Chỉ kiểm tra, không ghi vào DB")
+    parser.add_argument("--errors", default=None, help="Ghi các dòng lỗi ra file CSV")
+    parser.add_argument("--sample", type=int, default=None, help="Tạo file CSV mẫu N dòng trước khi nhập")
+    parser.add_argument("--department", type=int, default=1, help="department_id cho file mẫu")
+    parser.add_argument("--degree", type=int, default=1, help="degree_id cho file mẫu giáo viên")
+    parser.add_argument("--semester", type=int, default=1, help="semester_id cho file mẫu lớp học")
+    parser.add_argument("--course", type=int, default=1, help="course_id cho file mẫu lớp học")
+    parser.add_argument("--timeout", type=float, default=600)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.sample:
+        write_sample(args.file, args.type, args.sample, args)
+
+    session = InertiaSession("import")
+    session.login()
+    try:
+        started = time.perf_counter()
+        report = upload(session, args.type, args.file, args.dry_run, args.timeout)
+        print_report(report, time.perf_counter() - started)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 2
+    finally:
+        session.close()
+
+    if args.errors and report["errors"]:
+        write_errors(args.errors, report)
+    return 1 if report["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+# Bộ tạo tải (kiểu locust) cho các trang CRUD và báo cáo chính, viết bằng asyncio + httpx.
+#
+# Mỗi "người dùng ảo" lặp: chọn một route theo trọng số của kịch bản, gửi
+# request như trình duyệt Inertia (hoặc JSON với các route báo cáo), nghỉ
+# một khoảng think time rồi lặp lại. Phiên đăng nhập lấy qua cùng luồng login
+# của httpRunner/sessionCache nên chạy lại không phải đăng nhập lại.
+#
+#   python loadTest.py --users 200 --duration 120 --academic-year 1
+#   python loadTest.py --scenario semester-close --salary-config 3 --report load.json
+#   python loadTest.py --scenario classroom-search --pages 50 --search LH Nguyễn
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import unquote
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+import httpx
+from httpRunner import InertiaSession
+from sessionCache import BASE_URL
+
+# ========== Route & kịch bản ==========
+@dataclass
+class Route:
+    name: str
+    method: str
+    path: str
+    weight: int
+    params: object = None   # dict hoặc hàm trả về dict query string
+    json: bool = False      # route báo cáo trả JSON khi Accept: application/json
+    follow: int = 0         # số trang lật tiếp theo next_cursor của prop phân trang
+    paginated: str = None   # tên prop phân trang cursor (vd. "classrooms")
+
+    def build_params(self):
+        return self.params() if callable(self.params) else self.params
+
+def build_routes(args):
+    search_terms = args.search or ["LH", "Lập trình", "Nguyễn"]
+    routes = {
+        "dashboard": Route("GET /dashboard", "GET", "/dashboard", 3),
+        "teachers": Route("GET /teachers", "GET", "/teachers", 3,
+                          lambda: {"page": random.randint(1, args.pages)}),
+        "classrooms": Route("GET /classrooms", "GET", "/classrooms", 3),
+        "classrooms_search": Route("GET /classrooms?search", "GET", "/classrooms", 2,
+                                   lambda: {"search": random.choice(search_terms)}),
+        # Lớp học phân trang theo cursor: lật liên tiếp --pages trang như người dùng bấm "Tiếp"
+        "classrooms_deep": Route("GET /classrooms (lật trang)", "GET", "/classrooms", 1,
+                                 follow=args.pages, paginated="classrooms"),
+        "classrooms_search_deep": Route("GET /classrooms?search (lật trang)", "GET", "/classrooms", 1,
+                                        lambda: {"search": random.choice(search_terms)},
+                                        follow=args.pages, paginated="classrooms"),
+        "reports": Route("GET /reports", "GET", "/reports", 1),
+    }
+    if args.academic_year:
+        routes["classrooms_year"] = Route("GET /classrooms?academic_year_id", "GET", "/classrooms", 2,
+                                          {"academic_year_id": args.academic_year})
+        routes["report_school"] = Route("GET /reports/school", "GET", "/reports/school", 1,
+                                        {"academic_year_id": args.academic_year}, json=True)
+        if args.department:
+            routes["report_department"] = Route("GET /reports/department", "GET", "/reports/department", 1,
+                                                {"department_id": args.department,
+                                                 "academic_year_id": args.academic_year}, json=True)
+    if args.salary_config:
+        routes["salary_report"] = Route("GET /salary/{id}/report", "GET",
+                                        f"/salary/{args.salary_config}/report", 1)
+        routes["salary_calculate"] = Route("POST /salary/{id}/calculate", "POST",
+                                           f"/salary/{args.salary_config}/calculate", 1)
+    return routes
+
+# Trọng số ghi đè theo kịch bản; route không có trong bảng giữ trọng số mặc định
+SCENARIOS = {
+    "browse": {},
+    # Cuối kỳ: phòng đào tạo tính lương, các khoa xem báo cáo liên tục
+    "semester-close": {"dashboard": 2, "teachers": 1, "classrooms": 2, "classrooms_search": 1,
+                       "classrooms_year": 2, "reports": 2, "report_school": 4, "report_department": 4,
+                       "salary_report": 4, "salary_calculate": 2},
+    # Chỉ gọi các route báo cáo JSON (dùng trong reportLoadTest)
+    "reports": {"dashboard": 0, "teachers": 0, "classrooms": 0, "classrooms_search": 0, "classrooms_year": 0,
+                "classrooms_deep": 0, "classrooms_search_deep": 0,
+                "reports": 0, "report_school": 1, "report_department": 1, "salary_report": 0, "salary_calculate": 0},
+    # Xếp lịch: giáo vụ tìm lớp liên tục và lật sâu trong kết quả
+    "classroom-search": {"dashboard": 0, "teachers": 0, "classrooms": 1, "classrooms_search": 4, "classrooms_year": 1,
+                         "classrooms_deep": 2, "classrooms_search_deep": 4, "reports": 0, "report_school": 0,
+                         "report_department": 0, "salary_report": 0, "salary_calculate": 0},
+}
+
+def weighted_routes(routes, scenario):
+    overrides = SCENARIOS[scenario]
+    selected = []
+    for key, route in routes.items():
+        weight = overrides.get(key, route.weight)
+        if weight > 0:
+            selected.append((route, weight))
+    return selected
+
+# ========== Thống kê ==========
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank
+    index = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.samples = {}
+
+    def record(self, name, latency, error=None):
+        self.latencies.setdefault(name, []).append(latency)
+        if error is not None:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            self.samples.setdefault(name, set()).add(error)
+
+    def summary(self, elapsed):
+        rows = []
+        for name, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            errors = self.errors.get(name, 0)
+            rows.append({
+                "route": name,
+                "requests": len(values),
+                "errors": errors,
+                "error_rate": round(errors / len(values), 4),
+                "throughput": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 1),
+                "p95_ms": round(percentile(values, 95) * 1000, 1),
+                "p99_ms": round(percentile(values, 99) * 1000, 1),
+                "max_ms": round(values[-1] * 1000, 1),
+                "error_samples": sorted(self.samples.get(name, []))[:5],
+            })
+        return rows
+
+# ========== Người dùng ảo ==========
+def _headers(session, route):
+    if route.json:
+        headers = {"Accept": "application/json", "X-Requested-With": "XMLHttpRequest"}
+    else:
+        headers = {"X-Inertia": "true", "X-Requested-With": "XMLHttpRequest",
+                   "Accept": "text/html, application/xhtml+xml"}
+        if session.version is not None:
+            headers["X-Inertia-Version"] = session.version
+    return headers
+
+def next_cursor(response, prop):
+    try:
+        return response.json()["props"][prop]["next_cursor"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+async def send(client, session, route, stats):
+    headers = _headers(session, route)
+    if route.method != "GET":
+        token = client.cookies.get("XSRF-TOKEN")
+        if token:
+            headers["X-XSRF-TOKEN"] = unquote(token)
+    params = route.build_params()
+    for page in range(route.follow + 1):
+        started = time.perf_counter()
+        error = None
+        try:
+            response = await client.request(route.method, route.path, params=params, headers=headers)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}"
+            elif "/login" in response.url.path:
+                error = "bị chuyển về /login"
+        except httpx.HTTPError as e:
+            error = type(e).__name__
+        # Trang đầu và các trang lật tiếp thống kê riêng để thấy trang sâu có chậm dần không
+        name = route.name if page == 0 else f"{route.name} [cursor]"
+        stats.record(name, time.perf_counter() - started, error)
+        if error is not None or page == route.follow:
+            return
+        cursor = next_cursor(response, route.paginated)
+        if cursor is None:
+            return
+        params = {**(params or {}), "cursor": cursor}
+
+async def virtual_user(client, session, routes, stats, deadline, think, delay):
+    await asyncio.sleep(delay)
+    population = [route for route, _ in routes]
+    weights = [weight for _, weight in routes]
+    while time.perf_counter() < deadline:
+        route = random.choices(population, weights)[0]
+        await send(client, session, route, stats)
+        if think > 0:
+            await asyncio.sleep(random.uniform(0, think * 2))
+
+async def run_load(sessions, routes, args):
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    # Mỗi phiên đăng nhập một AsyncClient; người dùng ảo chia đều vào các phiên
+    clients = [httpx.AsyncClient(base_url=BASE_URL, cookies=session.client.cookies, timeout=args.timeout,
+                                 follow_redirects=True, limits=limits) for session in sessions]
+    started = time.perf_counter()
+    deadline = started + args.duration
+    try:
+        tasks = []
+        for i in range(args.users):
+            index = i % len(sessions)
+            delay = args.ramp_up * i / args.users
+            tasks.append(virtual_user(clients[index], sessions[index], routes, stats, deadline, args.think, delay))
+        await asyncio.gather(*tasks)
+    finally:
+        for client in clients:
+            await client.aclose()
+    return stats, time.perf_counter() - started
+
+def open_sessions(count):
+    def login(i):
+        session = InertiaSession(f"load-{i}")
+        session.login()
+        return session
+    with ThreadPoolExecutor(max_workers=min(count, 16)) as executor:
+        return list(executor.map(login, range(count)))
+
+# ========== Báo cáo ==========
+def print_summary(rows, elapsed, args):
+    print(f"\n========== KẾT QUẢ TẢI ({args.users} user, {elapsed:.0f}s, kịch bản {args.scenario}) ==========")
+    print(f"{'Route':<36}{'Req':>8}{'Err%':>8}{'Req/s':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for row in rows:
+        print(f"{row['route']:<36}{row['requests']:>8}{row['error_rate'] * 100:>7.1f}%{row['throughput']:>9.1f}"
+              f"{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}{row['p99_ms']:>9.0f}")
+        for sample in row["error_samples"]:
+            print(f"   ⚠️ {sample}")
+    total = sum(row["requests"] for row in rows)
+    errors = sum(row["errors"] for row in rows)
+    print(f"\nTổng: {total} request, {total / elapsed:.1f} req/s, lỗi {errors / max(total, 1) * 100:.2f}%")
+
+def write_summary(path, rows, elapsed, args):
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "base_url": BASE_URL,
+        "users": args.users,
+        "duration": round(elapsed, 3),
+        "scenario": args.scenario,
+        "routes": rows,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📄 Báo cáo JSON: {path}")
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tạo tải đồng thời lên các route chính")
+    parser.add_argument("-u", "--users", type=int, default=200, help="Số người dùng ảo đồng thời")
+    parser.add_argument("-d", "--duration", type=float, default=60, help="Thời gian chạy (giây)")
+    parser.add_argument("--ramp-up", type=float, default=10, help="Thời gian tăng dần số người dùng (giây)")
+    parser.add_argument("--think", type=float, default=1.0, help="Think time trung bình giữa hai request (giây)")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="browse")
+    parser.add_argument("--sessions", type=int, default=20, help="Số phiên đăng nhập dùng chung cho người dùng ảo")
+    parser.add_argument("--pages", type=int, default=5,
+                        help="Trang ngẫu nhiên tối đa của /teachers; số trang lật tiếp theo cursor của /classrooms")
+    parser.add_argument("--academic-year", type=int, default=None, help="academic_year_id cho bộ lọc và báo cáo")
+    parser.add_argument("--department", type=int, default=None, help="department_id cho báo cáo khoa")
+    parser.add_argument("--salary-config", type=int, default=None,
+                        help="SalaryConfig dùng cho /salary/{id}/report và /calculate (bỏ trống = không gọi)")
+    parser.add_argument("--search", nargs="+", default=None, help="Các từ khoá tìm lớp học")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--report", default=None, help="Ghi kết quả ra file JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    routes = weighted_routes(build_routes(args), args.scenario)
+    sessions = open_sessions(max(1, min(args.sessions, args.users)))
+    print(f"▶️ {args.users} user, {len(sessions)} phiên, {len(routes)} route, {args.duration:.0f}s")
+    try:
+        stats, elapsed = asyncio.run(run_load(sessions, routes, args))
+    finally:
+        for session in sessions:
+            session.close()
+    rows = stats.summary(elapsed)
+    print_summary(rows, elapsed, args)
+    if args.report:
+        write_summary(args.report, rows, elapsed, args)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,17 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from driverPool import create_driver
 
-# ✅ Hàm khởi tạo WebDriver chung có tắt log
-def create_driver():
-    options = Options()
-    options.add_argument("--log-level=3")
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    return webdriver.Chrome(options=options)
+# ✅ Runner không cần đăng nhập trước cho module này
+REQUIRES_LOGIN = False
 
 # ✅ Test đăng nhập thành công
-def test_login_success():
-    driver = create_driver()
+def test_login_success(driver=None):
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver()
     try:
         driver.get("http://localhost:8000/login")
         WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
@@ -28,12 +25,16 @@ def test_login_success():
 
     except Exception as e:
         print("❌ Login Success Test: FAILED", str(e))
+        raise
     finally:
-        driver.quit()
+        if own_driver:
+            driver.quit()
         
 # ✅ Test không nhập email và mật khẩu
-def test_empty_fields_validation():
-    driver = create_driver()
+def test_empty_fields_validation(driver=None):
+    own_driver = driver is None
+    if own_driver:
+        driver = create_driver()
     try:
         driver.get("http://localhost:8000/login")
 
@@ -72,11 +73,16 @@ def test_empty_fields_validation():
 
     except Exception as e:
         print("❌ Validation Test FAILED:", str(e))
+        raise
     finally:
-        driver.quit()
+        if own_driver:
+            driver.quit()
 
 # ✅ Gọi các hàm test
 if __name__ == "__main__":
-    test_login_success()
-    test_empty_fields_validation()
+    for test in (test_login_success, test_empty_fields_validation):
+        try:
+            test()
+        except Exception:
+            pass
 
@@ -0,0 +1,127 @@
+# Lọc danh sách lớp học chỉ tải lại danh sách (Inertia partial reload), không gửi lại dữ liệu dropdown.
+#
+# Mở /classrooms trên trình duyệt, gắn bộ ghi XHR (Inertia gửi request qua axios),
+# gõ từ khoá vào ô tìm kiếm rồi Enter. Request lọc phải xin `classrooms` qua header
+# X-Inertia-Partial-Data và response không được chứa courses/teachers/semesters/academicYears.
+# Khi server bật QUERY_STATS, số query của request lọc (header X-Query-Count) phải nằm trong
+# ngân sách của queryBudgetTest. Phần HTTP kiểm tra thêm: lần tải đầy đủ có dữ liệu dropdown
+# kèm phiên bản, partial reload thì không.
+#
+#   python partialReloadTest.py
+#   PARTIAL_RELOAD_SEARCH=Nguyễn python partialReloadTest.py
+
+import json
+import os
+import sys
+from driverPool import create_driver
+from httpRunner import InertiaSession
+from classroomTest import login
+from queryBudgetTest import BUDGETS
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+SEARCH_TERM = os.environ.get("PARTIAL_RELOAD_SEARCH", "LH")
+REFERENCE_PROPS = ["courses", "teachers", "semesters", "academicYears"]
+
+# Ghi lại mọi XHR: method, url, header gửi đi, tên các prop trong response Inertia và số query (nếu có)
+RECORD_XHR = """
+window.__inertiaRequests = [];
+const open = XMLHttpRequest.prototype.open;
+const setRequestHeader = XMLHttpRequest.prototype.setRequestHeader;
+const send = XMLHttpRequest.prototype.send;
+XMLHttpRequest.prototype.open = function (method, url) {
+    this.__record = { method: method, url: String(url), headers: {} };
+    return open.apply(this, arguments);
+};
+XMLHttpRequest.prototype.setRequestHeader = function (name, value) {
+    if (this.__record) this.__record.headers[name.toLowerCase()] = value;
+    return setRequestHeader.apply(this, arguments);
+};
+XMLHttpRequest.prototype.send = function () {
+    this.addEventListener('load', () => {
+        let props = null;
+        try { props = Object.keys(JSON.parse(this.responseText).props); } catch (e) {}
+        const queries = this.getResponseHeader('X-Query-Count');
+        window.__inertiaRequests.push({ ...this.__record, status: this.status, props: props, size: this.responseText.length,
+                                        queries: queries === null ? null : Number(queries) });
+    });
+    return send.apply(this, arguments);
+};
+"""
+
+# ========== Helpers ==========
+def search_requests(driver):
+    return [r for r in driver.execute_script("return window.__inertiaRequests || []") if "search=" in r["url"]]
+
+def search_via_ui(driver, term):
+    driver.get("http://localhost:8000/classrooms")
+    search_input = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.XPATH, "//input[@placeholder='Tên lớp, môn học, giáo viên...']"))
+    )
+    driver.execute_script(RECORD_XHR)
+    search_input.send_keys(term)
+    search_input.send_keys(Keys.ENTER)
+    WebDriverWait(driver, 10).until(lambda d: search_requests(d))
+    return search_requests(driver)[-1]
+
+# ========== Test Cases ==========
+def test_filter_sends_only_classrooms(driver):
+    login(driver)
+    request = search_via_ui(driver, SEARCH_TERM)
+    print(f"   {request['method']} {request['url']} -> {request['status']}, {request['size']} byte, props {request['props']}, "
+          f"{request['queries'] if request['queries'] is not None else '?'} query")
+
+    assert request["status"] == 200, f"request lọc trả về HTTP {request['status']}"
+    partial = request["headers"].get("x-inertia-partial-data", "")
+    assert "classrooms" in partial.split(","), f"request lọc không phải partial reload (X-Inertia-Partial-Data='{partial}')"
+    sent = [prop for prop in REFERENCE_PROPS if prop in (request["props"] or [])]
+    assert request["props"] and "classrooms" in request["props"], f"response không có classrooms: {request['props']}"
+    assert not sent, f"response lọc vẫn gửi lại dữ liệu dropdown: {sent}"
+    if request["queries"] is not None:
+        budget = BUDGETS["classrooms search"]
+        assert request["queries"] <= budget, f"request lọc chạy {request['queries']} query, ngân sách {budget}"
+
+def test_reference_props_versioned():
+    session = InertiaSession("benchmark")
+    session.login()
+    try:
+        full = session.visit("GET", "/classrooms")
+        assert full is not None, "GET /classrooms không trả về trang Inertia"
+        missing = [prop for prop in REFERENCE_PROPS + ["referenceVersion", "loadedReferenceVersion"] if prop not in full["props"]]
+        assert not missing, f"lần tải đầy đủ thiếu prop: {missing}"
+
+        partial = session.visit("GET", f"/classrooms?search={SEARCH_TERM}", component="Classrooms",
+                                only=["classrooms", "referenceVersion"])
+        sent = [prop for prop in REFERENCE_PROPS if prop in partial["props"]]
+        assert not sent, f"partial reload vẫn gửi: {sent}"
+        assert partial["props"]["referenceVersion"] == full["props"]["loadedReferenceVersion"], \
+            "phiên bản dữ liệu dropdown đổi dù không ai sửa"
+
+        full_size = len(json.dumps(full["props"], ensure_ascii=False))
+        partial_size = len(json.dumps(partial["props"], ensure_ascii=False))
+        print(f"   props đầy đủ {full_size} byte, partial {partial_size} byte")
+    finally:
+        session.close()
+
+# ========== Main ==========
+if __name__ == "__main__":
+    failed = False
+    try:
+        test_reference_props_versioned()
+        print("✅ Dữ liệu dropdown có phiên bản, partial reload không gửi lại: PASSED")
+    except AssertionError as e:
+        print(f"❌ Phiên bản dữ liệu dropdown: FAILED - {e}")
+        failed = True
+
+    driver = create_driver()
+    try:
+        test_filter_sends_only_classrooms(driver)
+        print("✅ Lọc lớp học chỉ tải lại prop classrooms: PASSED")
+    except AssertionError as e:
+        print(f"❌ Lọc lớp học (partial reload): FAILED - {e}")
+        failed = True
+    finally:
+        driver.quit()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,115 @@
+# Benchmark xuất PDF: lần tải đầu (cache nguội, DomPDF render) so với các lần sau (đọc file cache).
+#
+# Với mỗi báo cáo, script xoá thư mục pdf-cache trên disk local, tải PDF một
+# lần (cold) rồi tải lại --repeat lần (warm), ghi thời gian và kích thước.
+# Thư mục cache mặc định là storage/app/private/pdf-cache (PDF_CACHE_DISK=local).
+#
+#   python pdfBenchmark.py --academic-year 1 --department 1 --teacher 3 --salary-config 2
+#   python pdfBenchmark.py --academic-year 1 --repeat 10 --output pdf-bench.json
+
+from datetime import datetime
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import time
+from httpRunner import InertiaSession
+from salaryBenchmark import ROOT
+
+CACHE_DIR = os.path.join(ROOT, "storage", "app", "private", "pdf-cache")
+
+# ========== Báo cáo ==========
+def build_targets(args):
+    targets = []
+    if args.academic_year:
+        targets.append(("school", "/reports/export-pdf", {"type": "school", "academic_year_id": args.academic_year}))
+        if args.department:
+            targets.append(("department", "/reports/export-pdf", {"type": "department",
+                                                                  "department_id": args.department,
+                                                                  "academic_year_id": args.academic_year}))
+        if args.teacher:
+            targets.append(("teacher", "/reports/export-pdf", {"type": "teacher", "teacher_id": args.teacher,
+                                                               "academic_year_id": args.academic_year}))
+    if args.salary_config:
+        targets.append(("salary", f"/salary/{args.salary_config}/export-pdf", None))
+    return targets
+
+def clear_cache(cache_dir):
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+def download(session, path, params, timeout):
+    started = time.perf_counter()
+    response = session.client.get(path, params=params, timeout=timeout)
+    elapsed = time.perf_counter() - started
+    ok = (response.status_code == 200 and response.headers.get("Content-Type", "").startswith("application/pdf")
+          and response.content.startswith(b"%PDF"))
+    return elapsed, ok, len(response.content), response.status_code
+
+# ========== Đo ==========
+def measure(session, targets, args):
+    rows = []
+    for name, path, params in targets:
+        if not args.no_clear:
+            clear_cache(args.cache_dir)
+        cold, ok, size, status = download(session, path, params, args.timeout)
+        if not ok:
+            rows.append({"report": name, "error": f"HTTP {status}, không nhận được PDF"})
+            print(f"   ❌ {name}: HTTP {status}, không nhận được PDF")
+            continue
+        warm = []
+        for _ in range(args.repeat):
+            elapsed, ok, _, status = download(session, path, params, args.timeout)
+            if ok:
+                warm.append(elapsed)
+        row = {
+            "report": name,
+            "bytes": size,
+            "cold_ms": round(cold * 1000, 1),
+            "warm_p50_ms": round(statistics.median(warm) * 1000, 1) if warm else None,
+            "warm_max_ms": round(max(warm) * 1000, 1) if warm else None,
+            "warm_ok": len(warm),
+            "speedup": round(cold / statistics.median(warm), 1) if warm else None,
+        }
+        rows.append(row)
+        print(f"   {name:<12} cold {row['cold_ms']:>9.0f} ms   warm p50 {row['warm_p50_ms'] or 0:>7.0f} ms   "
+              f"x{row['speedup']}   {size / 1024:.0f} KB")
+    return rows
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Đo độ trễ xuất PDF khi cache nguội và khi đã có cache")
+    parser.add_argument("--academic-year", type=int, default=None, help="academic_year_id cho báo cáo năm")
+    parser.add_argument("--department", type=int, default=None, help="department_id cho báo cáo khoa")
+    parser.add_argument("--teacher", type=int, default=None, help="teacher_id cho báo cáo giáo viên")
+    parser.add_argument("--salary-config", type=int, default=None, help="SalaryConfig cho /salary/{id}/export-pdf")
+    parser.add_argument("--repeat", type=int, default=5, help="Số lần tải lại khi cache đã có")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Thư mục pdf-cache trên disk local")
+    parser.add_argument("--no-clear", action="store_true", help="Không xoá cache trước lần tải đầu")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", default=None, help="Ghi kết quả ra file JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    targets = build_targets(args)
+    if not targets:
+        print("Cần ít nhất --academic-year hoặc --salary-config")
+        return 2
+    session = InertiaSession("benchmark")
+    session.login()
+    try:
+        print(f"▶️ {len(targets)} báo cáo, {args.repeat} lần tải lại mỗi báo cáo")
+        rows = measure(session, targets, args)
+    finally:
+        session.close()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"started_at": datetime.now().isoformat(timespec="seconds"), "reports": rows},
+                      f, ensure_ascii=False, indent=2)
+        print(f"📄 Kết quả JSON: {args.output}")
+    return 1 if any("error" in row for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
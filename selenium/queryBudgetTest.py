@@ -0,0 +1,137 @@
+# Ngân sách số query cho các route chính, đọc từ header X-Query-* của server.
+#
+# Script chạy `php artisan serve` riêng với QUERY_STATS=true (middleware
+# AddQueryStatsHeaders gắn số query, thời gian DB, query lặp y hệt và mẫu N+1 vào
+# response), gửi request tới từng route và so với BUDGETS. Số query chỉ tính query
+# của ứng dụng; query của session/cache (phụ thuộc driver) in riêng để tham khảo.
+# Báo cáo khoa được đo ở hai kích thước khoa (seed qua reportLoadTest): số query
+# phải bằng nhau, tức không tăng theo số giáo viên.
+#
+#   python queryBudgetTest.py
+#   QUERY_BUDGET_SIZES=20,2000 python queryBudgetTest.py
+
+import os
+import sys
+import httpx
+import salaryBenchmark
+from cacheBackendBenchmark import start_server, stop_server
+from httpRunner import InertiaSession, query_stats
+from reportLoadTest import seed_teachers, close_configs, cleanup
+
+PORT = int(os.environ.get("QUERY_BUDGET_PORT", "8210"))
+SIZES = [int(n) for n in os.environ.get("QUERY_BUDGET_SIZES", "10,300").split(",")]
+SERVER_ENV = {"QUERY_STATS": "true"}
+
+# Số query ứng dụng tối đa cho mỗi route (không tính session/cache)
+BUDGETS = {
+    "classrooms": 10,
+    "classrooms search": 10,
+    "teachers": 10,
+    "report school": 15,
+    "report department": 15,
+}
+
+# ========== Helpers ==========
+def build_routes(seeded):
+    year = seeded["academic_year_id"]
+    # (tên trong BUDGETS, đường dẫn, trả JSON)
+    return [
+        ("classrooms", "/classrooms", False),
+        ("classrooms search", "/classrooms?search=RP", False),
+        ("teachers", "/teachers", False),
+        ("report school", f"/reports/school?academic_year_id={year}", True),
+        ("report department", f"/reports/department?department_id={seeded['department_id']}&academic_year_id={year}",
+         True),
+    ]
+
+def fetch_stats(session, path, as_json):
+    if as_json:
+        response = session.client.get(path, headers={"Accept": "application/json",
+                                                      "X-Requested-With": "XMLHttpRequest"})
+        assert response.status_code == 200, f"GET {path} trả về HTTP {response.status_code}"
+        stats = query_stats(response)
+    else:
+        page = session.visit("GET", path)
+        assert page is not None, f"GET {path} không trả về trang Inertia"
+        stats = session.last_stats
+    assert stats is not None, f"GET {path} không có header X-Query-Count (server chưa bật QUERY_STATS?)"
+    return stats
+
+def print_stats(label, stats):
+    print(f"   {label:<32} {stats['count']:>3} query (+{stats['infra_count']} session/cache)  "
+          f"{stats['time_ms']:>7.1f} ms  lặp y hệt {stats['duplicates']}")
+    for pattern in stats["repeated"]:
+        print(f"      ↻ {pattern['count']}x {pattern['sql']}")
+
+def check_budget(name, stats):
+    budget = BUDGETS[name]
+    assert stats["count"] <= budget, f"{name}: {stats['count']} query, ngân sách {budget}"
+    assert not stats["repeated"], (
+        f"{name}: có mẫu N+1 - " + "; ".join(f"{p['count']}x {p['sql']}" for p in stats["repeated"])
+    )
+
+def open_session(url):
+    client = httpx.Client(base_url=url, timeout=60, follow_redirects=True)
+    session = InertiaSession("query-budget", client=client)
+    session.login()
+    return session
+
+# ========== Test Cases ==========
+def test_route_budgets(session, db):
+    seeded = seed_teachers(db, SIZES[0])
+    try:
+        close_configs(session, seeded)
+        failures = []
+        for name, path, as_json in build_routes(seeded):
+            stats = fetch_stats(session, path, as_json)
+            print_stats(name, stats)
+            try:
+                check_budget(name, stats)
+            except AssertionError as e:
+                failures.append(str(e))
+        assert not failures, " | ".join(failures)
+    finally:
+        cleanup(db, seeded)
+
+def test_department_report_constant(session, db):
+    counts = {}
+    for size in SIZES:
+        seeded = seed_teachers(db, size)
+        try:
+            close_configs(session, seeded)
+            name, path, as_json = build_routes(seeded)[-1]
+            stats = fetch_stats(session, path, as_json)
+        finally:
+            cleanup(db, seeded)
+        print_stats(f"{name} ({size} GV)", stats)
+        check_budget(name, stats)
+        counts[size] = stats["count"]
+    assert len(set(counts.values())) == 1, f"số query báo cáo khoa tăng theo số giáo viên: {counts}"
+
+# ========== Main ==========
+if __name__ == "__main__":
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    process = None
+    failed = False
+    try:
+        process, url = start_server("query-stats", PORT, 30, env=SERVER_ENV)
+        session = open_session(url)
+        try:
+            for label, test in [("Ngân sách query các route chính", test_route_budgets),
+                                ("Số query báo cáo khoa không đổi theo số giáo viên", test_department_report_constant)]:
+                try:
+                    test(session, db)
+                    print(f"✅ {label}: PASSED")
+                except AssertionError as e:
+                    print(f"❌ {label}: FAILED - {e}")
+                    failed = True
+        finally:
+            session.close()
+    except (RuntimeError, httpx.HTTPError) as e:
+        print(f"❌ {e}")
+        failed = True
+    finally:
+        if process is not None:
+            stop_server(process)
+        db.close()
+    sys.exit(1 if failed else 0)
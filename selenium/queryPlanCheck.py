@@ -0,0 +1,257 @@
+# Kiểm tra query plan của các route chính: quét toàn bảng trên query nóng thì báo lỗi.
+#
+# Script seed N lớp học kèm dòng lương vào DB theo .env (qua exportTest/salaryBenchmark),
+# chạy `php artisan serve` riêng với DB_LOG_QUERIES=true (server dev không bị ảnh hưởng),
+# gửi request tới từng route rồi đọc các dòng "Query executed {...}" trong laravel.log.
+# Mỗi câu SQL khác nhau được EXPLAIN (SQLite: EXPLAIN QUERY PLAN, MySQL: EXPLAIN).
+# Query có WHERE mà quét toàn bộ một bảng lớn là lỗi; thêm vài query nóng không có
+# route GET (kiểm tra trùng tên khi tạo lớp hàng loạt...) được EXPLAIN trực tiếp.
+# Route đánh dấu không nóng (dashboard đã cache theo widget) chỉ in cảnh báo.
+#
+#   python queryPlanCheck.py
+#   python queryPlanCheck.py --size 100000 --output plans.json
+#   python queryPlanCheck.py --allow "YEAR\(" --keep
+
+from datetime import datetime
+import argparse
+import json
+import re
+import sys
+import time
+import httpx
+import salaryBenchmark
+from cacheBackendBenchmark import start_server, stop_server
+from exportTest import seed_salaries
+from httpRunner import InertiaSession
+
+BIG_TABLES = {"classrooms", "teacher_salaries", "teachers", "courses", "users",
+              "classroom_search_tokens", "salary_aggregates"}
+SERVER_ENV = {"DB_LOG_QUERIES": "true", "LOG_LEVEL": "debug"}
+_LOG_RE = re.compile(r"Query executed (\{.*\})")
+_TABLE_RE = re.compile(r'\b(?:from|join)\s+[`"]?(\w+)[`"]?(?:\s+(?:as\s+)?[`"]?(\w+)[`"]?)?', re.I)
+_SQL_WORDS = {"where", "on", "inner", "left", "right", "join", "group", "order", "limit", "union", "as", "using"}
+
+# ========== Route & query nóng ==========
+def build_routes(seeded, teacher_id, department_id):
+    year, semester, config = seeded["academic_year_id"], seeded["semester_id"], seeded["salary_config_id"]
+    # (tên, đường dẫn, trả JSON, query nóng, prop cursor cần lật thêm một trang)
+    return [
+        ("dashboard", "/dashboard", False, False, None),
+        ("teachers", "/teachers", False, True, None),
+        ("teachers trang 20", "/teachers?page=20", False, True, None),
+        ("classrooms", "/classrooms", False, True, "classrooms"),
+        ("classrooms học kỳ", f"/classrooms?semester_id={semester}", False, True, "classrooms"),
+        ("classrooms năm học", f"/classrooms?academic_year_id={year}", False, True, None),
+        ("classrooms tìm kiếm", "/classrooms?search=BM", False, True, None),
+        ("salary report", f"/salary/{config}/report", False, True, None),
+        ("report school", f"/reports/school?academic_year_id={year}", True, True, None),
+        ("report department", f"/reports/department?department_id={department_id}&academic_year_id={year}",
+         True, True, None),
+        ("report teacher", f"/reports/teacher-yearly?teacher_id={teacher_id}&academic_year_id={year}",
+         True, True, None),
+    ]
+
+def hot_queries(seeded, teacher_id, department_id, course_id):
+    # Query ghi (POST) hoặc chạy trong job, không bắt được bằng GET
+    semester, config = seeded["semester_id"], seeded["salary_config_id"]
+    return [
+        ("trùng tên lớp hàng loạt",
+         "select name from classrooms where semester_id = ? and course_id = ? and name in (?, ?, ?)",
+         (semester, course_id, "Lớp N01", "Lớp N02", "Lớp N03")),
+        ("lương theo cấu hình + giáo viên",
+         "select * from teacher_salaries where salary_config_id = ? and teacher_id = ?", (config, teacher_id)),
+        ("học kỳ theo năm học",
+         "select * from semesters where academicYear_id = ? order by name", (seeded["academic_year_id"],)),
+        ("giáo viên theo khoa",
+         "select * from teachers where department_id = ? order by id limit 10", (department_id,)),
+        ("lớp của giáo viên trong học kỳ",
+         "select count(*) from classrooms where teacher_id = ? and semester_id = ?", (teacher_id, semester)),
+    ]
+
+# ========== Bắt SQL ==========
+def read_queries(offset):
+    try:
+        with open(salaryBenchmark.LOG_FILE, encoding="utf-8", errors="replace") as f:
+            f.seek(offset)
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    queries = []
+    for line in lines:
+        match = _LOG_RE.search(line)
+        if match:
+            queries.append(json.loads(match.group(1)))
+    return queries
+
+def next_page_url(response, prop):
+    try:
+        return response.json()["props"][prop]["next_page_url"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+def capture(url, routes, timeout):
+    client = httpx.Client(base_url=url, timeout=timeout, follow_redirects=True)
+    session = InertiaSession("query-plan", client=client)
+    session.login()
+    captured = []
+    try:
+        for name, path, as_json, hot, cursor_prop in routes:
+            pages = [(name, path)]
+            while pages:
+                label, target = pages.pop(0)
+                headers = ({"Accept": "application/json", "X-Requested-With": "XMLHttpRequest"}
+                           if as_json else session.headers())
+                offset = salaryBenchmark.log_offset()
+                response = client.get(target, headers=headers)
+                # Việc chạy sau khi trả response (Cache::flexible làm mới) cũng ghi vào cùng cửa sổ log
+                time.sleep(0.2)
+                captured.append({"route": label, "path": target, "status": response.status_code, "hot": hot,
+                                 "queries": read_queries(offset)})
+                if cursor_prop and label == name:
+                    following = next_page_url(response, cursor_prop)
+                    if following:
+                        pages.append((f"{name} (cursor)", following))
+    finally:
+        session.close()
+    return captured
+
+# ========== EXPLAIN ==========
+def table_aliases(sql):
+    aliases = {}
+    for table, alias in _TABLE_RE.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in _SQL_WORDS:
+            aliases[alias] = table
+    return aliases
+
+def explain(db, sql, bindings):
+    if db.driver == "sqlite":
+        return [row[3] for row in db.execute(f"EXPLAIN QUERY PLAN {sql}", tuple(bindings)).fetchall()]
+    # pymysql dùng %s làm placeholder nên % trong câu SQL phải nhân đôi
+    cursor = db.execute(f"EXPLAIN {sql.replace('%', '%%')}", tuple(bindings))
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def scanned_tables(db, sql, plan):
+    aliases = table_aliases(sql)
+    tables = []
+    for step in plan:
+        if db.driver == "sqlite":
+            # "SCAN classrooms" là quét bảng; "SCAN ... USING (COVERING) INDEX" đi theo index
+            match = re.match(r"SCAN (?:TABLE )?(\w+)(.*)", step)
+            if match and "INDEX" not in match.group(2).upper():
+                tables.append(aliases.get(match.group(1), match.group(1)))
+        elif step.get("type") == "ALL" and step.get("table"):
+            tables.append(aliases.get(step["table"], step["table"]))
+    return tables
+
+def check_query(db, sql, bindings, only_big_tables, allow):
+    try:
+        plan = explain(db, sql, bindings)
+    except Exception as e:  # noqa: BLE001 - sqlite3 và pymysql có lớp lỗi riêng
+        return {"sql": sql, "error": f"{type(e).__name__}: {e}", "plan": [], "scans": [], "allowed": None}
+    scans = scanned_tables(db, sql, plan)
+    if only_big_tables:
+        # Chỉ query có điều kiện lọc; đọc cả bảng không WHERE (dropdown, đếm tổng) là cố ý
+        filtered = re.search(r"\bwhere\b", sql, re.I)
+        scans = [table for table in scans if filtered and table in BIG_TABLES]
+    allowed = next((pattern for pattern in allow if re.search(pattern, sql, re.I)), None)
+    return {"sql": sql, "plan": plan, "scans": scans, "allowed": allowed}
+
+def check_routes(db, captured, allow):
+    results = []
+    for route in captured:
+        seen = {}
+        for query in route["queries"]:
+            seen.setdefault(query["sql"], query)
+        checks = [check_query(db, sql, query["bindings"], True, allow) for sql, query in seen.items()]
+        results.append({**{key: route[key] for key in ("route", "path", "status", "hot")},
+                        "queries": len(route["queries"]), "checks": checks})
+    return results
+
+# ========== Báo cáo ==========
+def print_results(route_results, hot_results):
+    failures = 0
+    for result in route_results:
+        scans = [check for check in result["checks"] if check["scans"]]
+        errors = [check for check in result["checks"] if check.get("error")]
+        bad = result["status"] != 200 or (result["hot"] and any(not check["allowed"] for check in scans))
+        failures += bad
+        mark = "❌" if bad else ("⚠️" if scans else "✅")
+        print(f"{mark} {result['route']:<28} HTTP {result['status']}  {result['queries']:>3} query, "
+              f"{len(result['checks'])} khác nhau, {len(scans)} quét toàn bảng")
+        for check in scans:
+            note = f" (bỏ qua: {check['allowed']})" if check["allowed"] else ""
+            print(f"     {', '.join(check['scans'])}{note}: {check['sql'][:160]}")
+        for check in errors:
+            print(f"     ⚠️ không EXPLAIN được ({check['error']}): {check['sql'][:120]}")
+    print("\n▶️ Query nóng không qua route GET")
+    for name, check in hot_results:
+        bad = bool(check["scans"]) and not check["allowed"]
+        failures += bad
+        mark = "❌" if bad or check.get("error") else "✅"
+        detail = f" quét {', '.join(check['scans'])}" if check["scans"] else ""
+        print(f"{mark} {name}{detail}{' - ' + check['error'] if check.get('error') else ''}")
+    return failures
+
+def first_row(db, query):
+    return db.execute(query).fetchone()
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN các query của route chính, báo lỗi khi quét toàn bảng")
+    parser.add_argument("--size", type=int, default=10000, help="Số lớp học (kèm dòng lương) seed thêm")
+    parser.add_argument("--allow", nargs="*", default=[], help="Regex SQL được phép quét toàn bảng")
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--ready-timeout", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--keep", action="store_true", help="Giữ dữ liệu seed sau khi chạy")
+    parser.add_argument("--output", default=None, help="Ghi plan của mọi query ra file JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    seeded = seed_salaries(db, args.size)
+    # Báo cáo lương chỉ mở với cấu hình đã tính
+    db.execute("UPDATE salary_configs SET status = 'active' WHERE id = ?", (seeded["salary_config_id"],))
+    db.commit()
+    if db.driver == "mysql":
+        # Thống kê mới để optimizer chọn plan như trên dữ liệu thật
+        db.execute("ANALYZE TABLE classrooms, teacher_salaries, teachers, semesters")
+    teacher_id, department_id = first_row(db, "SELECT id, department_id FROM teachers ORDER BY id LIMIT 1")
+    course_id = first_row(db, "SELECT id FROM courses ORDER BY id LIMIT 1")[0]
+    print(f"▶️ Đã seed {args.size} lớp + dòng lương ({seeded['seed_seconds']}s), DB {db.driver}")
+
+    process = None
+    try:
+        process, url = start_server("query-log", args.port, args.ready_timeout, env=SERVER_ENV)
+        captured = capture(url, build_routes(seeded, teacher_id, department_id), args.timeout)
+        route_results = check_routes(db, captured, args.allow)
+        hot_results = [(name, check_query(db, sql, params, False, args.allow))
+                       for name, sql, params in hot_queries(seeded, teacher_id, department_id, course_id)]
+    except (RuntimeError, httpx.HTTPError) as e:
+        print(f"❌ {e}")
+        return 2
+    finally:
+        if process is not None:
+            stop_server(process)
+        if not args.keep:
+            salaryBenchmark.cleanup(db, seeded)
+        db.close()
+
+    failures = print_results(route_results, hot_results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"started_at": datetime.now().isoformat(timespec="seconds"), "size": args.size,
+                       "routes": route_results, "hot_queries": [{"name": name, **check} for name, check in hot_results]},
+                      f, ensure_ascii=False, indent=2, default=str)
+        print(f"\n📄 Plan JSON: {args.output}")
+    if failures:
+        print(f"\n❌ {failures} route/query nóng quét toàn bảng")
+        return 1
+    print("\n✅ Không có query nóng nào quét toàn bảng")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+# Tải lên /reports/school và /reports/department khi số giáo viên tăng dần.
+#
+# Với mỗi kích thước, seed thẳng vào DB (qua salaryBenchmark.Database) một khoa
+# mới có N giáo viên, một năm học hai học kỳ và một dòng lương cho mỗi giáo
+# viên mỗi học kỳ, đóng các bảng lương (PATCH /salary/{id}/close, chốt bảng
+# salary_aggregates) rồi chạy kịch bản "reports" của loadTest. Báo cáo đọc từ
+# bảng tổng hợp nên p50 ở kích thước lớn nhất chỉ được chậm hơn một khoảng nhỏ
+# so với kích thước nhỏ nhất.
+#
+#   python reportLoadTest.py
+#   REPORT_LOAD_SIZES=1000,5000,20000 REPORT_LOAD_USERS=50 python reportLoadTest.py
+
+import asyncio
+import os
+import random
+import sys
+import uuid
+import loadTest
+import salaryBenchmark
+
+SIZES = [int(n) for n in os.environ.get("REPORT_LOAD_SIZES", "250,1000,4000").split(",")]
+USERS = int(os.environ.get("REPORT_LOAD_USERS", "20"))
+DURATION = float(os.environ.get("REPORT_LOAD_DURATION", "20"))
+# Cho phép lệch tối đa: gấp 2 hoặc thêm 150 ms so với kích thước nhỏ nhất (lấy giá trị lớn hơn)
+MAX_GROWTH_RATIO = 2.0
+MAX_GROWTH_MS = 150
+
+# ========== Seed ==========
+def seed_teachers(db, size):
+    _, course_ids = salaryBenchmark.ensure_reference_data(db)
+    now = salaryBenchmark._now()
+    tag = uuid.uuid4().hex[:8]
+
+    department_id = db.insert("departments", {"name": f"Khoa tải báo cáo {tag}", "abbrName": f"R{tag}",
+                                              "created_at": now, "updated_at": now})
+    degree_id = db.insert("degrees", {"name": f"Bằng cấp tải báo cáo {tag}", "baseSalaryFactor": 1.5,
+                                      "created_at": now, "updated_at": now})
+    db.insert_many("teachers", ["fullName", "DOB", "phone", "email", "degree_id", "department_id",
+                                "created_at", "updated_at"],
+                   ((f"GV báo cáo {i}", "1985-01-01", f"09{random.randint(10000000, 99999999)}",
+                     f"report{tag}{i}@example.com", degree_id, department_id, now, now)
+                    for i in range(size)))
+    teacher_ids = db.scalar_list("SELECT id FROM teachers WHERE department_id = ?", (department_id,))
+
+    year_id = db.insert("academic_years", {"name": f"Tải báo cáo {tag}", "startDate": "2099-09-01",
+                                           "endDate": "2100-06-30", "created_at": now, "updated_at": now})
+    semesters = []
+    for index, (start, end) in enumerate([("2099-09-01", "2100-01-15"), ("2100-02-01", "2100-06-30")], 1):
+        semester_id = db.insert("semesters", {"name": f"Học kỳ {index}", "startDate": start, "endDate": end,
+                                              "academicYear_id": year_id, "created_at": now, "updated_at": now})
+        config_id = db.insert("salary_configs", {"semester_id": semester_id, "base_salary_per_lesson": 100000,
+                                                 "status": "active", "created_at": now, "updated_at": now})
+        db.insert_many("classrooms", ["name", "code", "students", "semester_id", "course_id", "teacher_id",
+                                      "created_at", "updated_at"],
+                       ((f"RP-{tag}-{index}-{i}", f"RP{tag}{index}{i:07d}", 45, semester_id,
+                         random.choice(course_ids), teacher_id, now, now)
+                        for i, teacher_id in enumerate(teacher_ids)))
+        classrooms = db.execute("SELECT id, teacher_id FROM classrooms WHERE semester_id = ?",
+                                (semester_id,)).fetchall()
+        db.insert_many("teacher_salaries", ["teacher_id", "classroom_id", "salary_config_id", "actual_lessons",
+                                            "class_coefficient", "course_coefficient", "teacher_coefficient",
+                                            "converted_lessons", "total_salary", "created_at", "updated_at"],
+                       ((teacher_id, classroom_id, config_id, 30, 0.0, 1.2, 1.5, 36, 36 * 1.5 * 100000, now, now)
+                        for classroom_id, teacher_id in classrooms))
+        semesters.append((semester_id, config_id))
+    db.commit()
+    return {"department_id": department_id, "degree_id": degree_id, "academic_year_id": year_id,
+            "semesters": semesters}
+
+def close_configs(session, seeded):
+    # Đóng bảng lương → app tổng hợp và chốt salary_aggregates cho học kỳ
+    for _, config_id in seeded["semesters"]:
+        page = session.visit("PATCH", f"/salary/{config_id}/close", referer="/salary")
+        assert page is not None and not page["props"].get("errors"), f"không đóng được bảng lương {config_id}"
+
+def cleanup(db, seeded):
+    db.execute("DELETE FROM salary_aggregates WHERE academic_year_id = ?", (seeded["academic_year_id"],))
+    for semester_id, config_id in seeded["semesters"]:
+        db.execute("DELETE FROM teacher_salaries WHERE salary_config_id = ?", (config_id,))
+        db.execute("DELETE FROM classrooms WHERE semester_id = ?", (semester_id,))
+        db.execute("DELETE FROM salary_configs WHERE id = ?", (config_id,))
+        db.execute("DELETE FROM semesters WHERE id = ?", (semester_id,))
+    db.execute("DELETE FROM academic_years WHERE id = ?", (seeded["academic_year_id"],))
+    db.execute("DELETE FROM teachers WHERE department_id = ?", (seeded["department_id"],))
+    db.execute("DELETE FROM departments WHERE id = ?", (seeded["department_id"],))
+    db.execute("DELETE FROM degrees WHERE id = ?", (seeded["degree_id"],))
+    db.commit()
+
+# ========== Đo ==========
+def run_reports(sessions, seeded):
+    args = loadTest.parse_args(["--users", str(USERS), "--duration", str(DURATION), "--ramp-up", "1",
+                                "--think", "0", "--scenario", "reports",
+                                "--academic-year", str(seeded["academic_year_id"]),
+                                "--department", str(seeded["department_id"])])
+    routes = loadTest.weighted_routes(loadTest.build_routes(args), args.scenario)
+    stats, elapsed = asyncio.run(loadTest.run_load(sessions, routes, args))
+    return {row["route"]: row for row in stats.summary(elapsed)}
+
+def measure_latency(sizes=SIZES):
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    sessions = loadTest.open_sessions(min(USERS, 4))
+    results = {}
+    try:
+        for size in sizes:
+            seeded = seed_teachers(db, size)
+            try:
+                close_configs(sessions[0], seeded)
+                rows = run_reports(sessions, seeded)
+            finally:
+                cleanup(db, seeded)
+            for route, row in rows.items():
+                assert row["errors"] == 0, f"{route} lỗi với {size} giáo viên: {row['error_samples']}"
+                print(f"   {size:>6} GV  {route:<24} p50 {row['p50_ms']:>7.0f} ms  p95 {row['p95_ms']:>7.0f} ms  "
+                      f"{row['throughput']:.1f} req/s")
+            results[size] = rows
+    finally:
+        for session in sessions:
+            session.close()
+        db.close()
+    return results
+
+# ========== Test Cases ==========
+def test_report_latency_stays_flat():
+    results = measure_latency()
+    smallest, largest = results[min(results)], results[max(results)]
+    for route, row in smallest.items():
+        base = row["p50_ms"]
+        limit = max(base * MAX_GROWTH_RATIO, base + MAX_GROWTH_MS)
+        current = largest[route]["p50_ms"]
+        assert current <= limit, (
+            f"{route} chậm dần theo số giáo viên: p50 {base:.0f} ms ({min(results)} GV) → "
+            f"{current:.0f} ms ({max(results)} GV), giới hạn {limit:.0f} ms"
+        )
+
+# ========== Main ==========
+if __name__ == "__main__":
+    try:
+        test_report_latency_stays_flat()
+        print("✅ Độ trễ báo cáo ổn định theo số giáo viên: PASSED")
+    except AssertionError as e:
+        print(f"❌ Độ trễ báo cáo: FAILED - {e}")
+        sys.exit(1)
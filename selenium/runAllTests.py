@@ -0,0 +1,202 @@
+# Chạy toàn bộ test selenium song song trên nhiều Chrome headless.
+#
+#   python runAllTests.py                      # số worker = số CPU
+#   python runAllTests.py -w 4 -m teacherTest courseTest
+#   python runAllTests.py --report report.json --headed
+#   python runAllTests.py --ui-only            # bỏ các case đã chạy qua httpRunner.py
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import argparse
+import importlib
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from driverPool import DriverPool
+
+MODULES = [
+    "loginTest",
+    "teacherTest",
+    "classroomTest",
+    "courseTest",
+    "academicYearTest",
+    "degreeTest",
+    "departmentTest",
+]
+
+# ========== Thu thập test ==========
+class TestJob:
+    def __init__(self, module, name, func, requires_login):
+        self.module = module
+        self.name = name
+        self.func = func
+        self.requires_login = requires_login
+
+    @property
+    def id(self):
+        return f"{self.module.__name__}::{self.name}"
+
+def collect_tests(module):
+    jobs = []
+    requires_login = getattr(module, "REQUIRES_LOGIN", True)
+
+    # vars() giữ đúng thứ tự khai báo trong file
+    for name, func in list(vars(module).items()):
+        if not name.startswith("test_") or not inspect.isfunction(func):
+            continue
+        if func.__module__ != module.__name__:
+            continue
+        params = list(inspect.signature(func).parameters)
+
+        # departmentTest: test_case(driver, title, ...) chạy theo bảng `tests`
+        if name == "test_case" and hasattr(module, "tests"):
+            for row in module.tests:
+                jobs.append(TestJob(module, row[0], lambda d, f=func, r=row: f(d, *r), requires_login))
+            continue
+
+        if params and params[0] != "driver":
+            continue
+        jobs.append(TestJob(module, name, func, requires_login))
+    return jobs
+
+def http_covered(job):
+    # Các case validate đã có bản HTTP (HTTP_CASES) không cần mở trình duyệt
+    return job.name in {case[0] for case in getattr(job.module, "HTTP_CASES", [])}
+
+def collect_all(module_names):
+    jobs = []
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        jobs.extend(collect_tests(module))
+    return jobs
+
+# ========== Worker ==========
+def save_page_source(driver, job, artifacts_dir):
+    os.makedirs(artifacts_dir, exist_ok=True)
+    safe_name = "".join(c if c.isalnum() else "_" for c in job.id)
+    filename = os.path.join(artifacts_dir, f"error_{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html")
+    try:
+        with open(filename, "w", encoding="utf-8") as f:
+            f.write(driver.page_source)
+        return filename
+    except Exception:
+        return None
+
+def run_job(pool, job, artifacts_dir):
+    started = time.perf_counter()
+    result = {"id": job.id, "module": job.module.__name__, "name": job.name,
+              "worker": threading.current_thread().name}
+    try:
+        with pool.lease(authenticated=job.requires_login) as driver:
+            try:
+                outcome = job.func(driver)
+                if outcome is False:
+                    raise AssertionError("test trả về False")
+            except Exception:
+                result["page_source"] = save_page_source(driver, job, artifacts_dir)
+                raise
+        result["passed"] = True
+    except Exception as e:
+        result["passed"] = False
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    result["duration"] = round(time.perf_counter() - started, 3)
+    return result
+
+# ========== Báo cáo ==========
+def print_report(results, wall_time, workers):
+    print("\n========== KẾT QUẢ TỔNG HỢP ==========")
+    by_module = {}
+    for result in results:
+        by_module.setdefault(result["module"], []).append(result)
+
+    for module_name, module_results in by_module.items():
+        passed = sum(1 for r in module_results if r["passed"])
+        print(f"\n📦 {module_name}: {passed}/{len(module_results)}")
+        for r in module_results:
+            status = "✅ PASSED" if r["passed"] else "❌ FAILED"
+            line = f"   {r['name']}: {status} ({r['duration']}s)"
+            if not r["passed"]:
+                line += f" - {r['error']}"
+            print(line)
+
+    passed = sum(1 for r in results if r["passed"])
+    total_test_time = sum(r["duration"] for r in results)
+    print(f"\n✅ Tổng: {passed}/{len(results)} test PASSED")
+    print(f"⏱️ Thời gian thực: {wall_time:.1f}s với {workers} worker "
+          f"(tổng thời gian test: {total_test_time:.1f}s)")
+
+def write_report(path, results, wall_time, workers):
+    report = {
+        "started_at": datetime.now().isoformat(timespec="seconds"),
+        "workers": workers,
+        "wall_time": round(wall_time, 3),
+        "total": len(results),
+        "passed": sum(1 for r in results if r["passed"]),
+        "failed": sum(1 for r in results if not r["passed"]),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"📄 Báo cáo JSON: {path}")
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy song song toàn bộ test selenium")
+    parser.add_argument("-w", "--workers", type=int,
+                        default=int(os.environ.get("SELENIUM_WORKERS", os.cpu_count() or 1)),
+                        help="Số Chrome chạy song song (mặc định: số CPU hoặc $SELENIUM_WORKERS)")
+    parser.add_argument("-m", "--modules", nargs="+", default=MODULES,
+                        help="Chỉ chạy các module được chọn")
+    parser.add_argument("-k", "--keyword", default=None,
+                        help="Chỉ chạy test có tên chứa chuỗi này")
+    parser.add_argument("--report", default=None, help="Ghi kết quả gộp ra file JSON")
+    parser.add_argument("--ui-only", action="store_true",
+                        help="Bỏ qua các test đã có trong HTTP_CASES (chạy bằng httpRunner.py)")
+    parser.add_argument("--artifacts", default="artifacts", help="Thư mục lưu trang lỗi")
+    parser.add_argument("--headed", action="store_true", help="Hiện cửa sổ Chrome (debug)")
+    parser.add_argument("--max-uses", type=int, default=50,
+                        help="Số test tối đa một Chrome chạy trước khi được thay mới")
+    parser.add_argument("--max-memory", type=int, default=1024,
+                        help="Thay Chrome mới khi bộ nhớ vượt ngưỡng này (MB)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    jobs = collect_all(args.modules)
+    if args.keyword:
+        jobs = [job for job in jobs if args.keyword in job.id]
+    if args.ui_only:
+        jobs = [job for job in jobs if not http_covered(job)]
+    workers = max(1, min(args.workers, len(jobs) or 1))
+
+    print(f"▶️ {len(jobs)} test từ {len(args.modules)} module, {workers} worker")
+    started = time.perf_counter()
+    pool = DriverPool(workers, max_uses=args.max_uses, max_memory_mb=args.max_memory,
+                      headless=not args.headed).start()
+    print(f"🚀 Đã mở sẵn {workers} Chrome sau {time.perf_counter() - started:.1f}s")
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="worker") as executor:
+            futures = [executor.submit(run_job, pool, job, args.artifacts) for job in jobs]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                print(f"{'✅' if result['passed'] else '❌'} {result['id']} ({result['duration']}s)")
+    finally:
+        pool.close()
+    wall_time = time.perf_counter() - started
+
+    order = {job.id: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda r: order.get(r["id"], 0))
+    print_report(results, wall_time, workers)
+    if args.report:
+        write_report(args.report, results, wall_time, workers)
+    return 0 if all(r["passed"] for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# Benchmark tính lương học kỳ (POST /salary/{salaryConfig}/calculate).
+#
+# Với mỗi kích thước, script seed thẳng vào DB (SQLite hoặc MySQL theo .env)
+# một năm học + học kỳ + cấu hình lương nháp và N lớp học, gọi endpoint tính
+# lương qua HTTP, poll tiến độ job trong hàng đợi (cần `php artisan queue:work`)
+# rồi lấy số liệu job CalculateSemesterSalaries ghi lại (thời gian, số query, bộ
+# nhớ đỉnh). Kết quả ghi ra JSON để so với lần chạy trước.
+#
+#   python salaryBenchmark.py --sizes 10000 50000
+#   python salaryBenchmark.py --sizes 100000 --output after.json --compare before.json
+#   python salaryBenchmark.py --sizes 500000 --keep       # giữ dữ liệu seed lại
+
+from datetime import datetime
+from itertools import islice
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+import uuid
+
+try:
+    import pymysql
+except ImportError:  # chỉ cần khi DB_CONNECTION=mysql
+    pymysql = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_FILE = os.path.join(ROOT, "storage", "logs", "laravel.log")
+CHUNK = 5000
+POLL_INTERVAL = 0.5
+_LOG_RE = re.compile(r"Salary calculation finished (\{.*\})")
+
+# ========== Kết nối DB ==========
+def read_env(path=os.path.join(ROOT, ".env")):
+    env = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#") and "=" in line:
+                    key, value = line.split("=", 1)
+                    env[key.strip()] = value.strip().strip('"').strip("'")
+    except OSError:
+        pass
+    env.update({k: v for k, v in os.environ.items() if k.startswith("DB_")})
+    return env
+
+class Database:
+    def __init__(self, env):
+        self.driver = env.get("DB_CONNECTION", "sqlite")
+        if self.driver == "sqlite":
+            path = env.get("DB_DATABASE") or os.path.join(ROOT, "database", "database.sqlite")
+            if not os.path.isabs(path):
+                path = os.path.join(ROOT, path)
+            self.conn = sqlite3.connect(path, timeout=60)
+            # Seed nhanh: bỏ fsync trong lúc ghi hàng loạt
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=OFF")
+            self.placeholder = "?"
+        elif self.driver == "mysql":
+            if pymysql is None:
+                raise RuntimeError("Cần cài pymysql để seed MySQL: pip install pymysql")
+            self.conn = pymysql.connect(
+                host=env.get("DB_HOST", "127.0.0.1"), port=int(env.get("DB_PORT", "3306")),
+                user=env.get("DB_USERNAME", "root"), password=env.get("DB_PASSWORD", ""),
+                database=env.get("DB_DATABASE", "laravel"), charset="utf8mb4", autocommit=False,
+            )
+            self.placeholder = "%s"
+        else:
+            raise RuntimeError(f"DB_CONNECTION={self.driver} chưa được hỗ trợ")
+
+    def sql(self, query):
+        return query.replace("?", self.placeholder)
+
+    def execute(self, query, params=()):
+        cur = self.conn.cursor()
+        cur.execute(self.sql(query), params)
+        return cur
+
+    def insert(self, table, row):
+        columns = ", ".join(row)
+        marks = ", ".join("?" for _ in row)
+        return self.execute(f"INSERT INTO {table} ({columns}) VALUES ({marks})", tuple(row.values())).lastrowid
+
+    def insert_many(self, table, columns, rows):
+        # rows có thể là generator: chỉ giữ CHUNK dòng trong bộ nhớ mỗi lần
+        query = self.sql(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})")
+        cur = self.conn.cursor()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, CHUNK))
+            if not chunk:
+                break
+            cur.executemany(query, chunk)
+
+    def scalar_list(self, query, params=()):
+        return [row[0] for row in self.execute(query, params).fetchall()]
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+# ========== Seed ==========
+def _now():
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+def ensure_reference_data(db, teachers=200, courses=100):
+    # Dùng giáo viên/môn học có sẵn; DB trống thì tạo một bộ nhỏ
+    teacher_ids = db.scalar_list("SELECT id FROM teachers")
+    course_ids = db.scalar_list("SELECT id FROM courses")
+    if teacher_ids and course_ids:
+        return teacher_ids, course_ids
+
+    now = _now()
+    tag = uuid.uuid4().hex[:6]
+    department_id = db.insert("departments", {"name": f"Khoa benchmark {tag}", "abbrName": f"B{tag}",
+                                              "created_at": now, "updated_at": now})
+    degree_id = db.insert("degrees", {"name": f"Bằng cấp benchmark {tag}", "baseSalaryFactor": 1.5,
+                                      "created_at": now, "updated_at": now})
+    if not teacher_ids:
+        db.insert_many("teachers", ["fullName", "DOB", "phone", "email", "degree_id", "department_id",
+                                    "created_at", "updated_at"],
+                       [(f"GV benchmark {i}", "1985-01-01", f"09{random.randint(10000000, 99999999)}",
+                         f"bench{tag}{i}@example.com", degree_id, department_id, now, now)
+                        for i in range(teachers)])
+    if not course_ids:
+        db.insert_many("courses", ["name", "code", "credits", "lessons", "department_id", "course_coefficient",
+                                   "created_at", "updated_at"],
+                       [(f"Môn benchmark {tag} {i}", f"BM{tag}{i:04d}", 3, random.choice([30, 45, 60]),
+                         department_id, random.choice([1.0, 1.2, 1.5]), now, now)
+                        for i in range(courses)])
+    db.commit()
+    return db.scalar_list("SELECT id FROM teachers"), db.scalar_list("SELECT id FROM courses")
+
+def seed(db, size):
+    teacher_ids, course_ids = ensure_reference_data(db)
+    now = _now()
+    tag = uuid.uuid4().hex[:8]
+    started = time.perf_counter()
+
+    year_id = db.insert("academic_years", {"name": f"Benchmark {tag}", "startDate": "2099-09-01",
+                                           "endDate": "2100-06-30", "created_at": now, "updated_at": now})
+    semester_id = db.insert("semesters", {"name": f"Benchmark {tag}", "startDate": "2099-09-01",
+                                          "endDate": "2100-01-15", "academicYear_id": year_id,
+                                          "created_at": now, "updated_at": now})
+    config_id = db.insert("salary_configs", {"semester_id": semester_id, "base_salary_per_lesson": 100000,
+                                             "status": "draft", "created_at": now, "updated_at": now})
+    db.insert_many("classrooms", ["name", "code", "students", "semester_id", "course_id", "teacher_id",
+                                  "created_at", "updated_at"],
+                   ((f"BM-{tag}-{i}", f"BM{tag}{i:07d}", random.randint(10, 100), semester_id,
+                     random.choice(course_ids), random.choice(teacher_ids), now, now)
+                    for i in range(size)))
+    db.commit()
+    return {"academic_year_id": year_id, "semester_id": semester_id, "salary_config_id": config_id,
+            "seed_seconds": round(time.perf_counter() - started, 3)}
+
+def cleanup(db, seeded):
+    db.execute("DELETE FROM salary_aggregates WHERE academic_year_id = ?", (seeded["academic_year_id"],))
+    db.execute("DELETE FROM teacher_salaries WHERE salary_config_id = ?", (seeded["salary_config_id"],))
+    db.execute("DELETE FROM classrooms WHERE semester_id = ?", (seeded["semester_id"],))
+    db.execute("DELETE FROM salary_configs WHERE id = ?", (seeded["salary_config_id"],))
+    db.execute("DELETE FROM semesters WHERE id = ?", (seeded["semester_id"],))
+    db.execute("DELETE FROM academic_years WHERE id = ?", (seeded["academic_year_id"],))
+    db.commit()
+
+# ========== Đo ==========
+def log_offset():
+    try:
+        return os.path.getsize(LOG_FILE)
+    except OSError:
+        return 0
+
+def read_metrics(offset, salary_config_id):
+    # Dòng log cuối cùng của đúng salary_config_id, ghi sau mốc offset
+    try:
+        with open(LOG_FILE, encoding="utf-8", errors="replace") as f:
+            f.seek(offset)
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    for line in reversed(lines):
+        match = _LOG_RE.search(line)
+        if match:
+            data = json.loads(match.group(1))
+            if data.get("salary_config_id") == salary_config_id:
+                return data
+    return None
+
+def start_calculation(session, salary_config_id, full=False):
+    headers = session.headers()
+    headers["Referer"] = f"{session.client.base_url}/salary"
+    path = f"/salary/{salary_config_id}/calculate" + ("?full=1" if full else "")
+    # Không đi theo redirect về trang danh sách, chỉ cần biết job đã được đưa vào hàng đợi
+    return session.client.post(path, headers=headers, follow_redirects=False)
+
+def calculation_status(session, salary_config_id):
+    response = session.client.get(f"/salary/{salary_config_id}/calculation",
+                                  headers={"Accept": "application/json"})
+    response.raise_for_status()
+    return response.json()
+
+def wait_for_calculation(session, salary_config_id, timeout, on_poll=None, interval=POLL_INTERVAL):
+    deadline = time.perf_counter() + timeout
+    while True:
+        status = calculation_status(session, salary_config_id)
+        if on_poll:
+            on_poll(status)
+        if status["status"] in ("completed", "failed", "idle") or time.perf_counter() >= deadline:
+            return status
+        time.sleep(interval)
+
+def run_calculation(session, salary_config_id, timeout, full=False):
+    offset = log_offset()
+    started = time.perf_counter()
+    response = start_calculation(session, salary_config_id, full)
+    status = wait_for_calculation(session, salary_config_id, timeout) if response.is_redirect else None
+    elapsed = time.perf_counter() - started
+    return {
+        "http_status": response.status_code,
+        "wall_seconds": round(elapsed, 3),
+        "succeeded": status is not None and status["status"] == "completed",
+        "status": status,
+        "app": (status or {}).get("result") or read_metrics(offset, salary_config_id),
+    }
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# ========== So sánh ==========
+def compare(results, baseline_path):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {run["classrooms"]: run for run in json.load(f)["runs"]}
+    print(f"\n========== SO VỚI {baseline_path} ==========")
+    for run in results["runs"]:
+        before = baseline.get(run["classrooms"])
+        if not before:
+            continue
+        for key in ("wall_seconds", "query_count", "peak_memory_mb"):
+            old, new = before.get(key), run.get(key)
+            if old and new is not None:
+                print(f"{run['classrooms']:>8} lớp  {key:<16}{old:>12} → {new:<12} ({(new - old) / old * 100:+.1f}%)")
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tính lương học kỳ với dữ liệu seed hàng loạt")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000], help="Số lớp học seed cho mỗi lần đo")
+    parser.add_argument("--output", default=None, help="File JSON kết quả (mặc định salary-benchmark-<thời gian>.json)")
+    parser.add_argument("--compare", default=None, help="File JSON của lần chạy trước để so sánh")
+    parser.add_argument("--keep", action="store_true", help="Giữ lại dữ liệu đã seed")
+    parser.add_argument("--timeout", type=float, default=1800, help="Thời gian chờ job tính lương tối đa (giây)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    from httpRunner import InertiaSession
+
+    args = parse_args(argv)
+    env = read_env()
+    db = Database(env)
+    session = InertiaSession("benchmark")
+    session.login()
+    results = {"started_at": datetime.now().isoformat(timespec="seconds"), "git_commit": git_commit(),
+               "db": db.driver, "runs": []}
+    try:
+        for size in args.sizes:
+            print(f"▶️ Seed {size} lớp học...")
+            seeded = seed(db, size)
+            print(f"   seed xong sau {seeded['seed_seconds']}s, salary_config_id={seeded['salary_config_id']}")
+            try:
+                measured = run_calculation(session, seeded["salary_config_id"], args.timeout)
+            finally:
+                if not args.keep:
+                    cleanup(db, seeded)
+            app = measured.pop("app") or {}
+            measured.pop("status", None)
+            run = {"classrooms": size, **seeded, **measured,
+                   "total_calculated": app.get("total_calculated"),
+                   "duration_ms": app.get("duration_ms"),
+                   "query_count": app.get("query_count"),
+                   "peak_memory_mb": app.get("peak_memory_mb")}
+            results["runs"].append(run)
+            print(f"   ⏱️ {run['wall_seconds']}s, {run['query_count']} query, "
+                  f"{run['peak_memory_mb']} MB đỉnh, {run['total_calculated']} lớp đã tính")
+            if app == {}:
+                print("   ⚠️ Không tìm thấy dòng log 'Salary calculation finished' (LOG_CHANNEL phải ghi ra laravel.log)")
+    finally:
+        session.close()
+        db.close()
+
+    output = args.output or f"salary-benchmark-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"📄 Kết quả: {output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
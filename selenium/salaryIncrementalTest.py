@@ -0,0 +1,93 @@
+# E2E: tính lại lương chỉ đụng tới lớp đã thay đổi.
+#
+# Seed một học kỳ nhỏ (qua salaryBenchmark), gắn một lớp vào môn học riêng,
+# tính lương lần đầu, sửa số tiết của môn đó qua PUT /courses/{id} như form
+# sửa môn học, rồi tính lại. Chỉ dòng lương của lớp đó được đổi, các dòng
+# khác giữ nguyên id và updated_at.
+#
+#   python salaryIncrementalTest.py
+
+import random
+import sys
+import time
+import uuid
+import salaryBenchmark
+from httpRunner import InertiaSession
+
+SIZE = 50
+
+# ========== Setup ==========
+def snapshot(db, salary_config_id):
+    rows = db.execute(
+        "SELECT classroom_id, id, total_salary, updated_at FROM teacher_salaries WHERE salary_config_id = ?",
+        (salary_config_id,),
+    ).fetchall()
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+def create_course(db, department_id=None):
+    now = salaryBenchmark._now()
+    tag = uuid.uuid4().hex[:8]
+    return db.insert("courses", {"name": f"Môn tính lại {tag}", "code": f"INC{tag}", "credits": 3, "lessons": 30,
+                                 "department_id": department_id, "course_coefficient": 1.2,
+                                 "created_at": now, "updated_at": now})
+
+def calculate(session, salary_config_id):
+    measured = salaryBenchmark.run_calculation(session, salary_config_id, timeout=600)
+    assert measured["succeeded"], f"tính lương thất bại (HTTP {measured['http_status']})"
+    assert measured["app"] is not None, "không thấy dòng log 'Salary calculation finished'"
+    return measured["app"]
+
+# ========== Test Cases ==========
+def test_recalculate_only_changed_classroom():
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    session = InertiaSession("benchmark")
+    session.login()
+    seeded = salaryBenchmark.seed(db, SIZE)
+    course_id = create_course(db)
+    try:
+        config_id = seeded["salary_config_id"]
+        target = random.choice(db.scalar_list("SELECT id FROM classrooms WHERE semester_id = ?",
+                                              (seeded["semester_id"],)))
+        db.execute("UPDATE classrooms SET course_id = ? WHERE id = ?", (course_id, target))
+        db.commit()
+        # updated_at chỉ chính xác tới giây: tách mốc seed, lần tính đầu và lần sửa
+        time.sleep(1.1)
+
+        first = calculate(session, config_id)
+        assert first["mode"] == "full" and first["total_calculated"] == SIZE, first
+        before = snapshot(db, config_id)
+        time.sleep(1.1)
+
+        # Sửa môn học của đúng một lớp qua request giống form sửa môn học
+        page = session.visit("PUT", f"/courses/{course_id}", {
+            "name": f"Môn tính lại {uuid.uuid4().hex[:8]}", "credits": 3, "lessons": 45,
+            "department_id": None, "course_coefficient": 1.2,
+        }, referer="/courses")
+        assert page is not None and not page["props"].get("errors"), page and page["props"].get("errors")
+
+        second = calculate(session, config_id)
+        assert second["mode"] == "incremental", second
+        assert second["total_calculated"] == 1, f"tính lại {second['total_calculated']} lớp, mong đợi 1"
+        after = snapshot(db, config_id)
+
+        assert before.keys() == after.keys(), "tập lớp có lương bị thay đổi"
+        changed = [classroom_id for classroom_id in before if before[classroom_id] != after[classroom_id]]
+        assert changed == [target], f"các dòng bị đổi: {changed}, mong đợi [{target}]"
+        assert after[target][0] == before[target][0], "dòng lương bị xoá rồi tạo lại thay vì upsert"
+        expected = float(before[target][1]) * 45 / 30
+        assert abs(float(after[target][1]) - expected) < 0.05, "lương không theo số tiết mới"
+    finally:
+        salaryBenchmark.cleanup(db, seeded)
+        db.execute("DELETE FROM courses WHERE id = ?", (course_id,))
+        db.commit()
+        session.close()
+        db.close()
+
+# ========== Main ==========
+if __name__ == "__main__":
+    try:
+        test_recalculate_only_changed_classroom()
+        print("✅ Tính lại lương chỉ cho lớp thay đổi: PASSED")
+    except AssertionError as e:
+        print(f"❌ Tính lại lương chỉ cho lớp thay đổi: FAILED - {e}")
+        sys.exit(1)
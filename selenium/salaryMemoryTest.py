@@ -0,0 +1,62 @@
+# Kiểm tra bộ nhớ PHP khi tính lương không tăng theo số lớp của học kỳ.
+#
+# Seed các học kỳ với số lớp tăng dần (qua salaryBenchmark), gọi
+# POST /salary/{id}/calculate và so bộ nhớ đỉnh mà SalaryController ghi vào
+# log. Khi tính theo chunk, học kỳ lớn nhất chỉ được tốn thêm một khoảng nhỏ
+# so với học kỳ nhỏ nhất.
+#
+#   python salaryMemoryTest.py
+#   SALARY_MEMORY_SIZES=5000,50000,200000 python salaryMemoryTest.py
+
+import os
+import sys
+import salaryBenchmark
+from httpRunner import InertiaSession
+
+SIZES = [int(n) for n in os.environ.get("SALARY_MEMORY_SIZES", "2000,10000,40000").split(",")]
+# Cho phép lệch tối đa: 25% hoặc 16 MB so với học kỳ nhỏ nhất (lấy giá trị lớn hơn)
+MAX_GROWTH_RATIO = 1.25
+MAX_GROWTH_MB = 16
+
+# ========== Đo ==========
+def measure_peaks(sizes=SIZES):
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    session = InertiaSession("benchmark")
+    session.login()
+    peaks = {}
+    try:
+        for size in sizes:
+            seeded = salaryBenchmark.seed(db, size)
+            try:
+                measured = salaryBenchmark.run_calculation(session, seeded["salary_config_id"], timeout=1800)
+            finally:
+                salaryBenchmark.cleanup(db, seeded)
+            app = measured["app"]
+            assert measured["succeeded"], f"tính lương {size} lớp thất bại (HTTP {measured['http_status']})"
+            assert app is not None, "không thấy dòng log 'Salary calculation finished'"
+            assert app["total_calculated"] == size, f"chỉ tính được {app['total_calculated']}/{size} lớp"
+            peaks[size] = app["peak_memory_mb"]
+            print(f"   {size:>8} lớp: {app['peak_memory_mb']} MB đỉnh, {app['query_count']} query")
+    finally:
+        session.close()
+        db.close()
+    return peaks
+
+# ========== Test Cases ==========
+def test_memory_stays_flat():
+    peaks = measure_peaks()
+    smallest, largest = peaks[min(peaks)], peaks[max(peaks)]
+    limit = max(smallest * MAX_GROWTH_RATIO, smallest + MAX_GROWTH_MB)
+    assert largest <= limit, (
+        f"bộ nhớ tăng theo số lớp: {smallest} MB ({min(peaks)} lớp) → {largest} MB ({max(peaks)} lớp), "
+        f"giới hạn {limit:.1f} MB"
+    )
+
+# ========== Main ==========
+if __name__ == "__main__":
+    try:
+        test_memory_stays_flat()
+        print("✅ Bộ nhớ tính lương ổn định: PASSED")
+    except AssertionError as e:
+        print(f"❌ Bộ nhớ tính lương: FAILED - {e}")
+        sys.exit(1)
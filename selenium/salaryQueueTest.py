@@ -0,0 +1,73 @@
+# E2E: tính lương chạy nền trong hàng đợi, có tiến độ để poll và khoá chống chạy trùng.
+#
+# Seed một học kỳ (qua salaryBenchmark), gọi POST /salary/{id}/calculate rồi gọi
+# lại ngay lần hai: lần hai phải bị từ chối vì job đầu còn giữ khoá. Sau đó poll
+# GET /salary/{id}/calculation tới khi xong và kiểm tra tiến độ tăng dần, kết quả
+# và số dòng lương trong DB. Cần worker đang chạy (`php artisan queue:work`).
+#
+#   python salaryQueueTest.py
+#   SALARY_QUEUE_SIZE=20000 python salaryQueueTest.py
+
+import os
+import sys
+import time
+import salaryBenchmark
+from httpRunner import InertiaSession
+
+SIZE = int(os.environ.get("SALARY_QUEUE_SIZE", "5000"))
+TIMEOUT = 600
+
+# ========== Test Cases ==========
+def test_queued_calculation():
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    session = InertiaSession("benchmark")
+    session.login()
+    seeded = salaryBenchmark.seed(db, SIZE)
+    config_id = seeded["salary_config_id"]
+    try:
+        started = time.perf_counter()
+        response = salaryBenchmark.start_calculation(session, config_id)
+        enqueue_seconds = time.perf_counter() - started
+        assert response.is_redirect, f"POST calculate trả HTTP {response.status_code}, mong đợi redirect"
+        # Request web chỉ đưa job vào hàng đợi, không tự tính
+        assert enqueue_seconds < 5, f"POST calculate mất {enqueue_seconds:.1f}s, có vẻ vẫn tính trong request"
+
+        # Lần gọi thứ hai trong lúc job còn chạy bị khoá từ chối
+        page = session.visit("POST", f"/salary/{config_id}/calculate", referer="/salary")
+        assert page is not None, "POST calculate lần hai không trả về trang Inertia"
+        assert "calculation" in (page["props"].get("errors") or {}), \
+            f"lần tính thứ hai không bị khoá: {page['props'].get('errors')}"
+
+        seen = []
+        status = salaryBenchmark.wait_for_calculation(session, config_id, TIMEOUT, on_poll=seen.append)
+        assert status["status"] == "completed", f"job kết thúc với trạng thái {status['status']}: {status.get('message')}"
+
+        processed = [s["processed"] for s in seen if s["status"] == "running" and s.get("processed")]
+        assert processed == sorted(processed), f"tiến độ không tăng dần: {processed}"
+        assert status["total"] == SIZE and status["processed"] == SIZE, \
+            f"tiến độ cuối {status['processed']}/{status['total']}, mong đợi {SIZE}/{SIZE}"
+        assert status["result"]["total_calculated"] == SIZE, status["result"]
+        assert status["salary_config_status"] == "active", status["salary_config_status"]
+
+        rows = db.scalar_list("SELECT COUNT(*) FROM teacher_salaries WHERE salary_config_id = ?", (config_id,))[0]
+        assert rows == SIZE, f"có {rows} dòng lương, mong đợi {SIZE}"
+
+        # Job xong đã nhả khoá: tính lại được ngay
+        again = salaryBenchmark.run_calculation(session, config_id, TIMEOUT)
+        assert again["succeeded"], f"tính lại sau khi job xong thất bại: {again['status']}"
+        print(f"   {SIZE} lớp: đưa vào hàng đợi sau {enqueue_seconds * 1000:.0f} ms, {len(seen)} lần poll")
+    finally:
+        # Chờ job (nếu còn chạy) xong trước khi xoá dữ liệu seed
+        salaryBenchmark.wait_for_calculation(session, config_id, TIMEOUT)
+        salaryBenchmark.cleanup(db, seeded)
+        session.close()
+        db.close()
+
+# ========== Main ==========
+if __name__ == "__main__":
+    try:
+        test_queued_calculation()
+        print("✅ Tính lương trong hàng đợi: PASSED")
+    except AssertionError as e:
+        print(f"❌ Tính lương trong hàng đợi: FAILED - {e}")
+        sys.exit(1)
@@ -0,0 +1,124 @@
+# Lưu lại phiên đăng nhập Laravel (cookie session + XSRF-TOKEN) để các test
+# không phải đi qua form /login mỗi lần tạo driver mới.
+#
+# Mỗi "slot" giữ một phiên riêng: các worker chạy song song không dùng chung
+# một session, vì Laravel flash lỗi validate vào session và request của worker
+# này có thể "ăn" mất lỗi của worker kia. Cache được ghi ra file nên lần chạy
+# sau vẫn dùng lại được cho tới khi cookie hết hạn.
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+import json
+import os
+import threading
+import time
+
+BASE_URL = os.environ.get("APP_URL", "http://localhost:8000").rstrip("/")
+EMAIL = os.environ.get("TEST_EMAIL", "alex@alex.com")
+PASSWORD = os.environ.get("TEST_PASSWORD", "12345678")
+SESSION_COOKIE = os.environ.get("SESSION_COOKIE", "laravel_session")
+CACHE_FILE = os.environ.get(
+    "SESSION_CACHE_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".session_cache.json"),
+)
+# Bỏ cookie sắp hết hạn để không bị đá ra giữa chừng test
+EXPIRY_MARGIN = 60
+
+_lock = threading.Lock()
+_sessions = None
+
+# ========== Đăng nhập qua form ==========
+def login_with_form(driver):
+    driver.get(f"{BASE_URL}/login")
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
+    driver.find_element(By.ID, "email").send_keys(EMAIL)
+    driver.find_element(By.ID, "password").send_keys(PASSWORD + Keys.ENTER)
+    WebDriverWait(driver, 10).until(EC.url_contains("/dashboard"))
+
+# ========== Đọc / ghi cache ==========
+def _is_auth_cookie(cookie):
+    name = cookie["name"]
+    return name in (SESSION_COOKIE, "XSRF-TOKEN") or name.startswith("remember_web_")
+
+def _load_file():
+    try:
+        with open(CACHE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_file(sessions):
+    tmp = f"{CACHE_FILE}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(sessions, f, indent=2)
+    os.replace(tmp, CACHE_FILE)
+
+def _sessions_cache():
+    global _sessions
+    if _sessions is None:
+        _sessions = _load_file()
+    return _sessions
+
+def _is_fresh(cookies):
+    now = time.time()
+    session = [c for c in cookies if c["name"] == SESSION_COOKIE]
+    if not session:
+        return False
+    expiry = session[0].get("expiry")
+    return expiry is None or expiry - EXPIRY_MARGIN > now
+
+def get_cookies(slot="default"):
+    with _lock:
+        entry = _sessions_cache().get(slot)
+    if entry and _is_fresh(entry["cookies"]):
+        return entry["cookies"]
+    return None
+
+def save_session(driver, slot="default"):
+    return save_cookies(driver.get_cookies(), slot)
+
+def save_cookies(cookies, slot="default"):
+    # Dùng chung cho driver selenium và client HTTP (httpRunner)
+    cookies = [c for c in cookies if _is_auth_cookie(c)]
+    with _lock:
+        sessions = _sessions_cache()
+        sessions[slot] = {"saved_at": int(time.time()), "cookies": cookies}
+        _write_file(sessions)
+    return cookies
+
+def invalidate(slot="default"):
+    with _lock:
+        sessions = _sessions_cache()
+        if sessions.pop(slot, None) is not None:
+            _write_file(sessions)
+
+# ========== Nạp phiên vào driver ==========
+def apply_session(driver, cookies):
+    # Phải đứng trên đúng domain thì mới add_cookie được; favicon là trang nhẹ nhất
+    if not driver.current_url.startswith(BASE_URL):
+        driver.get(f"{BASE_URL}/favicon.ico")
+    driver.delete_all_cookies()
+    for cookie in cookies:
+        driver.add_cookie(cookie)
+
+def is_authenticated(driver):
+    driver.get(f"{BASE_URL}/dashboard")
+    return "/login" not in driver.current_url
+
+def login(driver, slot="default"):
+    # Dùng lại cookie phiên đã lưu, chỉ đăng nhập qua form khi phiên hết hạn.
+    # Trả về True nếu vừa phải đăng nhập lại qua form.
+    cookies = get_cookies(slot)
+    if cookies:
+        apply_session(driver, cookies)
+        if is_authenticated(driver):
+            return False
+        # Session đã bị Laravel dọn (hết hạn phía server) → đăng nhập lại
+        invalidate(slot)
+        driver.delete_all_cookies()
+
+    login_with_form(driver)
+    save_session(driver, slot)
+    return True
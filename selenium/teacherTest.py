@@ -1,26 +1,16 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-import time
 import random
+import sessionCache
+from formHelpers import select_option
+from driverPool import create_driver
+from testCases import http_entries
 
 # ========== Setup ==========
-def create_driver():
-    options = Options()
-    options.add_argument("--start-maximized")
-    options.add_experimental_option('excludeSwitches', ['enable-logging'])
-    return webdriver.Chrome(options=options)
-
 def login(driver):
-    driver.get("http://localhost:8000/login")
-    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "email")))
-    driver.find_element(By.ID, "email").send_keys("alex@alex.com")
-    driver.find_element(By.ID, "password").send_keys("12345678" + Keys.ENTER)
-    WebDriverWait(driver, 10).until(EC.url_contains("/dashboard"))
+    sessionCache.login(driver)
 
 def open_teacher_form(driver):
     driver.get("http://localhost:8000/teachers")
@@ -49,18 +39,10 @@ def fill_teacher_form(driver, fullName, dob, phone, email, degree_index=None, de
         driver.find_element(By.ID, "email").send_keys(email)
 
     if degree_index is not None:
-        degree_select = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.ID, "degree_id")))
-        degree_select.click()
-        for _ in range(degree_index):
-            degree_select.send_keys(Keys.DOWN)
-        degree_select.send_keys(Keys.ENTER)
+        select_option(driver, "degree_id", index=degree_index)
 
     if dept_index is not None:
-        dept_select = WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.ID, "department_id")))
-        dept_select.click()
-        for _ in range(dept_index):
-            dept_select.send_keys(Keys.DOWN)
-        dept_select.send_keys(Keys.ENTER)
+        select_option(driver, "department_id", index=dept_index)
 
     submit_btn = WebDriverWait(driver, 5).until(
         EC.element_to_be_clickable((By.XPATH, "//button[contains(.,'Thêm mới')]"))
@@ -144,6 +126,10 @@ def test_add_teacher_success(driver):
         EC.presence_of_element_located((By.XPATH, "//*[contains(text(),'Thêm giáo viên mới thành công')]"))
     )
 
+# ========== Case HTTP (httpRunner.py) ==========
+# Các case validate khai báo trong testCases.py, chạy thẳng qua request Inertia
+HTTP_CASES = http_entries("teacher")
+
 # ========== Main ==========
 if __name__ == "__main__":
     driver = create_driver()
@@ -0,0 +1,351 @@
+# Bảng test case dạng khai báo cho từng thực thể và bộ sinh case biên.
+#
+# Mỗi case chỉ gồm: thực thể, tên, các field ghi đè lên payload hợp lệ và lỗi
+# mong đợi ({field: đoạn thông báo} hoặc None nếu phải thành công). Cùng một
+# case chạy được qua HTTP (httpRunner) hoặc qua form thật trên trình duyệt
+# (DriverPool), và cả hai chế độ đều so trên props `errors` của Inertia.
+#
+#   python testCases.py                          # mọi bảng, chạy qua HTTP
+#   python testCases.py -e classroom --boundaries --mode browser -w 4
+#   python testCases.py --list
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+
+SEMESTER_ID = int(os.environ.get("TEST_SEMESTER_ID", "1"))
+COURSE_ID = int(os.environ.get("TEST_COURSE_ID", "1"))
+TEACHER_ID = int(os.environ.get("TEST_TEACHER_ID", "1"))
+
+# Ngưỡng sĩ số của SalaryCalculatorService::calculateClassCoefficient
+CLASS_SIZE_THRESHOLDS = [20, 30, 40, 50, 60, 70, 80]
+
+def _rand(digits=6):
+    return random.randint(10 ** (digits - 1), 10 ** digits - 1)
+
+# ========== Thực thể ==========
+@dataclass
+class Entity:
+    name: str
+    path: str
+    component: str
+    defaults: Callable[[], dict]
+    add_button: str
+    form_id: str
+    field_prefix: str = ""
+
+    def payload(self, overrides):
+        payload = self.defaults()
+        payload.update(overrides)
+        return payload
+
+ENTITIES = {}
+
+def entity(name, path, component, add_button, form_id, field_prefix=""):
+    def register(defaults):
+        ENTITIES[name] = Entity(name, path, component, defaults, add_button, form_id, field_prefix)
+        return defaults
+    return register
+
+@entity("teacher", "/teachers", "Teachers/Index", "Thêm giáo viên mới", "teacher-form")
+def teacher_defaults():
+    return {
+        "fullName": f"GV {_rand(4)}",
+        "DOB": "1990-01-01",
+        "phone": str(random.randint(1000000000, 9999999999)),
+        "email": f"t{_rand()}@gmail.com",
+        "degree_id": 1,
+        "department_id": 1,
+        "password": "12345678",
+        "password_confirmation": "12345678",
+        "role": "teacher",
+    }
+
+@entity("course", "/courses", "Courses", "Thêm môn học mới", "course-form")
+def course_defaults():
+    return {"name": f"Môn học {_rand()}", "credits": 3, "lessons": 30, "course_coefficient": 1.2, "department_id": 1}
+
+@entity("department", "/departments", "Departments/Index", "Thêm khoa mới", "department-form")
+def department_defaults():
+    return {"name": f"Khoa Test {_rand()}", "abbrName": f"KT{_rand(5)}"}
+
+@entity("degree", "/degrees", "Degrees/Index", "Thêm bằng cấp mới", "degree-form")
+def degree_defaults():
+    return {"name": f"Bằng cấp {_rand()}", "baseSalaryFactor": 2.0}
+
+@entity("academic_year", "/academicyears", "AcademicYears", "Thêm năm học mới", "academic-year-form")
+def academic_year_defaults():
+    return {"name": f"Năm học test {_rand()}", "startDate": "2030-09-01", "endDate": "2031-06-30", "semesterCount": 2}
+
+@entity("classroom", "/classrooms", "Classrooms", "Thêm lớp học", "classroom-form")
+def classroom_defaults():
+    return {"name": f"LH-T{_rand()}", "semester_id": SEMESTER_ID, "course_id": COURSE_ID,
+            "teacher_id": TEACHER_ID, "students": 30}
+
+@entity("classroom_bulk", "/classrooms/bulk", "Classrooms", "Thêm lớp học hàng loạt",
+        "bulk-classroom-form", field_prefix="bulk-")
+def classroom_bulk_defaults():
+    return {"course_id": COURSE_ID, "semester_id": SEMESTER_ID, "teacher_id": TEACHER_ID,
+            "number_of_classes": 1, "students_per_class": 30, "class_name_prefix": f"TEST{_rand(4)}"}
+
+# ========== Case ==========
+@dataclass
+class Case:
+    entity: str
+    name: str
+    overrides: dict = field(default_factory=dict)
+    expected: Optional[dict] = None
+
+    @property
+    def id(self):
+        return f"{self.entity}::{self.name}"
+
+    def payload(self):
+        return ENTITIES[self.entity].payload(self.overrides)
+
+def case(entity_name, case_name, expected=None, /, **overrides):
+    # Tham số vị trí để field tên "name" của thực thể vẫn ghi đè được qua **overrides
+    return Case(entity_name, case_name, overrides, expected)
+
+# Tên case trùng tên test selenium tương ứng (runAllTests --ui-only dựa vào đó)
+CASES = {
+    "teacher": [
+        case("teacher", "test_missing_fullName", {"fullName": "Họ tên là bắt buộc"}, fullName=""),
+        case("teacher", "test_missing_dob", {"DOB": "Ngày sinh là bắt buộc"}, DOB=""),
+        case("teacher", "test_missing_phone", {"phone": "Số điện thoại là bắt buộc"}, phone=""),
+        case("teacher", "test_missing_email", {"email": None}, email=""),
+        case("teacher", "test_missing_degree", {"degree_id": "Bằng cấp là bắt buộc"}, degree_id=""),
+        case("teacher", "test_missing_department", {"department_id": "Khoa là bắt buộc"}, department_id=""),
+        case("teacher", "test_duplicate_phone", {"phone": "Số điện thoại này đã được sử dụng"}, phone="0977642678"),
+        case("teacher", "test_duplicate_email", {"email": "Email này đã được sử dụng"},
+             email="22010179@st.phenikaa-uni.edu.vn"),
+        case("teacher", "test_invalid_role", {"role": "Vai trò không hợp lệ"}, role="admin"),
+    ],
+    "course": [
+        case("course", "test_missing_name", {"name": "Tên môn học là bắt buộc"}, name=""),
+        case("course", "test_duplicate_name", {"name": "Tên môn học này đã tồn tại"}, name="Lập trình C"),
+        case("course", "test_invalid_coefficient", {"course_coefficient": "không được vượt quá 1.5"},
+             course_coefficient=2.0),
+        case("course", "test_missing_credits", {"credits": "Số tín chỉ là bắt buộc"}, credits=""),
+        case("course", "test_missing_lessons", {"lessons": "Số tiết học là bắt buộc"}, lessons=""),
+    ],
+    "department": [
+        case("department", "Test missing name", {"name": "Tên khoa là bắt buộc"}, name="", abbrName="MNC"),
+        case("department", "Test missing abbrName", {"abbrName": "Tên viết tắt là bắt buộc"},
+             name="Công nghệ thông tin", abbrName=""),
+        case("department", "Test duplicate name", {"name": "Tên khoa này đã tồn tại"},
+             name="Công nghệ thông tin", abbrName="DH1"),
+        case("department", "Test duplicate abbrName", {"abbrName": "Tên viết tắt này đã tồn tại"},
+             name="Khoa A", abbrName="CNTT"),
+    ],
+    "degree": [
+        case("degree", "test_missing_name", {"name": "Tên bằng cấp là bắt buộc"}, name=""),
+        case("degree", "test_invalid_salary", {"baseSalaryFactor": "Hệ số lương phải lớn hơn 0"}, baseSalaryFactor=0),
+        case("degree", "test_duplicate_name", {"name": "Tên bằng cấp này đã tồn tại"}, name="Đại học"),
+    ],
+    "academic_year": [
+        case("academic_year", "test_missing_name", {"name": "Tên năm học là bắt buộc"}, name=""),
+        case("academic_year", "test_missing_start_date", {"startDate": "Ngày bắt đầu là bắt buộc"}, startDate=""),
+        case("academic_year", "test_missing_end_date", {"endDate": "Ngày kết thúc là bắt buộc"}, endDate=""),
+        case("academic_year", "test_same_start_end_date", {"endDate": "Ngày kết thúc phải sau ngày bắt đầu"},
+             startDate="2030-09-01", endDate="2030-09-01"),
+        case("academic_year", "test_start_after_end", {"endDate": "Ngày kết thúc phải sau ngày bắt đầu"},
+             startDate="2031-06-30", endDate="2030-09-01"),
+    ],
+    "classroom": [
+        case("classroom", "test_missing_name", {"name": None}, name=""),
+        case("classroom", "test_invalid_students", {"students": None}, students=-10),
+    ],
+    "classroom_bulk": [
+        case("classroom_bulk", "test_missing_prefix_batch", {"class_name_prefix": None}, class_name_prefix=""),
+        case("classroom_bulk", "test_invalid_students_batch", {"students_per_class": None}, students_per_class=-10),
+    ],
+}
+
+# ========== Sinh case biên ==========
+def boundary_values(thresholds, lower=None, upper=None):
+    # Mỗi ngưỡng t sinh t-1 và t; thêm cận dưới/trên của rule min/max và giá trị ngay ngoài cận
+    values = set()
+    for t in thresholds:
+        values.update((t - 1, t))
+    for limit, outside in ((lower, -1), (upper, 1)):
+        if limit is not None:
+            values.update((limit, limit + outside))
+    return sorted(values)
+
+def expand_boundaries(entity_name, field_name, thresholds, lower=None, upper=None, label=None):
+    cases = []
+    for value in boundary_values(thresholds, lower, upper):
+        valid = (lower is None or value >= lower) and (upper is None or value <= upper)
+        cases.append(case(entity_name, f"{label or field_name}={value}",
+                          None if valid else {field_name: None}, **{field_name: value}))
+    return cases
+
+def generated_cases():
+    # Sĩ số quanh các ngưỡng hệ số lớp, cộng cận của rule students/students_per_class/number_of_classes
+    return {
+        "classroom": expand_boundaries("classroom", "students", CLASS_SIZE_THRESHOLDS, lower=0, upper=200),
+        "classroom_bulk": (
+            expand_boundaries("classroom_bulk", "students_per_class", CLASS_SIZE_THRESHOLDS, lower=1, upper=200)
+            # Tài khoản test là admin: trần 500 lớp (trưởng khoa vẫn 20)
+            + expand_boundaries("classroom_bulk", "number_of_classes", [], lower=1, upper=500)
+        ),
+        "course": (
+            expand_boundaries("course", "credits", [], lower=1, upper=10)
+            + [case("course", f"course_coefficient={v}", None if 1.0 <= v <= 1.5 else {"course_coefficient": None},
+                    course_coefficient=v) for v in (0.9, 1.0, 1.5, 1.6)]
+        ),
+        "academic_year": expand_boundaries("academic_year", "semesterCount", [], lower=1, upper=4),
+    }
+
+def build_batches(entity_names=None, boundaries=False):
+    batches = {}
+    tables = [CASES] + ([generated_cases()] if boundaries else [])
+    for table in tables:
+        for entity_name, cases in table.items():
+            if entity_names and entity_name not in entity_names:
+                continue
+            batches.setdefault(entity_name, []).extend(cases)
+    return batches
+
+def http_entries(entity_name):
+    # Dạng tuple HTTP_CASES mà httpRunner.collect_cases đọc từ các module test
+    target = ENTITIES[entity_name]
+    return [(c.name, "POST", target.path, c.payload, c.expected, target.component) for c in CASES[entity_name]]
+
+# ========== Chạy qua trình duyệt ==========
+def run_in_browser(driver, test_case):
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from formHelpers import set_values, click_and_wait, last_errors
+    from httpRunner import check_errors
+    from sessionCache import BASE_URL
+
+    target = ENTITIES[test_case.entity]
+    driver.get(f"{BASE_URL}{target.path.replace('/bulk', '')}")
+    add_btn = WebDriverWait(driver, 10).until(
+        EC.element_to_be_clickable((By.XPATH, f"//button[contains(.,'{target.add_button}')]"))
+    )
+    driver.execute_script("arguments[0].click();", add_btn)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, target.form_id)))
+
+    payload = test_case.payload()
+    values = {f"{target.field_prefix}{key}": value for key, value in payload.items()}
+    set_values(driver, values)
+    submit_btn = driver.find_element(
+        By.XPATH, f"//button[@type='submit' and (@form='{target.form_id}' or ancestor::form[@id='{target.form_id}'])]"
+    )
+    if not click_and_wait(driver, submit_btn, timeout=5):
+        # Form chặn submit ở phía client (required/min/max hoặc kiểm tra JS): coi là đã từ chối
+        if test_case.expected is None:
+            raise AssertionError("form không gửi được request dù dữ liệu hợp lệ")
+        return
+    check_errors(last_errors(driver), test_case.expected)
+
+# ========== Runner ==========
+def _result(test_case, started, error=None):
+    result = {"id": test_case.id, "module": test_case.entity, "name": test_case.name,
+              "worker": threading.current_thread().name, "passed": error is None}
+    if error is not None:
+        result["error"] = f"{type(error).__name__}: {error}"
+        result["traceback"] = traceback.format_exc()
+    result["duration"] = round(time.perf_counter() - started, 4)
+    return result
+
+def run_http(test_case):
+    from httpRunner import HttpCase, run_case
+
+    target = ENTITIES[test_case.entity]
+    module = sys.modules[__name__]
+    result = run_case(HttpCase(module, test_case.name, "POST", target.path,
+                               test_case.payload, test_case.expected, target.component))
+    result.update(id=test_case.id, module=test_case.entity)
+    return result
+
+def run_browser(pool, test_case):
+    started = time.perf_counter()
+    try:
+        with pool.lease(authenticated=True) as driver:
+            run_in_browser(driver, test_case)
+        return _result(test_case, started)
+    except Exception as e:
+        return _result(test_case, started, e)
+
+def run_batches(batches, mode="http", workers=8, headless=True):
+    results = []
+    pool = None
+    if mode == "browser":
+        from driverPool import DriverPool
+        pool = DriverPool(workers, headless=headless).start()
+    try:
+        # Mọi batch dùng chung một pool worker; batch chỉ để gom và báo cáo theo thực thể
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=mode) as executor:
+            futures = []
+            for cases in batches.values():
+                for test_case in cases:
+                    if mode == "browser":
+                        futures.append(executor.submit(run_browser, pool, test_case))
+                    else:
+                        futures.append(executor.submit(run_http, test_case))
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if not result["passed"]:
+                    print(f"❌ {result['id']} - {result['error']}")
+    finally:
+        if pool is not None:
+            pool.close()
+        if mode == "http":
+            from httpRunner import close_sessions
+            close_sessions()
+    return results
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Chạy bảng test case theo batch qua HTTP hoặc trình duyệt")
+    parser.add_argument("-e", "--entities", nargs="+", default=None, choices=sorted(ENTITIES),
+                        help="Chỉ chạy bảng của các thực thể được chọn")
+    parser.add_argument("--mode", choices=["http", "browser"], default="http")
+    parser.add_argument("--boundaries", action="store_true", help="Thêm các case biên sinh tự động")
+    parser.add_argument("-w", "--workers", type=int, default=8)
+    parser.add_argument("--headed", action="store_true", help="Hiện cửa sổ Chrome (chế độ browser)")
+    parser.add_argument("--list", action="store_true", help="Chỉ in danh sách case")
+    parser.add_argument("--report", default=None, help="Ghi kết quả gộp ra file JSON")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    batches = build_batches(args.entities, args.boundaries)
+    total = sum(len(cases) for cases in batches.values())
+    if args.list:
+        for entity_name, cases in batches.items():
+            print(f"📦 {entity_name} ({len(cases)})")
+            for test_case in cases:
+                print(f"   {test_case.name} -> {test_case.expected or 'thành công'}")
+        return 0
+
+    from runAllTests import print_report, write_report
+
+    workers = max(1, min(args.workers, total or 1))
+    print(f"▶️ {total} case trong {len(batches)} batch, chế độ {args.mode}, {workers} worker")
+    started = time.perf_counter()
+    results = run_batches(batches, args.mode, workers, headless=not args.headed)
+    wall_time = time.perf_counter() - started
+
+    order = {c.id: i for i, c in enumerate(c for cases in batches.values() for c in cases)}
+    results.sort(key=lambda r: order.get(r["id"], 0))
+    print_report(results, wall_time, workers)
+    if args.report:
+        write_report(args.report, results, wall_time, workers)
+    return 0 if all(r["passed"] for r in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
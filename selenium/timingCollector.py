@@ -0,0 +1,234 @@
+# Thu header Server-Timing khi chạy các luồng selenium có sẵn, tách thời gian server theo pha.
+#
+# Middleware AddServerTiming gắn vào mọi response các pha bootstrap, session (auth/session
+# middleware), app (controller), db, inertia (resolve props + JSON), view (render trang gốc).
+# Script chạy lần lượt login, open_teacher_form, fill_classroom_form trên Chrome; sau mỗi
+# bước đọc PerformanceResourceTiming.serverTiming của trang (lần tải trang và các XHR
+# Inertia) rồi gom theo route. Kết quả ghi ra JSON + HTML (p50/p95 mỗi pha) và so với file
+# baseline: pha nào chậm hơn baseline quá TOLERANCE và quá MIN_DELTA_MS thì báo lỗi.
+#
+#   python timingCollector.py
+#   python timingCollector.py --repeat 10 --output timing.json --html timing.html
+#   python timingCollector.py --save-baseline timing-baseline.json
+#   python timingCollector.py --baseline timing-baseline.json
+
+from collections import defaultdict
+from datetime import datetime
+from html import escape
+from urllib.parse import urlparse
+import argparse
+import json
+import sys
+import time
+import uuid
+import classroomTest
+import salaryBenchmark
+import sessionCache
+import teacherTest
+from driverPool import create_driver
+from loadTest import percentile
+from sessionCache import BASE_URL
+
+PHASES = ["bootstrap", "session", "app", "db", "inertia", "view"]
+PHASE_COLORS = {"bootstrap": "#9e9e9e", "session": "#7e57c2", "app": "#42a5f5", "db": "#ef5350",
+                "inertia": "#66bb6a", "view": "#ffa726"}
+# Mặc định: chậm hơn baseline 25% và ít nhất 15 ms mới tính là chậm đi
+TOLERANCE = 0.25
+MIN_DELTA_MS = 15
+
+# Đọc serverTiming của lần tải trang (một lần cho mỗi document) và của các XHR chưa đọc,
+# rồi xoá bộ đệm resource để bước sau không đọc lại
+COLLECT_JS = """
+const entries = [];
+if (!window.__serverTimingSeen) {
+    entries.push(...performance.getEntriesByType('navigation'));
+    window.__serverTimingSeen = true;
+}
+entries.push(...performance.getEntriesByType('resource').filter(e => e.initiatorType === 'xmlhttprequest'));
+performance.clearResourceTimings();
+return entries.filter(e => e.serverTiming && e.serverTiming.length).map(e => ({
+    name: e.name,
+    type: e.entryType === 'navigation' ? 'GET' : 'XHR',
+    duration: e.duration,
+    serverTiming: e.serverTiming.map(t => ({ name: t.name, duration: t.duration })),
+}));
+"""
+
+# ========== Thu thập ==========
+class TimingCollector:
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.steps = defaultdict(set)
+
+    def collect(self, driver, step):
+        entries = driver.execute_script(COLLECT_JS) or []
+        for entry in entries:
+            route = f"{entry['type']} {urlparse(entry['name']).path}"
+            phases = {t["name"]: t["duration"] for t in entry["serverTiming"]}
+            phases["client"] = entry["duration"]
+            self.samples[route].append(phases)
+            self.steps[route].add(step)
+        return len(entries)
+
+    def summary(self):
+        routes = {}
+        for route, samples in sorted(self.samples.items()):
+            phases = {}
+            for name in PHASES + ["total", "client"]:
+                values = sorted(sample.get(name, 0.0) for sample in samples)
+                phases[name] = {"p50": round(percentile(values, 50), 1), "p95": round(percentile(values, 95), 1),
+                                "mean": round(sum(values) / len(values), 1)}
+            routes[route] = {"samples": len(samples), "steps": sorted(self.steps[route]), "phases": phases}
+        return routes
+
+# ========== Luồng ==========
+def flow_login(driver, run):
+    # Bỏ cookie để đi đúng đường đăng nhập qua form (POST /login → /dashboard)
+    driver.get(f"{BASE_URL}/login")
+    driver.delete_all_cookies()
+    sessionCache.login_with_form(driver)
+    sessionCache.save_session(driver)
+
+def flow_open_teacher_form(driver, run):
+    teacherTest.open_teacher_form(driver)
+
+def flow_fill_classroom_form(driver, run, prefix):
+    classroomTest.open_classroom_form(driver)
+    classroomTest.fill_classroom_form(driver, f"{prefix} {run}", students=30)
+
+def delete_classrooms(prefix):
+    db = salaryBenchmark.Database(salaryBenchmark.read_env())
+    try:
+        db.execute("DELETE FROM classrooms WHERE name LIKE ?", (f"{prefix} %",))
+        db.commit()
+    finally:
+        db.close()
+
+def run_flows(repeat, settle):
+    prefix = f"TIMING-{uuid.uuid4().hex[:6]}"
+    flows = [("login", flow_login), ("open_teacher_form", flow_open_teacher_form),
+             ("fill_classroom_form", lambda driver, run: flow_fill_classroom_form(driver, run, prefix))]
+    collector = TimingCollector()
+    driver = create_driver()
+    try:
+        for run in range(repeat):
+            for step, flow in flows:
+                flow(driver, run)
+                # Đợi props deferred / XHR sau khi trang hiện xong
+                time.sleep(settle)
+                collector.collect(driver, step)
+    finally:
+        driver.quit()
+        delete_classrooms(prefix)
+    return collector
+
+# ========== So sánh baseline ==========
+def compare(routes, baseline, tolerance, min_delta):
+    regressions = []
+    for route, current in routes.items():
+        base = baseline.get("routes", {}).get(route)
+        if base is None:
+            continue
+        for name in PHASES + ["total"]:
+            before = base["phases"].get(name, {}).get("p50", 0.0)
+            after = current["phases"][name]["p50"]
+            if after > before * (1 + tolerance) and after - before > min_delta:
+                regressions.append((route, name, before, after))
+    return regressions
+
+# ========== Báo cáo ==========
+def print_table(routes):
+    print(f"   {'route':<32} {'n':>3} " + " ".join(f"{name:>9}" for name in PHASES + ["total", "client"]))
+    for route, row in routes.items():
+        values = " ".join(f"{row['phases'][name]['p50']:>9.1f}" for name in PHASES + ["total", "client"])
+        print(f"   {route:<32} {row['samples']:>3} {values}")
+
+def write_html(path, routes, regressions):
+    slow = {(route, phase) for route, phase, _, _ in regressions}
+    widest = max([row["phases"]["total"]["p50"] for row in routes.values()] + [1])
+    rows = []
+    for route, row in routes.items():
+        bars = "".join(
+            f'<div title="{name} {row["phases"][name]["p50"]} ms" style="width:{row["phases"][name]["p50"] / widest * 100:.2f}%;'
+            f'background:{PHASE_COLORS[name]}"></div>'
+            for name in PHASES if row["phases"][name]["p50"] > 0
+        )
+        cells = "".join(
+            f'<td class="{"slow" if (route, name) in slow else ""}">{row["phases"][name]["p50"]}'
+            f'<small> / {row["phases"][name]["p95"]}</small></td>'
+            for name in PHASES + ["total", "client"]
+        )
+        rows.append(f'<tr><td>{escape(route)}<br><small>{escape(", ".join(row["steps"]))}</small></td>'
+                    f'<td>{row["samples"]}</td>{cells}<td class="bar"><div>{bars}</div></td></tr>')
+    legend = "".join(f'<span style="background:{color}"></span>{name} ' for name, color in PHASE_COLORS.items())
+    headers = "".join(f"<th>{name}</th>" for name in PHASES + ["total", "client"])
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"""<!doctype html>
+<html lang="vi"><head><meta charset="utf-8"><title>Server-Timing</title>
+<style>
+body {{ font-family: sans-serif; margin: 24px; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ border-bottom: 1px solid #ddd; padding: 6px 8px; text-align: right; white-space: nowrap; }}
+td:first-child, th:first-child {{ text-align: left; }}
+td.slow {{ background: #ffebee; color: #c62828; font-weight: bold; }}
+td.bar {{ width: 35%; }}
+td.bar > div {{ display: flex; height: 14px; }}
+.legend span {{ display: inline-block; width: 12px; height: 12px; margin: 0 4px 0 12px; }}
+small {{ color: #888; }}
+</style></head><body>
+<h1>Server-Timing theo route</h1>
+<p>{datetime.now():%Y-%m-%d %H:%M:%S} · p50 / p95 (ms) · {len(regressions)} pha chậm hơn baseline</p>
+<p class="legend">{legend}</p>
+<table><tr><th>route</th><th>n</th>{headers}<th></th></tr>
+{"".join(rows)}
+</table></body></html>
+""")
+
+# ========== Main ==========
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Thu Server-Timing theo pha khi chạy các luồng selenium")
+    parser.add_argument("--repeat", type=int, default=3, help="Số lần chạy mỗi luồng")
+    parser.add_argument("--settle", type=float, default=0.5, help="Giây chờ XHR xong trước khi đọc timing")
+    parser.add_argument("--output", default="timing.json", help="File JSON kết quả")
+    parser.add_argument("--html", default="timing.html", help="File HTML kết quả")
+    parser.add_argument("--baseline", default=None, help="File JSON baseline để so sánh")
+    parser.add_argument("--save-baseline", default=None, help="Ghi kết quả lần này làm baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--min-delta", type=float, default=MIN_DELTA_MS)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    collector = run_flows(args.repeat, args.settle)
+    routes = collector.summary()
+    if not routes:
+        print("❌ Không đọc được Server-Timing nào (server tắt SERVER_TIMING?)")
+        return 2
+    print_table(routes)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(routes, json.load(f), args.tolerance, args.min_delta)
+        for route, phase, before, after in regressions:
+            print(f"   ⚠️ {route} {phase}: {before:.1f} → {after:.1f} ms")
+
+    report = {"generated_at": datetime.now().isoformat(timespec="seconds"), "base_url": BASE_URL,
+              "repeat": args.repeat, "routes": routes,
+              "regressions": [{"route": route, "phase": phase, "baseline_ms": before, "current_ms": after}
+                              for route, phase, before, after in regressions]}
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.html:
+        write_html(args.html, routes, regressions)
+    print(f"📄 {args.output} · {args.html}")
+
+    if regressions:
+        print(f"❌ Server-Timing: {len(regressions)} pha chậm hơn baseline: FAILED")
+        return 1
+    print("✅ Server-Timing: PASSED")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())